@@ -4,7 +4,6 @@ import json
 import os
 import asyncio
 import sys
-import re
 
 # Add the project root to the Python path if necessary
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
@@ -19,6 +18,7 @@ from google.adk.agents import LlmAgent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
+from backend.tools.json_parser import parse_json_response
 from .prompt import ANSWER_GENERATION_PROMPT
 from backend.data.database import firestore_db
 from backend.data.schemas import RecommendedQA
@@ -211,39 +211,7 @@ async def _run_answer_generator(questions_data, personal_summary):
             break
     
     # Parse JSON result
-    try:
-        # First, try to extract JSON from Markdown code blocks if present
-        markdown_json_pattern = r"```(?:json)?\s*([\s\S]*?)\s*```"
-        markdown_matches = re.findall(markdown_json_pattern, response_text)
-        
-        if markdown_matches:
-            clean_json_str = markdown_matches[0].strip()
-            result = json.loads(clean_json_str)
-        else:
-            result = json.loads(response_text)
-            
-    except json.JSONDecodeError:
-        # If still not valid JSON, try to extract JSON array using brackets
-        try:
-            start_index = response_text.find('[')
-            end_index = response_text.rfind(']') + 1
-            if start_index >= 0 and end_index > start_index:
-                json_str = response_text[start_index:end_index]
-                result = json.loads(json_str)
-            else:
-                # Fallback: try to find object notation
-                start_index = response_text.find('{')
-                end_index = response_text.rfind('}') + 1
-                if start_index >= 0 and end_index > start_index:
-                    json_str = response_text[start_index:end_index]
-                    result = json.loads(json_str)
-                else:
-                    raise ValueError("Could not find valid JSON in the response")
-        except Exception as e:
-            result = {
-                "error": f"Error parsing response: {str(e)}",
-                "raw_response": response_text
-            }
+    result = parse_json_response(response_text)
     
     # Validate and ensure proper format, preserving original tags
     if isinstance(result, list):
@@ -3,10 +3,6 @@ import json
 import os
 import asyncio
 import sys
-import re
-import requests
-from duckduckgo_search import DDGS
-import time
 
 # Add the project root to the Python path if necessary
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
@@ -18,15 +14,31 @@ from backend.config import set_google_cloud_env_vars
 set_google_cloud_env_vars()
 
 from google.adk.agents import LlmAgent
-from google.adk.runners import Runner
 from google.genai import types
-from .prompt import get_interview_judge_input_data, get_interview_judge_instruction
+from backend.tools.json_parser import parse_json_response
+from .prompt import (
+    get_interview_judge_input_data, get_interview_judge_instruction, get_interview_judge_synthesis_input,
+)
+from .incremental import (
+    compact_notes, criteria_averages, evaluation_state, finish_turn_evaluations, unevaluated_transcript,
+)
+from .map_reduce import format_entries, map_transcript, needs_map_reduce
+from .runner import run_isolated
 from backend.data.database import firestore_db
 from backend.data.schemas import Feedback
 from pydantic import ValidationError
 from backend.coordinator.session_manager import session_service
-from google.adk.tools import google_search
+from backend.tools.link_validator import link_validator
+from backend.tools.resource_search import resource_search
+from backend.data.resource_library import resource_library
+from backend.data.qa_context import build_qa_context, profile_context
+from backend.config import FeedbackConfig
+from backend.tools.log import bind, get_logger
+
+logger = get_logger(__name__)
 
+# Raw judge responses are logged at debug level only, cut to this many characters
+RESPONSE_PREVIEW_CHARS = 500
 
 
 INTERVIEW_JUDGE_AGENT = LlmAgent(
@@ -34,7 +46,9 @@ INTERVIEW_JUDGE_AGENT = LlmAgent(
     name="feedback_generator",
     description="Generate personalized interview feedback based on interview conversation",
     instruction=get_interview_judge_instruction(),
-    tools=[google_search]
+    # Tool-free, so the model can answer in JSON mode in a single turn; resources
+    # are attached afterwards (see enrich_resources)
+    generate_content_config=types.GenerateContentConfig(response_mime_type="application/json")
 )
 
 def run_judge_from_session(session):
@@ -51,80 +65,112 @@ def run_judge_from_session(session):
     return asyncio.run(_run_judge_from_session(session))
 
 
-async def _run_judge_from_session(session):
-    # each session has its own agent
-    runner = Runner(
-        agent=INTERVIEW_JUDGE_AGENT,
-        app_name=session.app_name,
-        session_service=session_service
-    )
-
-    input_data = get_interview_judge_input_data(
-        session.state.get("personal_experience", ""),
-        session.state.get("transcript", ""),
-        session.state.get("recommend_qas", "")
-    )
-
-        # Create input content
-    content = types.Content(
-        role="user",
-        parts=[types.Part(text=input_data)]
-    )
-
-    response_text = None
+async def _run_judge_from_session(session, close_session=True):
+    """
+    Judging pipeline:
+    1. score_interview: one tool-free LLM call producing the Feedback body
+    2. enrich_resources: resource lookup for every improvement area, concurrently,
+       with unreachable links replaced (validate_resources, tools/link_validator.py)
+    3. deduplicate_resources on the merged result, then save
+
+    The session is deleted afterwards unless close_session is False (the feedback
+    queue keeps it for retries and closes it itself).
+    """
+    log = bind(logger, session_id=session.id)
     feedback_json = None
     try: 
-        async for event in runner.run_async(
-            user_id=session.user_id,
-            session_id=session.id,
-            new_message=content 
-        ):
-            if event.is_final_response():
-                response_text = event.content.parts[0].text
-                break
+        response_text = await score_interview(session)
 
-        print("[DEBUG] Raw Feedback Agent Response:")
-        print(response_text)
+        log.debug(
+            "Raw judge response: %d characters", len(response_text or ""),
+            extra={"preview": (response_text or "")[:RESPONSE_PREVIEW_CHARS]}
+        )
 
         result = parse_and_validate_feedback(response_text)
         if result["status"] == "valid":
-            feedback_json = result["data"]
-            for resource in feedback_json.get("resources", []):
-                link = resource.get("link", "")
-                if not is_valid_and_reachable_url(link):
-                    print(f"[⚠️ Invalid link]: {link} – Regenerating via DuckDuckGo...")
-                    new_resource = search_ddgs(resource.get("title", "interview tips"))
-                    resource["title"] = new_resource["title"]
-                    resource["link"] = new_resource["link"]
-            print("[DEBUG] Feedback is valid")
+            log.info("Feedback is valid")
+            feedback_json = await enrich_resources(result["data"])
             feedback_json = deduplicate_resources(feedback_json)
             result = save_feedback_to_db(session,feedback_json)
             if result["message"]: 
-                print("[DEBUG] Feedback stored.")
+                log.info("Feedback stored")
         else:
-            print("[ERROR] Feedback invalid or could not be parsed:")
-            print(result)
+            # Field paths only: validation errors echo the (possibly long) input back
+            invalid_fields = [".".join(map(str, error["loc"])) for error in result.get("errors", [])]
+            log.error(
+                "Feedback invalid or could not be parsed",
+                extra={"status": result["status"], "invalid_fields": invalid_fields, "reason": result.get("message")}
+            )
         return feedback_json
     finally:
-        try: 
-            await session_service.delete_session(
-                app_name=session.app_name,
-                user_id=session.user_id,
-                session_id=session.id
-            )
-            print(f"[CLEANUP]: Session {session.id} successfully closed.")
-        except Exception as e:
-            print(f"[CLEANUP ERROR]: Failed to close session {session.id}: {e}")
+        if close_session:
+            await close_judge_session(session)
+
+
+async def close_judge_session(session):
+    try: 
+        await session_service.delete_session(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id
+        )
+        logger.info("Judge session closed", extra={"session_id": session.id})
+    except Exception as e:
+        logger.warning("Failed to close judge session: %s", e, extra={"session_id": session.id})
+
+
+async def score_interview(session):
+    """Run the (tool-free) judge agent on the session's interview; returns the raw response text"""
+    # Turn notes taken during the interview replace most of the transcript
+    await finish_turn_evaluations(session)
+    input_data = await judge_input_for(session)
+
+    # Own throwaway session: a retried attempt must not resend (and be conditioned on)
+    # the prompt and invalid response of the attempt before it
+    return await run_isolated(INTERVIEW_JUDGE_AGENT, session.user_id, f"{session.id}_judge", input_data) or None
+
+
+async def judge_input_for(session):
+    """
+    Judge prompt input for a finished interview:
+    - turn notes from the rolling evaluation replace the turns they cover
+    - remaining transcript above the map-reduce threshold is judged in concurrent
+      windows first, and replaced by the window notes
+    - with no notes at all, the full transcript as before
+    """
+    notes = list(evaluation_state(session)["notes"])
+    remaining = unevaluated_transcript(session) if notes else session.state.get("transcript", [])
+    if FeedbackConfig.JUDGE_MAP_REDUCE_ENABLED and needs_map_reduce(remaining):
+        window_notes, remaining = await map_transcript(session, remaining)
+        notes += window_notes
+    if not notes:
+        personal_experience = session.state.get("personal_experience", "")
+        transcript = session.state.get("transcript", [])
+        # Reference answers only for the QAs closest to what was actually discussed
+        qa_context = build_qa_context(
+            session.state.get("recommend_qas", []),
+            " ".join([format_entries(transcript), profile_context(personal_experience)]),
+            top_k=FeedbackConfig.JUDGE_QA_TOP_K,
+            token_budget=FeedbackConfig.JUDGE_QA_TOKEN_BUDGET,
+            include_answers=True,
+        )
+        return get_interview_judge_input_data(personal_experience, transcript, qa_context)
+    logger.info("Synthesizing feedback from %d note(s)", len(notes), extra={"session_id": session.id})
+    return get_interview_judge_synthesis_input(
+        session.state.get("personal_experience", ""),
+        compact_notes(notes),
+        json.dumps(criteria_averages(notes), ensure_ascii=False),
+        format_entries(remaining) if remaining else "(none)"
+    )
+
 
 def parse_and_validate_feedback(response_text):
     """Extracts and validates feedback JSON from agent response."""
     try:
-        # Clean response (e.g., remove markdown)
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", response_text)
-        json_str = match.group(1).strip() if match else response_text
-
-        # Parse JSON
-        parsed = json.loads(json_str)
+        # Parse JSON, tolerating markdown fences and surrounding prose
+        parsed = parse_json_response(response_text)
+        if isinstance(parsed, dict) and "error" in parsed:
+            raise ValueError(parsed["error"])
 
         # Validate with schema
         validated = Feedback.model_validate(parsed)
@@ -150,19 +196,46 @@ def save_feedback_to_db(session, validated):
     return firestore_db.set_feedback(session.user_id, session.state.get("workflow_id"), session.id, Feedback(**validated))
 
 
-def is_valid_and_reachable_url(url):
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code >= 400:
-            return False
-        content = response.text.lower()
-        if "404" in content or "page not found" in content or "not available" in content:
-            return False
-        if len(content) < 500:  # arbitrary: prevent empty landing pages
-            return False
-        return True
-    except Exception:
-        return False
+async def resources_for_area(area):
+    """
+    Resources for one improvement area: curated library first (local, links already
+    vetted), web search (cached, with a deadline) only when the library has no match.
+    """
+    resources = resource_library.lookup_area(area, top_k=FeedbackConfig.LIBRARY_RESOURCES_PER_AREA)
+    if resources:
+        return resources
+    return [await resource_search.find(area.get("topic") or "interview tips")]
+
+
+async def enrich_resources(feedback_json):
+    """Attach reachable resources for all improvement areas, looked up concurrently and kept in area order"""
+    areas = feedback_json.get("improvementAreas", [])
+    per_area = await asyncio.gather(*(resources_for_area(area) for area in areas))
+    per_area = await validate_resources(areas, per_area)
+    feedback_json["resources"] = [resource for resources in per_area for resource in resources]
+    logger.info("%d resource(s) for %d improvement area(s)", len(feedback_json["resources"]), len(areas))
+    return feedback_json
+
+
+async def validate_resources(areas, per_area):
+    """
+    Drop resources whose links are unreachable (checked concurrently, cached per URL).
+    An area left without a resource gets a web search result for its topic instead, or
+    the curated fallback when that link is unreachable too.
+    """
+    reachable = await link_validator.validate_all(r.get("link") for resources in per_area for r in resources)
+    kept = [[r for r in resources if reachable.get(r.get("link") or "")] for resources in per_area]
+    dropped = sum(map(len, per_area)) - sum(map(len, kept))
+    if dropped:
+        logger.info("Dropped %d unreachable resource(s)", dropped)
+
+    empty = [i for i, resources in enumerate(kept) if not resources]
+    if empty:
+        replacements = await resource_search.find_all([areas[i].get("topic") or "interview tips" for i in empty])
+        reachable = await link_validator.validate_all(r.get("link") for r in replacements)
+        for i, resource in zip(empty, replacements):
+            kept[i] = [resource if reachable.get(resource.get("link") or "") else dict(resource_search.fallback)]
+    return kept
 
 def deduplicate_resources(feedback_json):
     seen_links = set()
@@ -176,30 +249,3 @@ def deduplicate_resources(feedback_json):
     
     feedback_json["resources"] = unique_resources
     return feedback_json
-        
-
-def search_ddgs(topic: str, max_results: int = 1, delay: int = 1) -> dict:
-    """
-    Use DDGS to get a real search result link for a given topic, with retry and delay to avoid rate limits.
-    """
-    try:
-        with DDGS() as ddgs:
-            for result in ddgs.text(topic, max_results=max_results):
-                if result and result.get("href", "").startswith("http"):
-                    return {
-                        "title": result.get("title", "Related resource"),
-                        "link": result["href"]
-                    }
-        # Wait before retrying if no result found
-        print(f"[Retry No valid link found. Waiting {delay}s...")
-        time.sleep(delay)
-    except Exception as e:
-        print(f"[Retry Error: {e}. Waiting {delay}s...")
-        time.sleep(delay)
-
-    # Fallback if all attempts fail
-    print("[Fallback] Using default backup link.")
-    return {
-        "title": "5 Tips To Ace a Behavioral-Based Interview",
-        "link": "https://jobs.gartner.com/life-at-gartner/your-career/5-tips-to-ace-a-behavioral-based-interview/"
-    }
\ No newline at end of file
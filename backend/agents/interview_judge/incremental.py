@@ -0,0 +1,287 @@
+"""
+Rolling evaluation of a live interview.
+
+While the interview runs, every completed question/answer turn is scored in the
+background by a small tool-free judge call. The notes and running per-criterion
+averages live in session.state["turn_evaluations"]:
+
+    {"notes": [{"turn": 3, "question": "...", "scores": {"star": 4, ...},
+                "strength": "...", "issue": {"topic", "example", "suggestion"} | None}],
+     "criteria": {"star": {"count": 2, "total": 7, "mean": 3.5}, ...},
+     "skipped": 0, "failed": 0}
+
+The final judge then synthesizes these notes (plus the raw text of any turn without a
+note) instead of reading the whole transcript, so the time from "end interview" to
+feedback no longer grows with the interview's length.
+
+Evaluation is low priority: calls share a process-wide concurrency limit, turns are
+skipped (left to the final judge) when too many are already waiting, and the end of
+the interview only waits a bounded time for evaluations still in flight.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+
+from backend.agents.interviewer.transcript import AUDIO_PLACEHOLDERS, ROLE_AI, transcript_for
+from backend.config import FeedbackConfig
+from backend.tools.json_parser import parse_json_response
+from backend.tools.log import bind, get_logger
+from .prompt import CRITERIA, get_turn_evaluation_input, get_turn_evaluation_instruction
+from .runner import run_isolated
+
+logger = get_logger(__name__)
+
+TURN_EVALUATOR_AGENT = LlmAgent(
+    model="gemini-2.0-flash",
+    name="turn_evaluator",
+    description="Score one interview question/answer turn while the interview runs",
+    instruction=get_turn_evaluation_instruction(),
+    generate_content_config=types.GenerateContentConfig(response_mime_type="application/json")
+)
+
+
+def completed_turns(entries: List[Dict[str, Any]], settled: int, final: bool = False) -> List[Dict[str, Any]]:
+    """
+    Question/answer turns of a transcript: an interviewer entry followed by the
+    candidate's entries. A turn is complete once the interviewer has spoken again
+    (or, with final, at the end of the transcript) and none of its entries can change.
+    """
+    turns = []
+    question_at = None
+    for i, entry in enumerate(entries):
+        if entry.get("role") != ROLE_AI:
+            continue
+        if question_at is not None and i - question_at > 1 and i - 1 < settled:
+            turns.append(_turn(entries, question_at, i))
+        question_at = i
+    if final and question_at is not None and len(entries) - question_at > 1:
+        turns.append(_turn(entries, question_at, len(entries)))
+    return [turn for turn in turns if turn["answer"]]
+
+
+def _turn(entries, start: int, end: int) -> Dict[str, Any]:
+    placeholders = set(AUDIO_PLACEHOLDERS.values())
+    answer = " ".join(
+        entry.get("message", "") for entry in entries[start + 1:end]
+        if entry.get("message") and entry["message"] not in placeholders
+    )
+    return {"turn": start, "end": end, "question": entries[start].get("message", ""), "answer": answer.strip()}
+
+
+def evaluation_state(session) -> Dict[str, Any]:
+    return session.state.setdefault("turn_evaluations", {"notes": [], "criteria": {}, "skipped": 0, "failed": 0})
+
+
+def record_note(state: Dict[str, Any], turn: Dict[str, Any], note: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a turn's note and fold its scores into the per-criterion averages"""
+    scores = {
+        key: int(value) for key, value in (note.get("scores") or {}).items()
+        if key in CRITERIA and isinstance(value, (int, float)) and 1 <= value <= 5
+    }
+    entry = {
+        "turn": turn["turn"],
+        "end": turn["end"],
+        "question": turn["question"],
+        "scores": scores,
+        "strength": note.get("strength") or "",
+        "issue": note.get("issue") if isinstance(note.get("issue"), dict) else None,
+    }
+    state["notes"].append(entry)
+    state["notes"].sort(key=lambda n: n["turn"])
+    for key, value in scores.items():
+        aggregate = state["criteria"].setdefault(key, {"count": 0, "total": 0, "mean": 0.0})
+        aggregate["count"] += 1
+        aggregate["total"] += value
+        aggregate["mean"] = round(aggregate["total"] / aggregate["count"], 2)
+    return entry
+
+
+async def evaluate_turn(session, turn: Dict[str, Any]) -> Dict[str, Any]:
+    """Default evaluation: one tool-free judge call for a single turn"""
+    personal_experience = session.state.get("personal_experience") or {}
+    message = get_turn_evaluation_input(
+        personal_experience.get("jobDescription", "") if isinstance(personal_experience, dict) else "",
+        turn["question"],
+        turn["answer"],
+    )
+    response = await run_isolated(
+        TURN_EVALUATOR_AGENT, session.user_id, f"{session.id}_turn_{turn['turn']}", message
+    )
+    parsed = parse_json_response(response)
+    if not isinstance(parsed, dict) or "error" in parsed:
+        raise ValueError("Turn evaluation is not a JSON object")
+    return parsed
+
+
+# Process-wide limit shared by all live interviews (bound to the loop it is first used on)
+_limiter: Optional[asyncio.Semaphore] = None
+_limiter_loop = None
+_waiting = 0
+
+
+def _evaluation_slots() -> asyncio.Semaphore:
+    global _limiter, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = asyncio.Semaphore(FeedbackConfig.TURN_EVAL_MAX_CONCURRENCY)
+        _limiter_loop = loop
+    return _limiter
+
+
+# session id -> running evaluator, so the judge job can wait for it
+_evaluators: Dict[str, "TurnEvaluator"] = {}
+
+
+class TurnEvaluator:
+    """
+    Background task that evaluates the completed turns of one live session.
+
+    Args:
+        session: Live interview session
+        evaluate: Async (session, turn) -> note; raising leaves the turn to the final judge
+        poll_seconds: How often the transcript is checked for completed turns
+        max_waiting: Evaluations allowed to wait for a slot process-wide; beyond that
+                     turns are skipped
+    """
+
+    def __init__(
+        self,
+        session,
+        evaluate: Callable[[Any, Dict[str, Any]], Awaitable[Dict[str, Any]]] = evaluate_turn,
+        poll_seconds: float = FeedbackConfig.TURN_EVAL_POLL_SECONDS,
+        max_waiting: int = FeedbackConfig.TURN_EVAL_MAX_WAITING,
+    ):
+        self.session = session
+        self.evaluate = evaluate
+        self.poll_seconds = poll_seconds
+        self.max_waiting = max_waiting
+        self._task = None
+        self._submitted = set()  # question entry indices
+        self._in_flight = set()
+        self._log = bind(logger, session_id=session.id, workflow_id=session.state.get("workflow_id"))
+
+    def submit_completed(self) -> int:
+        """Start evaluations for turns completed since the last call; returns how many"""
+        entries = self.session.state.get("transcript", [])
+        settled = transcript_for(self.session).settled_count()
+        started = 0
+        for turn in completed_turns(entries, settled):
+            if turn["turn"] in self._submitted:
+                continue
+            self._submitted.add(turn["turn"])
+            if _waiting >= self.max_waiting:
+                evaluation_state(self.session)["skipped"] += 1
+                self._log.info("Turn evaluation skipped, evaluator busy", extra={"turn": turn["turn"]})
+                continue
+            task = asyncio.create_task(self._evaluate(turn))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            started += 1
+        return started
+
+    async def _evaluate(self, turn: Dict[str, Any]) -> None:
+        global _waiting
+        state = evaluation_state(self.session)
+        slots = _evaluation_slots()
+        _waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            _waiting -= 1
+        try:
+            note = await self.evaluate(self.session, turn)
+            record_note(state, turn, note)
+            self._log.debug("Turn evaluated", extra={"turn": turn["turn"]})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state["failed"] += 1
+            self._log.warning("Turn evaluation failed: %s", e, extra={"turn": turn["turn"]})
+        finally:
+            slots.release()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            self.submit_completed()
+
+    def start(self):
+        if self._task is None:
+            _evaluators[self.session.id] = self
+            self._task = asyncio.create_task(self._run())
+
+    async def _stop_polling(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def stop(self):
+        """
+        Stop looking for new turns; evaluations in flight still finish and are recorded.
+        The evaluator stays registered for finish_turn_evaluations only until they do.
+        """
+        await self._stop_polling()
+        if self._in_flight:
+            in_flight = set(self._in_flight)
+            asyncio.get_running_loop().create_task(self._unregister_after(in_flight))
+        else:
+            self._unregister()
+
+    def _unregister(self):
+        if _evaluators.get(self.session.id) is self:
+            del _evaluators[self.session.id]
+
+    async def _unregister_after(self, in_flight):
+        await asyncio.wait(in_flight)
+        self._unregister()
+
+    async def finish(self, timeout: float = FeedbackConfig.TURN_EVAL_FINISH_SECONDS) -> None:
+        """Stop polling and wait up to timeout for evaluations in flight"""
+        await self._stop_polling()
+        self._unregister()
+        if self._in_flight:
+            done, pending = await asyncio.wait(set(self._in_flight), timeout=timeout)
+            if pending:
+                self._log.info("%d turn evaluation(s) still running, judging without them", len(pending))
+
+
+async def finish_turn_evaluations(session, timeout: float = FeedbackConfig.TURN_EVAL_FINISH_SECONDS) -> None:
+    """Called by the judge: settle the session's rolling evaluation, if one is running"""
+    evaluator = _evaluators.get(session.id)
+    if evaluator is not None:
+        await evaluator.finish(timeout)
+
+
+def unevaluated_transcript(session) -> List[Dict[str, Any]]:
+    """Transcript entries not covered by a turn note (in order)"""
+    notes = evaluation_state(session)["notes"]
+    covered = set()
+    for note in notes:
+        covered.update(range(note["turn"], note["end"]))
+    return [entry for i, entry in enumerate(session.state.get("transcript", [])) if i not in covered]
+
+
+def compact_notes(notes: List[Dict[str, Any]]) -> str:
+    """Notes for the synthesis prompt, one JSON object per line (transcript positions left out)"""
+    return "\n".join(
+        json.dumps({k: v for k, v in note.items() if k not in ("turn", "end")}, ensure_ascii=False, separators=(",", ":"))
+        for note in notes
+    )
+
+
+def criteria_averages(notes: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Mean score per criterion (by display name) over any notes with a "scores" dict"""
+    totals: Dict[str, List[int]] = {}
+    for note in notes:
+        for key, value in (note.get("scores") or {}).items():
+            totals.setdefault(key, []).append(value)
+    return {CRITERIA[key]: round(sum(values) / len(values), 2) for key, values in totals.items() if key in CRITERIA}
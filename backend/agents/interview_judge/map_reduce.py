@@ -0,0 +1,138 @@
+"""
+Map-reduce judging for long transcripts.
+
+A transcript above FeedbackConfig.JUDGE_MAP_REDUCE_THRESHOLD_TOKENS is cut into
+windows of whole question/answer turns (about JUDGE_WINDOW_TOKENS each). Every window
+is judged concurrently by a tool-free call that returns a compact note (scores, two
+strengths, two issues); the final judge call then reduces the notes into the Feedback
+schema, the same way it synthesizes per-turn notes. Judge latency stays roughly flat
+as interviews grow: windows run in parallel and the reduce input is notes, not text.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+
+from backend.agents.interviewer.transcript import ROLE_AI
+from backend.config import FeedbackConfig
+from backend.tools.json_parser import parse_json_response
+from backend.tools.log import bind, get_logger
+from backend.tools.tokens import estimate_tokens
+from .prompt import CRITERIA, get_window_evaluation_input, get_window_evaluation_instruction
+from .runner import run_isolated
+
+logger = get_logger(__name__)
+
+WINDOW_JUDGE_AGENT = LlmAgent(
+    model="gemini-2.0-flash",
+    name="transcript_window_judge",
+    description="Judge one segment of a long interview transcript",
+    instruction=get_window_evaluation_instruction(),
+    generate_content_config=types.GenerateContentConfig(response_mime_type="application/json")
+)
+
+
+def format_entries(entries: List[Dict[str, Any]]) -> str:
+    """Transcript entries as "role: message" lines (no per-entry JSON overhead)"""
+    return "\n".join(f"{entry.get('role', '')}: {entry.get('message', '')}" for entry in entries)
+
+
+def needs_map_reduce(entries: List[Dict[str, Any]], threshold: Optional[int] = None) -> bool:
+    threshold = FeedbackConfig.JUDGE_MAP_REDUCE_THRESHOLD_TOKENS if threshold is None else threshold
+    return estimate_tokens(format_entries(entries)) > threshold
+
+
+def transcript_windows(entries: List[Dict[str, Any]], max_tokens: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split entries into consecutive windows of about max_tokens, cutting only before an
+    interviewer entry so a question stays with its answer. A single turn larger than
+    max_tokens becomes a window of its own.
+    """
+    windows: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_tokens = 0
+    turn: List[Dict[str, Any]] = []
+
+    def flush_turn():
+        nonlocal current, current_tokens
+        turn_tokens = estimate_tokens(format_entries(turn))
+        if current and current_tokens + turn_tokens > max_tokens:
+            windows.append(current)
+            current, current_tokens = [], 0
+        current.extend(turn)
+        current_tokens += turn_tokens
+
+    for entry in entries:
+        if entry.get("role") == ROLE_AI and turn:
+            flush_turn()
+            turn = []
+        turn.append(entry)
+    if turn:
+        flush_turn()
+    if current:
+        windows.append(current)
+    return windows
+
+
+def window_note(index: int, window: List[Dict[str, Any]], parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized note for one judged window (same scores shape as per-turn notes)"""
+    scores = {
+        key: int(value) for key, value in (parsed.get("scores") or {}).items()
+        if key in CRITERIA and isinstance(value, (int, float)) and 1 <= value <= 5
+    }
+    return {
+        "segment": index + 1,
+        "summary": parsed.get("summary") or "",
+        "scores": scores,
+        "strengths": [s for s in parsed.get("strengths") or [] if isinstance(s, str)][:2],
+        "issues": [i for i in parsed.get("issues") or [] if isinstance(i, dict)][:2],
+    }
+
+
+async def evaluate_window(session, index: int, window: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Default map step: one tool-free judge call for a transcript window"""
+    personal_experience = session.state.get("personal_experience") or {}
+    message = get_window_evaluation_input(
+        personal_experience.get("jobDescription", "") if isinstance(personal_experience, dict) else "",
+        format_entries(window),
+    )
+    response = await run_isolated(WINDOW_JUDGE_AGENT, session.user_id, f"{session.id}_window_{index}", message)
+    parsed = parse_json_response(response)
+    if not isinstance(parsed, dict) or "error" in parsed:
+        raise ValueError("Window evaluation is not a JSON object")
+    return parsed
+
+
+async def map_transcript(
+    session,
+    entries: List[Dict[str, Any]],
+    evaluate: Callable[[Any, int, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]] = evaluate_window,
+    window_tokens: int = FeedbackConfig.JUDGE_WINDOW_TOKENS,
+    max_concurrency: int = FeedbackConfig.JUDGE_MAP_MAX_CONCURRENCY,
+):
+    """
+    Judge the windows of a long transcript concurrently.
+
+    Returns (notes, leftover entries): a note per judged window, in order, and the
+    entries of windows whose evaluation failed, for the reduce step to read raw.
+    """
+    log = bind(logger, session_id=session.id)
+    windows = transcript_windows(entries, window_tokens)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def judge(index, window):
+        async with semaphore:
+            return await evaluate(session, index, window)
+
+    results = await asyncio.gather(*(judge(i, w) for i, w in enumerate(windows)), return_exceptions=True)
+    notes, leftover = [], []
+    for index, (window, result) in enumerate(zip(windows, results)):
+        if isinstance(result, BaseException):
+            log.warning("Window %d evaluation failed, passing it raw: %s", index, result)
+            leftover.extend(window)
+        else:
+            notes.append(window_note(index, window, result))
+    log.info("Judged transcript in %d window(s)", len(windows), extra={"failed": len(windows) - len(notes)})
+    return notes, leftover
@@ -14,20 +14,6 @@ def get_interview_judge_instruction():
     7. **Personality & Team Fit** – Did they demonstrate values or traits that fit the team culture?
     8. **Company Culture Fit** – Do their values, tone, and attitude align with the company’s culture and mission?
 
-    ## When suggesting resources:
-    - Use the Google Search tool to find *real, valid* external links.
-    - Each resource should include:
-        - A brief title
-        - A working HTTPS link
-    - DO NOT invent URLs or domains.
-    - Find 2 to 3 resources with title and link.
-    - In the "resources" section, include links to helpful materials that address different areas of weakness identified in the interview.
-    - Each resource should target a **different skill or field** that the candidate seems to lack, based on their responses and the position they’re applying for.
-    - Avoid suggesting multiple resources for the same topic.
-    - Ensure each link is relevant, actionable, and ideally from a reputable source (e.g., career guides, technical tutorials, communication tips).
-    - If no resource is found, omit it.
-
-
     ## Additional Qualitative Evaluation Lenses
     1. **Response Length & Effort**
     - If answers are unusually short or incomplete, especially for behavioral/technical questions, call this out.
@@ -58,17 +44,11 @@ def get_interview_judge_instruction():
     ],
     "improvementAreas": [
         {
-        "topic": "Area for improvement, like 'Story Structure' or 'Clarity'",
+        "topic": "Area for improvement, like 'Story Structure' or 'Clarity' (learning resources are matched to this topic)",
         "example": "Quote or describe what the candidate said that shows the issue",
         "suggestion": "Specific tip to improve"
         }
     ],
-    "resources": [
-        {
-        "title": "Relevant learning resource related to interview",
-        "link": "https://example.com"
-        }
-    ],
     "reflectionPrompt": [
         "Open-ended reflection question the candidate should think about"
     ],
@@ -102,3 +82,117 @@ def get_interview_judge_input_data(personal_experience, transcript, recommend_qa
     {recommend_qas}
     """
 
+
+
+# Evaluation criteria (see the judge instruction) by the keys used in per-turn notes
+CRITERIA = {
+    "effectiveness": "Effectiveness",
+    "relevance": "Relevance to Role",
+    "fluency": "Fluency & Confidence",
+    "insight": "Depth of Insight",
+    "star": "Use of STAR Format",
+    "impact": "Quantification & Impact",
+    "team_fit": "Personality & Team Fit",
+    "culture_fit": "Company Culture Fit",
+}
+
+
+def get_turn_evaluation_instruction():
+    criteria = "\n".join(f"    - {key}: {name}" for key, name in CRITERIA.items())
+    return f"""
+    You are a professional interview judge taking notes while an interview is still running.
+    You receive ONE interviewer question and the candidate's answer to it.
+
+    Score the answer from 1 to 5 on the criteria below. Leave out a criterion when this
+    answer says nothing about it (e.g. STAR for a short clarifying answer).
+{criteria}
+
+    Respond with compact JSON only:
+    {{
+    "scores": {{"effectiveness": 1-5, "...": 1-5}},
+    "strength": "One short sentence on what went well, or an empty string",
+    "issue": {{
+        "topic": "Short skill name, like 'Story Structure' or 'Clarity'",
+        "example": "Short quote from the answer that shows the issue",
+        "suggestion": "Specific tip to improve"
+    }}
+    }}
+    Use "issue": null when there is nothing worth improving.
+    """
+
+
+def get_turn_evaluation_input(job_description, question, answer):
+    return f"""
+    ## Job Description
+    {job_description}
+
+    ## Interviewer Question
+    {question}
+
+    ## Candidate Answer
+    {answer}
+    """
+
+
+def get_interview_judge_synthesis_input(personal_experience, turn_notes, criteria_averages, remaining_transcript):
+    """
+    Judge input built from evaluation notes (per turn during the interview, or per
+    transcript segment for long interviews) instead of the full transcript; turns
+    without notes are passed as raw transcript.
+    """
+    return f"""
+    ## Candidate Background
+    - **Resume Highlights**: {personal_experience.get('resumeInfo','')}
+    - **Additional Notes**: {personal_experience.get('additionalInfo','')}
+
+    ## Job Description
+    {personal_experience.get('jobDescription', '')}
+
+    ## Evaluation Notes
+    Notes on each answered question or transcript segment, in interview order (scores
+    are 1-5). Base your feedback on these notes; do not re-score from scratch.
+    {turn_notes}
+
+    ## Average Score per Criterion
+    {criteria_averages}
+
+    ## Interview Transcript Not Covered by the Notes
+    {remaining_transcript}
+    """
+
+
+def get_window_evaluation_instruction():
+    criteria = "\n".join(f"    - {key}: {name}" for key, name in CRITERIA.items())
+    return f"""
+    You are a professional interview judge. You receive ONE segment of a long interview
+    transcript; other segments are judged separately and merged later, so only judge
+    what is in this segment.
+
+    Score the candidate from 1 to 5 on the criteria below. Leave out a criterion the
+    segment says nothing about.
+{criteria}
+
+    Respond with compact JSON only (at most 2 strengths and 2 issues):
+    {{
+    "scores": {{"effectiveness": 1-5, "...": 1-5}},
+    "strengths": ["Short sentence on what went well"],
+    "issues": [
+        {{
+        "topic": "Short skill name, like 'Story Structure' or 'Clarity'",
+        "example": "Short quote that shows the issue",
+        "suggestion": "Specific tip to improve"
+        }}
+    ],
+    "summary": "One sentence on what this segment covered"
+    }}
+    """
+
+
+def get_window_evaluation_input(job_description, window_transcript):
+    return f"""
+    ## Job Description
+    {job_description}
+
+    ## Transcript Segment
+    {window_transcript}
+    """
@@ -0,0 +1,33 @@
+"""Short-lived sessions for judge sub-calls (per-turn notes, transcript windows)"""
+
+from google.adk.runners import Runner
+from google.genai import types
+
+from backend.coordinator.session_manager import session_service
+from backend.tools.log import get_logger
+
+JUDGE_APP_NAME = "interview_judge_app"
+
+logger = get_logger(__name__)
+
+
+async def run_isolated(agent, user_id: str, session_id: str, message: str) -> str:
+    """
+    Run an agent once in its own throwaway session and return its final response text.
+
+    Sub-calls never touch the interview session, so they can run concurrently with each
+    other and with the live interview.
+    """
+    runner = Runner(agent=agent, app_name=JUDGE_APP_NAME, session_service=session_service)
+    await session_service.create_session(app_name=JUDGE_APP_NAME, user_id=user_id, session_id=session_id)
+    content = types.Content(role="user", parts=[types.Part(text=message)])
+    try:
+        async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+            if event.is_final_response() and event.content and event.content.parts:
+                return event.content.parts[0].text or ""
+        return ""
+    finally:
+        try:
+            await session_service.delete_session(app_name=JUDGE_APP_NAME, user_id=user_id, session_id=session_id)
+        except Exception as e:
+            logger.warning("Failed to close judge sub-session %s: %s", session_id, e)
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.agents.interview_judge import incremental
+from backend.agents.interview_judge.agent import judge_input_for
+from backend.agents.interview_judge.incremental import (
+    TurnEvaluator, completed_turns, evaluation_state, finish_turn_evaluations, record_note,
+)
+from backend.agents.interviewer.transcript import ROLE_AI, ROLE_USER, transcript_for
+
+
+def make_session(session_id="eval-session"):
+    return SimpleNamespace(
+        id=session_id, user_id="user", app_name="app",
+        state={"workflow_id": "wf", "personal_experience": {"jobDescription": "Backend engineer"}},
+    )
+
+
+def test_completed_turns_wait_for_the_next_question():
+    entries = [
+        {"role": ROLE_AI, "message": "Hi, tell me about yourself."},
+        {"role": ROLE_USER, "message": "I build APIs."},
+        {"role": ROLE_USER, "message": "Mostly in Python."},
+        {"role": ROLE_AI, "message": "Describe a conflict."},
+        {"role": ROLE_USER, "message": "[audio message]"},
+        {"role": ROLE_AI, "message": "Why this role?"},
+        {"role": ROLE_USER, "message": "Because"},
+    ]
+
+    turns = completed_turns(entries, settled=5)
+    assert [(t["turn"], t["end"], t["answer"]) for t in turns] == [(0, 3, "I build APIs. Mostly in Python.")]
+
+    # an untranscribed answer is left to the final judge; the last turn completes at the end
+    final = completed_turns(entries, settled=len(entries), final=True)
+    assert [(t["turn"], t["answer"]) for t in final] == [(0, "I build APIs. Mostly in Python."), (5, "Because")]
+
+
+def test_record_note_keeps_running_averages():
+    state = evaluation_state(make_session())
+    record_note(state, {"turn": 3, "end": 5, "question": "Q2"}, {"scores": {"star": 2, "clarity": 5, "impact": 9}})
+    record_note(state, {"turn": 0, "end": 3, "question": "Q1"}, {"scores": {"star": 5}, "issue": "not a dict"})
+
+    assert [n["turn"] for n in state["notes"]] == [0, 3]
+    assert state["notes"][0]["issue"] is None
+    # unknown criteria and out-of-range scores are ignored
+    assert state["criteria"] == {"star": {"count": 2, "total": 7, "mean": 3.5}}
+
+
+@pytest.mark.asyncio
+async def test_turns_are_evaluated_in_the_background_and_synthesized(monkeypatch):
+    monkeypatch.setattr(incremental.FeedbackConfig, "TURN_EVAL_MAX_CONCURRENCY", 2)
+    running = 0
+    peak = 0
+
+    async def evaluate(session, turn):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return {"scores": {"effectiveness": 4}, "strength": f"Answered {turn['question']}", "issue": None}
+
+    session = make_session()
+    transcript = transcript_for(session)
+    evaluator = TurnEvaluator(session, evaluate=evaluate, poll_seconds=0.01)
+    evaluator.start()
+    for i in range(4):
+        transcript.add_text(ROLE_AI, f"Question {i}")
+        transcript.add_text(ROLE_USER, f"Answer {i}")
+    transcript.add_text(ROLE_AI, "Any questions for me?")
+    transcript.add_text(ROLE_USER, "No, thanks")
+    await asyncio.sleep(0.05)
+
+    await finish_turn_evaluations(session)
+
+    state = evaluation_state(session)
+    assert [n["question"] for n in state["notes"]] == [f"Question {i}" for i in range(4)]
+    assert state["criteria"]["effectiveness"]["mean"] == 4
+    assert peak == 2
+
+    judge_input = await judge_input_for(session)
+    assert "Answered Question 3" in judge_input
+    # only the turn without a note is passed as raw transcript
+    assert "Answer 2" not in judge_input
+    assert "No, thanks" in judge_input
+
+
+@pytest.mark.asyncio
+async def test_busy_evaluator_skips_turns_and_failures_are_counted(monkeypatch):
+    monkeypatch.setattr(incremental, "_waiting", 0)
+
+    async def evaluate(session, turn):
+        raise RuntimeError("quota exceeded")
+
+    session = make_session("busy-session")
+    transcript = transcript_for(session)
+    for i in range(3):
+        transcript.add_text(ROLE_AI, f"Question {i}")
+        transcript.add_text(ROLE_USER, f"Answer {i}")
+
+    evaluator = TurnEvaluator(session, evaluate=evaluate, max_waiting=0)
+    assert evaluator.submit_completed() == 0
+    assert evaluation_state(session)["skipped"] == 2
+
+    evaluator = TurnEvaluator(session, evaluate=evaluate)
+    assert evaluator.submit_completed() == 2
+    await evaluator.finish()
+    assert evaluation_state(session)["failed"] == 2
+    # no notes: the judge falls back to the full transcript
+    assert "Answer 0" in await judge_input_for(session)
+
+
+@pytest.mark.asyncio
+async def test_stopped_evaluator_is_released_once_evaluations_finish():
+    release = asyncio.Event()
+
+    async def evaluate(session, turn):
+        await release.wait()
+        return {"scores": {"star": 4}}
+
+    idle = TurnEvaluator(make_session("never-judged"), evaluate=evaluate)
+    idle.start()
+    await idle.stop()
+    assert "never-judged" not in incremental._evaluators
+
+    session = make_session("stopped-session")
+    transcript = transcript_for(session)
+    transcript.add_text(ROLE_AI, "Question 0")
+    transcript.add_text(ROLE_USER, "Answer 0")
+    transcript.add_text(ROLE_AI, "Question 1")
+    transcript.add_text(ROLE_USER, "Answer 1")
+    busy = TurnEvaluator(session, evaluate=evaluate)
+    busy.start()
+    assert busy.submit_completed() == 1
+    await busy.stop()
+    # a judge starting now still waits for the evaluation in flight
+    assert incremental._evaluators["stopped-session"] is busy
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert "stopped-session" not in incremental._evaluators
+    assert len(evaluation_state(session)["notes"]) == 1
@@ -1,6 +1,7 @@
-from backend.agents.interview_judge.agent import parse_and_validate_feedback, save_feedback_to_db
+from backend.agents.interview_judge.agent import enrich_resources, parse_and_validate_feedback, save_feedback_to_db, validate_resources
 from backend.data.schemas import Feedback
-from unittest.mock import MagicMock, patch
+from backend.tools.resource_search import FALLBACK_RESOURCE
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 def test_parse_and_validate_feedback_valid():
@@ -51,4 +52,81 @@ def test_save_feedback_to_db_calls_firestore():
         mock_set.return_value = {"message": "saved"}
         result = save_feedback_to_db(mock_session, feedback_dict)
         mock_set.assert_called_once_with("test_user", "workflow_id", "test_session_id", Feedback(**feedback_dict))
-        assert result["message"] == "saved"
\ No newline at end of file
+        assert result["message"] == "saved"
+
+async def all_reachable(urls):
+    return {url or "": True for url in urls}
+
+
+@pytest.mark.asyncio
+async def test_enrich_resources_searches_only_topics_the_library_misses():
+    feedback = {
+        "improvementAreas": [
+            {"topic": "STAR Format", "example": "...", "suggestion": "Add a quantifiable result."},
+            {"topic": "Kubernetes", "example": "...", "suggestion": "Learn container orchestration."},
+            {"topic": "System Design", "example": "...", "suggestion": "Discuss scalability tradeoffs."},
+        ],
+    }
+    searched = {"title": "K8s basics", "link": "https://example.com/k8s"}
+
+    with patch("backend.agents.interview_judge.agent.resource_search.find", new=AsyncMock(return_value=searched)) as find, \
+            patch("backend.agents.interview_judge.agent.link_validator.validate_all", new=AsyncMock(side_effect=all_reachable)):
+        result = await enrich_resources(feedback)
+
+    find.assert_awaited_once_with("Kubernetes")
+    assert [r["link"] for r in result["resources"]] == [
+        "https://www.themuse.com/advice/star-interview-method",
+        "https://example.com/k8s",
+        "https://www.techinterviewhandbook.org/system-design/",
+    ]
+
+
+def test_feedback_without_resources_is_valid():
+    result = parse_and_validate_feedback(
+        '{"positives": [], "improvementAreas": [], "reflectionPrompt": [], "tone": "respectful", "overallRating": 3, "focusTags": []}'
+    )
+    assert result["status"] == "valid"
+
+
+def test_feedback_after_bracketed_prose_is_parsed_from_its_fence():
+    result = parse_and_validate_feedback(
+        'Ratings use a [1, 5] scale, as in {"overallRating": 5}.\n```json\n'
+        '{"positives": [], "improvementAreas": [], "reflectionPrompt": [], "tone": "respectful", "overallRating": 3, "focusTags": []}'
+        "\n```"
+    )
+    assert result["status"] == "valid"
+    assert result["data"]["overallRating"] == 3
+
+
+def test_response_without_json_is_an_error():
+    result = parse_and_validate_feedback("I cannot judge this interview.")
+    assert result["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_resources_are_dropped_and_replaced():
+    areas = [{"topic": "STAR Format"}, {"topic": "Kubernetes"}, {"topic": "Caching"}]
+    per_area = [
+        [{"title": "Alive", "link": "https://example.com/alive"}, {"title": "Gone", "link": "https://example.com/gone"}],
+        [{"title": "No link"}],
+        [{"title": "Also gone", "link": "https://example.com/gone-too"}],
+    ]
+    replacements = [
+        {"title": "K8s basics", "link": "https://example.com/k8s"},
+        {"title": "Dead result", "link": "https://example.com/dead"},
+    ]
+    reachable = {"https://example.com/alive": True, "https://example.com/k8s": True}
+
+    async def validate_all(urls):
+        return {url or "": reachable.get(url or "", False) for url in urls}
+
+    with patch("backend.agents.interview_judge.agent.link_validator.validate_all", new=AsyncMock(side_effect=validate_all)), \
+            patch("backend.agents.interview_judge.agent.resource_search.find_all", new=AsyncMock(return_value=replacements)) as find_all:
+        result = await validate_resources(areas, per_area)
+
+    find_all.assert_awaited_once_with(["Kubernetes", "Caching"])
+    assert result == [
+        [{"title": "Alive", "link": "https://example.com/alive"}],
+        [{"title": "K8s basics", "link": "https://example.com/k8s"}],
+        [FALLBACK_RESOURCE],
+    ]
@@ -0,0 +1,79 @@
+import asyncio
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+
+from backend.agents.interview_judge import agent
+from backend.agents.interview_judge.map_reduce import map_transcript, needs_map_reduce, transcript_windows
+from backend.agents.interviewer.transcript import ROLE_AI, ROLE_USER
+
+
+def make_transcript(turns, answer_words=50):
+    entries = []
+    for i in range(turns):
+        entries.append({"role": ROLE_AI, "message": f"Question {i}?"})
+        entries.append({"role": ROLE_USER, "message": " ".join(["word"] * answer_words)})
+    return entries
+
+
+def make_session(entries):
+    return SimpleNamespace(
+        id="long-session", user_id="user", app_name="app",
+        state={"transcript": entries, "personal_experience": {"jobDescription": "SRE"}, "recommend_qas": []},
+    )
+
+
+def test_windows_keep_questions_with_answers_and_respect_the_budget():
+    entries = make_transcript(10)  # ~68 tokens per turn
+    windows = transcript_windows(entries, max_tokens=210)
+
+    assert [len(w) for w in windows] == [6, 6, 6, 2]
+    assert [entry for window in windows for entry in window] == entries
+    assert all(window[0]["role"] == ROLE_AI for window in windows)
+
+    # a turn larger than the budget is a window of its own
+    assert [len(w) for w in transcript_windows(make_transcript(2, answer_words=500), max_tokens=200)] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_windows_are_judged_concurrently_and_failures_stay_raw():
+    running = 0
+    peak = 0
+
+    async def evaluate(session, index, window):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        if index == 1:
+            raise RuntimeError("deadline exceeded")
+        return {"scores": {"star": 3 + index % 2, "bogus": 5}, "strengths": ["a", "b", "c"], "issues": [], "summary": f"w{index}"}
+
+    entries = make_transcript(10)
+    notes, leftover = await map_transcript(make_session(entries), entries, evaluate=evaluate, window_tokens=210, max_concurrency=3)
+
+    assert peak == 3
+    assert [note["segment"] for note in notes] == [1, 3, 4]
+    assert notes[0] == {"segment": 1, "summary": "w0", "scores": {"star": 3}, "strengths": ["a", "b"], "issues": []}
+    assert leftover == entries[6:12]
+
+
+@pytest.mark.asyncio
+async def test_judge_switches_to_map_reduce_above_the_threshold(monkeypatch):
+    async def evaluate(session, index, window):
+        return {"scores": {"impact": 2}, "strengths": [], "issues": [{"topic": "Impact", "example": "-", "suggestion": "Quantify"}], "summary": f"Segment {index}"}
+
+    monkeypatch.setattr(agent, "map_transcript", partial(map_transcript, evaluate=evaluate, window_tokens=200))
+
+    short = make_session(make_transcript(2))
+    monkeypatch.setattr(agent.FeedbackConfig, "JUDGE_MAP_REDUCE_THRESHOLD_TOKENS", 500)
+    assert not needs_map_reduce(short.state["transcript"])
+    assert "Question 1?" in await agent.judge_input_for(short)
+
+    long = make_session(make_transcript(20))
+    judge_input = await agent.judge_input_for(long)
+    assert "Segment 6" in judge_input
+    assert "Question 1?" not in judge_input
+    assert '"Quantification & Impact": 2.0' in judge_input
@@ -2,29 +2,50 @@ from google.adk.agents import LlmAgent
 from google.adk.events import Event
 from google.genai import types
 from datetime import datetime, timezone, timedelta
-import asyncio, json, os,sys,re
-from .prompt import get_background_prompt
+import asyncio, json, os,sys,re,time
+from .prompt import OPENING_REQUEST, get_background_prompt, get_opening_greeting
 from backend.data.database import firestore_db  # Adjust this path if needed
-from backend.data.schemas import Interview
 from google.adk.runners import Runner, RunConfig
 from google.adk.agents import LiveRequestQueue
 from google.genai.types import Content, Part, Blob
 import base64
-from backend.agents.interview_judge.agent import _run_judge_from_session
+from backend.coordinator.feedback_queue import feedback_queue, PRIORITY_HIGH, PRIORITY_NORMAL
 from backend.coordinator.session_manager import session_service
+from fastapi import WebSocketDisconnect
+from .protocol import (
+    encode_audio_frame, decode_frame, FrameError, FRAME_AUDIO_PCM, AUDIO_MIME_TYPE,
+    MESSAGE_AUDIO, MESSAGE_CONTROL, MESSAGE_TEXT,
+)
+from .checkpoint import flush_transcript
+from .transcript import ROLE_AI, ROLE_USER, sample_rate_from_mime, transcript_for
+from .turn_metrics import session_summary, turn_metrics_for
+from backend.tools.log import get_logger, bind
+from backend.data.qa_context import build_qa_context, profile_context
+from .prewarm import PrewarmRegistry
 
 
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 # Import unified config
-from backend.config import set_google_cloud_env_vars
+from backend.config import set_google_cloud_env_vars, InterviewConfig
 
 # Load environment variables
 set_google_cloud_env_vars()
 
 APP_NAME = "MockInterviewerAgent"
 
+logger = get_logger(__name__)
+
+# Categories of chunk-level records, rate limited by tools/log.py
+AUDIO_LOG = {"category": "audio"}
+TEXT_CHUNK_LOG = {"category": "text_chunk"}
+
+# Session state keys: precomputed greeting not yet sent to the client, and the
+# perf_counter() time of the WebSocket connection until the first message is sent
+PENDING_OPENING = "pending_opening"
+CONNECTED_AT = "connected_at"
+
 
 # a custom agent inherited from Llmagent
 class MockInterviewAgent(LlmAgent):
@@ -40,28 +61,88 @@ class MockInterviewAgent(LlmAgent):
         )
         self.instruction = ""
 
-async def start_agent_session(session_id, user_id, workflow_id, duration_minutes,is_audio=False):
-    """Starts an agent session with a dynamic instruction prompt"""
+def _firestore_data(result):
+    """Payload of a firestore_db getter ({"message", "data"}); other values pass through"""
+    if isinstance(result, dict) and "data" in result and "message" in result:
+        return result["data"]
+    return result
+
+class PreparedInterview:
+    """An interview ready for its WebSocket: ADK session with workflow state, instruction, greeting"""
+    def __init__(self, session, instruction, opening):
+        self.session = session
+        self.instruction = instruction
+        self.opening = opening
+
+async def load_interview_context(user_id, workflow_id):
+    """Title, personal experience and recommended QAs from a single workflow document read"""
+    context = _firestore_data(await asyncio.to_thread(firestore_db.get_interview_context, user_id, workflow_id)) or {}
+    return context.get("title"), context.get("personalExperience") or {}, context.get("recommendedQAs") or []
+
+def build_instruction(personal_experience, recommend_qas):
+    # The interviewer only needs the most relevant, varied questions, not the generated answers
+    qa_context = build_qa_context(
+        recommend_qas,
+        profile_context(personal_experience),
+        top_k=InterviewConfig.QA_TOP_K,
+        token_budget=InterviewConfig.QA_TOKEN_BUDGET,
+    )
+    return get_background_prompt(personal_experience, qa_context)
+
+async def prepare_interview(session_id, user_id, workflow_id):
+    """Everything an interview needs before the live model starts"""
+    title, personal_experience, recommend_qas = await load_interview_context(user_id, workflow_id)
+    instruction = build_instruction(personal_experience, recommend_qas)
     session = await session_service.create_session(
         app_name=APP_NAME,
         user_id=user_id,
         session_id=session_id,
     )
-
     session.state.setdefault("transcript", [])
     session.state["workflow_id"] = workflow_id
-    # Set up session timer
-    setup_duration(session, duration_minutes)
-
-    personal_experience = firestore_db.get_personal_experience(user_id, workflow_id) or {}
-    recommend_qas = firestore_db.get_recommended_qas(user_id, workflow_id) or []
     session.state["personal_experience"] = personal_experience
     session.state["recommend_qas"] = recommend_qas
+    return PreparedInterview(session, instruction, get_opening_greeting(title))
+
+async def seed_opening(session, agent_name, greeting):
+    """
+    Put the opening exchange in the ADK session history. The live model receives it
+    when it connects; history ending on a model turn makes it wait for the candidate
+    instead of generating a greeting of its own.
+    """
+    for author, role, text in (("user", "user", OPENING_REQUEST), (agent_name, "model", greeting)):
+        await session_service.append_event(
+            session, Event(author=author, content=Content(role=role, parts=[Part(text=text)]))
+        )
+
+async def discard_prepared(prepared):
+    await session_service.delete_session(
+        app_name=APP_NAME, user_id=prepared.session.user_id, session_id=prepared.session.id
+    )
+
+prewarmed = PrewarmRegistry(discard=discard_prepared)
+
+def prewarm_interview(session_id, user_id, workflow_id):
+    """Prepare the interview in the background until its WebSocket connects"""
+    prewarmed.schedule(session_id, user_id, workflow_id, lambda: prepare_interview(session_id, user_id, workflow_id))
+
+async def start_agent_session(session_id, user_id, workflow_id, duration_minutes,is_audio=False):
+    """Starts an agent session with a dynamic instruction prompt"""
+    started = time.perf_counter()
+    prepared = await prewarmed.claim(session_id, user_id, workflow_id)
+    is_prewarmed = prepared is not None
+    if not is_prewarmed:
+        prepared = await prepare_interview(session_id, user_id, workflow_id)
+    session = prepared.session
+    # Time to first message is measured from the connection (see record_first_message)
+    session.state[CONNECTED_AT] = started
+
+    # Set up session timer (from the WebSocket connection, not the pre-warm)
+    setup_duration(session, duration_minutes)
 
-    system_instruction = get_background_prompt(personal_experience, recommend_qas)
     # Create agent with session-specific instruction
     agent = MockInterviewAgent()
-    agent.instruction = system_instruction
+    agent.instruction = prepared.instruction
 
     runner = Runner(
         app_name=APP_NAME,
@@ -71,6 +152,10 @@ async def start_agent_session(session_id, user_id, workflow_id, duration_minutes
 
     modality = "AUDIO" if is_audio else "TEXT"
     run_config = RunConfig(response_modalities=[modality])
+    if is_audio and InterviewConfig.TRANSCRIBE_AUDIO:
+        # Let the live model transcribe both sides into the transcript
+        run_config.output_audio_transcription = types.AudioTranscriptionConfig()
+        run_config.input_audio_transcription = types.AudioTranscriptionConfig()
     live_request_queue = LiveRequestQueue()
 
     live_events = runner.run_live(
@@ -79,26 +164,63 @@ async def start_agent_session(session_id, user_id, workflow_id, duration_minutes
         run_config=run_config,
     )
 
-    # init the agent to start
-    message = "Please start the mock interview. Ask me to do a self introduction first."
-    intro_content = Content(
-        role="user",
-        parts=[Part(text=message)]
+    if InterviewConfig.CACHED_OPENING:
+        # agent_to_client_messaging sends the greeting as soon as it starts, while the
+        # live model connects; the model takes over from the candidate's answer
+        await seed_opening(session, agent.name, prepared.opening)
+        session.state[PENDING_OPENING] = prepared.opening
+        transcript_for(session).add_text(ROLE_AI, prepared.opening)
+    else:
+        # init the agent to start
+        intro_content = Content(
+            role="user",
+            parts=[Part(text=OPENING_REQUEST)]
+        )
+        live_request_queue.send_content(content=intro_content)
+        transcript_for(session).add_text(ROLE_AI, OPENING_REQUEST)
+    session_logger(session).info(
+        "Agent session ready",
+        extra={"prewarmed": is_prewarmed, "setup_ms": round((time.perf_counter() - started) * 1000, 1)},
     )
-    live_request_queue.send_content(content=intro_content)
-    session.state["transcript"].append({"role": "AI", "message": message})
 
     return live_events, live_request_queue, session
 
-async def agent_to_client_messaging(websocket, live_events, session):
-    """Agent to client communication"""
+def record_first_message(session, log, source):
+    """Log the time from WebSocket connection to the first interviewer message, once"""
+    started = session.state.pop(CONNECTED_AT, None)
+    if started is None:
+        return
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    session.state["first_message_ms"] = elapsed_ms
+    log.info("First interviewer message sent", extra={"first_message_ms": elapsed_ms, "source": source})
+
+def session_logger(session):
+    """Logger carrying the session's ids as structured fields"""
+    return bind(logger, session_id=session.id, user_id=session.user_id, workflow_id=session.state.get("workflow_id"))
+
+async def agent_to_client_messaging(websocket, live_events, session, binary=False):
+    """Agent to client communication (binary=True sends audio as binary frames, see protocol.py)"""
     if not session:
-        print(f"[ERROR] Session {session.id} not found")
+        logger.error("Session not found")
+    log = session_logger(session).bind(direction="agent_to_client")
     try:
         response_buffer = [] # Buffer to collect text parts
+        transcript = transcript_for(session)
+        # Frame sizes below are len() of json.dumps output, which is ASCII-only
+        metrics = turn_metrics_for(session)
+        audio_seq = 0
+        opening = session.state.pop(PENDING_OPENING, None)
+        if opening:
+            frame = json.dumps({"mime_type": "text/plain", "data": opening})
+            await websocket.send_text(frame)
+            metrics.agent_output(len(frame))
+            frame = json.dumps({"turn_complete": True, "interrupted": False})
+            await websocket.send_text(frame)
+            metrics.end_turn(False, len(frame))
+            record_first_message(session, log, "cached_opening")
         while True:
             if is_session_expired(session):
-                print(f"[SESSION ENDED] Session {session.id} expired (agent)")
+                log.info("Session expired")
                 # Send a final message to user before closing
                 goodbye_message = {
                     "mime_type": "text/plain",
@@ -111,7 +233,7 @@ async def agent_to_client_messaging(websocket, live_events, session):
                     "data": "Conversation ended. Thank you for participating!"
                 }
                 await websocket.send_text(json.dumps(end_message))
-                print("[AGENT TO CLIENT]: Final end message sent.")
+                log.info("Final end message sent")
 
                 start_time  = session.state.get("start_time")
                 end_time = datetime.now(timezone.utc)
@@ -119,14 +241,10 @@ async def agent_to_client_messaging(websocket, live_events, session):
                 session.state["duration"] = duration
                 await websocket.close(code=1000)
                 
-                save_transcript(session)
-
-                # Run feedback generation
-                try:
-                    await _run_judge_from_session(session)
-                    print("[DEBUG]: FEEDBACK GENERATED")
-                except Exception as e:
-                    print(f"[ERROR] Feedback generation failed: {e}")
+                await save_transcript(session)
+
+                # Feedback is generated in the background; the client polls for it
+                feedback_queue.enqueue(session, PRIORITY_NORMAL)
                 break
             
             async for event in live_events:
@@ -136,13 +254,15 @@ async def agent_to_client_messaging(websocket, live_events, session):
                         "turn_complete": event.turn_complete,
                         "interrupted": event.interrupted,
                     }
-                    await websocket.send_text(json.dumps(message))
-                    print(f"[AGENT TO CLIENT]: {message}")
+                    frame = json.dumps(message)
+                    await websocket.send_text(frame)
+                    turn = metrics.end_turn(bool(event.interrupted), len(frame))
+                    log.info("Turn end", extra={**message, **(turn or {})})
                     
-                    # Store full response in transcript when complete, if not already stored
-                    if event.turn_complete and response_buffer:
-                        full_response =response_buffer[-1].strip()
-                        session.state["transcript"].append({"role": "AI", "message": full_response})
+                    # Close the AI turn; on completion the last buffered text is the full
+                    # response (or output transcription of an audio turn)
+                    full_response = response_buffer[-1] if event.turn_complete and response_buffer else None
+                    transcript.end_turn(ROLE_AI, full_response)
                     response_buffer.clear()  # Clear buffer
                     continue
 
@@ -153,17 +273,33 @@ async def agent_to_client_messaging(websocket, live_events, session):
                 if not part:
                     continue
 
+                # Live transcription of the user's audio
+                if event.content.role == "user":
+                    transcript.add_transcription(ROLE_USER, part.text)
+                    if part.text:
+                        metrics.user_speech()
+                    continue
+
                 # Handle audio response
                 if part.inline_data and part.inline_data.mime_type.startswith("audio/pcm"):
                     audio_data = part.inline_data.data
                     if audio_data:
-                        message = {
-                            "mime_type": "audio/pcm",
-                            "data": base64.b64encode(audio_data).decode("ascii")
-                        }
-                        await websocket.send_text(json.dumps(message))
-                        print(f"[AGENT TO CLIENT]: audio/pcm: {len(audio_data)} bytes.")
-                        session.state["transcript"].append({"role": "AI", "message": "[audio response sent]"})
+                        if binary:
+                            frame = encode_audio_frame(audio_data, audio_seq)
+                            await websocket.send_bytes(frame)
+                            audio_seq += 1
+                        else:
+                            message = {
+                                "mime_type": "audio/pcm",
+                                "data": base64.b64encode(audio_data).decode("ascii")
+                            }
+                            frame = json.dumps(message)
+                            await websocket.send_text(frame)
+                        metrics.agent_output(len(frame))
+                        record_first_message(session, log, "model")
+                        log.debug("audio/pcm %d bytes", len(audio_data), extra={**AUDIO_LOG, "bytes": len(audio_data)})
+                        sample_rate = sample_rate_from_mime(part.inline_data.mime_type, InterviewConfig.OUTPUT_SAMPLE_RATE)
+                        transcript.add_audio(ROLE_AI, len(audio_data), sample_rate)
                     continue
 
                 # Handle partial text response
@@ -173,77 +309,143 @@ async def agent_to_client_messaging(websocket, live_events, session):
                         "mime_type": "text/plain",
                         "data": part.text
                     }
-                    await websocket.send_text(json.dumps(message))
-                    print(f"[AGENT TO CLIENT]: text/plain: {message}")
+                    frame = json.dumps(message)
+                    await websocket.send_text(frame)
+                    metrics.agent_output(len(frame))
+                    record_first_message(session, log, "model")
+                    log.debug("text/plain %d chars", len(part.text), extra=TEXT_CHUNK_LOG)
 
     
     except Exception as e:
-        print(f"[ERROR] agent_to_client_messaging failed: {e}")
-
-async def client_to_agent_messaging(websocket, live_request_queue, session):
-    try:
-        if not session:
-            print(f"[ERROR] Session {session.id} not found")
-
-        while True:
-            message_json = await websocket.receive_text()
-            message = json.loads(message_json)
-            mime_type = message["mime_type"]
-            data = message["data"]
+        log.error("agent_to_client_messaging failed: %s", e)
+
+def _queue_depth(live_request_queue) -> int:
+    """Requests waiting in the LiveRequestQueue (its asyncio.Queue is private; 0 if ADK changes it)"""
+    queue = getattr(live_request_queue, "_queue", None)
+    return queue.qsize() if isinstance(queue, asyncio.Queue) else 0
+
+def _send_client_audio(live_request_queue, session, pcm: bytes):
+    """Forward a PCM chunk from the client to the live agent"""
+    live_request_queue.send_realtime(Blob(data=pcm, mime_type=AUDIO_MIME_TYPE))
+    turn_metrics_for(session).audio_input(_queue_depth(live_request_queue))
+    session_logger(session).debug(
+        "audio/pcm %d bytes", len(pcm), extra={**AUDIO_LOG, "direction": "client_to_agent", "bytes": len(pcm)}
+    )
 
+    # Merge into the user's current audio turn
+    transcript_for(session).add_audio(ROLE_USER, len(pcm), InterviewConfig.INPUT_SAMPLE_RATE)
+
+def _classify_client_message(message: dict):
+    """
+    Return (kind, payload) for a JSON client message, kind in MESSAGE_TYPES.
+
+    Typed messages carry a top-level "type" and are dispatched without looking at
+    the payload. Untyped (legacy) messages fall back to "mime_type"; only text that
+    looks like a JSON control object is parsed, audio never is.
+    """
+    kind = message.get("type")
+    if kind == MESSAGE_CONTROL:
+        return kind, message
+    if kind in (MESSAGE_TEXT, MESSAGE_AUDIO):
+        return kind, message.get("data")
+
+    mime_type = message.get("mime_type")
+    data = message.get("data")
+    if mime_type == AUDIO_MIME_TYPE:
+        return MESSAGE_AUDIO, data
+    if mime_type == "text/plain":
+        if isinstance(data, str) and data.startswith("{") and '"control"' in data:
             try:
                 control = json.loads(data)
-                if (
-                    isinstance(control, dict)
-                    and control.get("type") == "control"
-                    and control.get("action") == "end_interview"
-                ):
-                    print("[CLIENT TO AGENT]: Received end_interview control, generating feedback and closing...")
-                    
-                    # Calculate duration
-                    start_time = session.state.get("start_time")
-                    end_time = datetime.now(timezone.utc)
-                    duration = int((end_time - start_time).total_seconds() / 60)
-                    session.state["duration"] = duration
-                    
-                    # Save transcript
-                    save_transcript(session)
-                    print(f"[SAVE]: Transcript saved for session {session.id}")
-                    
-                    # Generate feedback
-                    try:
-                        await _run_judge_from_session(session)
-                        print(f"[FEEDBACK]: Feedback generated for session {session.id}")
-                    except Exception as e:
-                        print(f"[ERROR]: Failed to generate feedback: {e}")
-                    
-                    # Close WebSocket
-                    await websocket.close(code=1000)
-                    break
-            except Exception:
-                pass
+            except ValueError:
+                control = None
+            if isinstance(control, dict) and control.get("type") == MESSAGE_CONTROL:
+                return MESSAGE_CONTROL, control
+        return MESSAGE_TEXT, data
+    raise ValueError(f"Mime type not supported: {mime_type}")
+
+async def _handle_client_control(websocket, session, control: dict) -> bool:
+    """Run a control action; returns True when the connection should stop"""
+    log = session_logger(session).bind(direction="client_to_agent", action=control.get("action"))
+    action = control.get("action")
+    if action != "end_interview":
+        log.warning("Ignoring unknown control action")
+        return False
 
-            if mime_type == "text/plain":
-                # Send text to agent
-                content = Content(role="user", parts=[Part.from_text(text=data)])
-                live_request_queue.send_content(content=content)
-                print(f"[CLIENT TO AGENT]: {data}")
+    log.info("Received end_interview control, queueing feedback and closing")
 
-                # Record user message in session transcript
-                session.state["transcript"].append({"role": "user", "message": data})
+    # Calculate duration
+    start_time = session.state.get("start_time")
+    end_time = datetime.now(timezone.utc)
+    duration = int((end_time - start_time).total_seconds() / 60)
+    session.state["duration"] = duration
 
-            elif mime_type == "audio/pcm":
-                # Decode audio and send to agent
-                decoded_data = base64.b64decode(data)
-                live_request_queue.send_realtime(Blob(data=decoded_data, mime_type=mime_type))
-                print(f"[CLIENT TO AGENT]: [audio data] {len(decoded_data)} bytes")
+    # Save transcript
+    await save_transcript(session)
+    log.info("Transcript saved")
+
+    # Generate feedback in the background; the candidate is waiting for it, so it goes first
+    feedback_queue.enqueue(session, PRIORITY_HIGH)
+
+    # Close WebSocket
+    await websocket.close(code=1000)
+    return True
+
+def _handle_client_text(live_request_queue, session, text: str):
+    """Forward a text message from the client to the live agent"""
+    content = Content(role="user", parts=[Part.from_text(text=text)])
+    live_request_queue.send_content(content=content)
+    turn_metrics_for(session).user_input(_queue_depth(live_request_queue))
+    session_logger(session).info("User text message", extra={"direction": "client_to_agent", "chars": len(text)})
+
+    # Record user message in session transcript
+    transcript_for(session).add_text(ROLE_USER, text)
+
+def _record_inbound_cpu(session, kind: str, cpu_seconds: float):
+    """Accumulate per-kind inbound handling cost in session.state["inbound_cpu"]"""
+    stats = session.state.setdefault("inbound_cpu", {})
+    entry = stats.setdefault(kind, {"count": 0, "cpu_seconds": 0.0})
+    entry["count"] += 1
+    entry["cpu_seconds"] += cpu_seconds
+
+async def client_to_agent_messaging(websocket, live_request_queue, session, binary=False):
+    """Client to agent communication (binary=True accepts audio as binary frames, see protocol.py)"""
+    try:
+        if not session:
+            logger.error("Session not found")
 
-                # Record audio event in transcript
-                session.state["transcript"].append({"role": "user", "message": "[audio message]"})
+        while True:
+            if binary:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+                if frame.get("bytes") is not None:
+                    started = time.thread_time()
+                    kind, _, pcm = decode_frame(frame["bytes"])
+                    if kind != FRAME_AUDIO_PCM:
+                        raise FrameError(f"Unsupported binary frame kind {kind}")
+                    _send_client_audio(live_request_queue, session, pcm)
+                    _record_inbound_cpu(session, MESSAGE_AUDIO, time.thread_time() - started)
+                    continue
+                message_json = frame.get("text")
+            else:
+                message_json = await websocket.receive_text()
+
+            started = time.thread_time()
+            kind, payload = _classify_client_message(json.loads(message_json))
+
+            if kind == MESSAGE_CONTROL:
+                if await _handle_client_control(websocket, session, payload):
+                    break
+                continue
+            if kind == MESSAGE_TEXT:
+                _handle_client_text(live_request_queue, session, payload)
             else:
-                raise ValueError(f"Mime type not supported: {mime_type}")
+                # Decode audio and send to agent
+                _send_client_audio(live_request_queue, session, base64.b64decode(payload))
+            _record_inbound_cpu(session, kind, time.thread_time() - started)
     except Exception as e:
-        print(f"[ERROR] client_to_agent_messaging failed: {e}")
+        session_logger(session).error("client_to_agent_messaging failed: %s", e)
 
 def is_session_expired(session):
     start = session.state.get("start_time")
@@ -257,20 +459,9 @@ def setup_duration(session, duration_minutes: int):
     session.state["start_time"] = datetime.now(timezone.utc)
     session.state["duration_minutes"] = duration_minutes
 
-def save_transcript(session):
-
-    transcript = session.state.get("transcript", [])
-    workflowId= session.state.get("workflow_id")
-
-
-    interview_data = Interview(
-        transcript=transcript,  
-        duration_minutes=session.state.get("duration")
-    )
-
-    firestore_db.create_interview(
-        user_id=session.user_id,
-        session_id=session.id,
-        workflow_id=workflowId,
-        interview_data=interview_data
-    )
+async def save_transcript(session):
+    """Write the transcript turns not checkpointed yet, the latency summary, and mark the interview completed"""
+    latency = session_summary(session)
+    session_logger(session).info("Interview latency", extra={"latency": latency})
+    # Blocking Firestore write (and a wait for any running checkpoint): off the event loop
+    await asyncio.to_thread(flush_transcript, session, True, {"latency": latency})
@@ -0,0 +1,143 @@
+"""
+Incremental transcript persistence for live interviews.
+
+Turns are appended to the interview record (ArrayUnion on "transcript") as they
+settle, so a crash or restart mid-interview loses at most the last few turns and the
+final save only writes the tail. Each stored turn carries its position as "turn",
+which keeps identical turns distinct and makes re-sending a turn a no-op.
+
+Record status is "in_progress" until the final save marks it "completed".
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from backend.config import InterviewConfig
+from backend.data.database import firestore_db
+from backend.tools.log import get_logger, bind
+from .transcript import transcript_for
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+
+logger = get_logger(__name__)
+
+# Background checkpoints and the final save of one session must not interleave
+_locks: Dict[str, threading.Lock] = {}
+
+
+def flush_transcript(session, final: bool = False, extra_fields: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Append the session's unsaved transcript turns to Firestore (blocking).
+
+    Args:
+        session: Live interview session
+        final: Write every remaining turn plus duration and completed status;
+               otherwise only turns that can no longer change
+        extra_fields: Interview fields written along with the final flush
+
+    Returns:
+        int: Number of turns written
+    """
+    lock = _locks.setdefault(session.id, threading.Lock())
+    with lock:
+        state = session.state
+        checkpoint = state.setdefault("transcript_checkpoint", {"flushed": 0, "writes": 0})
+        transcript = state.get("transcript", [])
+        flushed = checkpoint["flushed"]
+        end = len(transcript) if final else max(flushed, transcript_for(session).settled_count())
+
+        turns = [{**entry, "turn": i} for i, entry in enumerate(transcript[flushed:end], start=flushed)]
+        fields = {}
+        if checkpoint["writes"] == 0:
+            fields["createAt"] = datetime.now(timezone.utc)
+            fields["status"] = STATUS_IN_PROGRESS
+        if final:
+            fields["duration_minutes"] = state.get("duration")
+            fields["status"] = STATUS_COMPLETED
+            fields.update(extra_fields or {})
+        elif not turns:
+            return 0
+
+        firestore_db.append_interview_turns(
+            user_id=session.user_id,
+            workflow_id=state.get("workflow_id"),
+            session_id=session.id,
+            turns=turns,
+            fields=fields,
+        )
+        checkpoint["flushed"] = end
+        checkpoint["writes"] += 1
+    if final:
+        _locks.pop(session.id, None)
+    return len(turns)
+
+
+def _release_lock(session_id: str) -> None:
+    """Forget a session's lock once a checkpoint still running in a worker thread is done"""
+    lock = _locks.get(session_id)
+    if lock is None:
+        return
+    with lock:
+        _locks.pop(session_id, None)
+
+
+class TranscriptCheckpointer:
+    """Background task that checkpoints one live session every N seconds or M settled turns"""
+
+    def __init__(
+        self,
+        session,
+        interval_seconds: float = InterviewConfig.CHECKPOINT_INTERVAL_SECONDS,
+        max_turns: int = InterviewConfig.CHECKPOINT_MAX_TURNS,
+        poll_seconds: float = 1.0,
+    ):
+        self.session = session
+        self.interval_seconds = interval_seconds
+        self.max_turns = max_turns
+        self.poll_seconds = poll_seconds
+        self._task = None
+        self._log = bind(logger, session_id=session.id, workflow_id=session.state.get("workflow_id"))
+
+    def _pending(self) -> int:
+        flushed = self.session.state.get("transcript_checkpoint", {}).get("flushed", 0)
+        return transcript_for(self.session).settled_count() - flushed
+
+    async def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            pending = self._pending()
+            if pending <= 0:
+                continue
+            if pending < self.max_turns and time.monotonic() - last_flush < self.interval_seconds:
+                continue
+            try:
+                written = await asyncio.to_thread(flush_transcript, self.session)
+                self._log.info("Checkpointed %d turn(s)", written, extra={"turns": written})
+            except Exception as e:
+                self._log.error("Failed to checkpoint transcript: %s", e)
+            last_flush = time.monotonic()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop checkpointing; the final save is left to save_transcript. The session's
+        lock is released here too, for sessions that never reach the final save.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # A cancelled flush keeps running in its thread; wait for it off the event loop
+        await asyncio.to_thread(_release_lock, self.session.id)
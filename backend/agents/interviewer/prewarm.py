@@ -0,0 +1,86 @@
+"""
+Pre-warmed interview sessions.
+
+POST /interviews/start schedules the interview setup (one workflow document read, the
+interviewer instruction, the ADK session) while the client is still opening its
+WebSocket. The WebSocket handler then claims the prepared interview, waiting for it if
+it is still being built, instead of doing that work after the client connected.
+
+A prepared interview is only valid for InterviewConfig.PREWARM_TTL_SECONDS and only for
+the user and workflow it was built for; anything else is discarded and the handler
+builds the session inline as before.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.config import InterviewConfig
+from backend.tools.log import bind, get_logger
+
+logger = get_logger(__name__)
+
+
+class PrewarmRegistry:
+    """In-flight and ready prepared interviews, keyed by session id"""
+
+    def __init__(
+        self,
+        discard: Callable[[Any], Awaitable[None]],
+        ttl_seconds: float = InterviewConfig.PREWARM_TTL_SECONDS,
+    ):
+        self._discard = discard
+        self._ttl = ttl_seconds
+        # session_id -> (scheduled at, (user_id, workflow_id), task)
+        self._entries: Dict[str, Tuple[float, Tuple[str, str], asyncio.Task]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, session_id: str, user_id: str, workflow_id: str, prepare: Callable[[], Awaitable[Any]]) -> None:
+        """Start preparing an interview in the background (must run inside the event loop)"""
+        self._purge()
+        previous = self._entries.pop(session_id, None)
+        if previous:
+            self._drop(session_id, previous[2])
+        task = asyncio.create_task(prepare())
+        self._entries[session_id] = (time.monotonic(), (user_id, workflow_id), task)
+
+    async def claim(self, session_id: str, user_id: str, workflow_id: str) -> Optional[Any]:
+        """
+        The prepared interview for session_id, or None when there is none, it failed,
+        expired, or was built for another user or workflow. Claiming removes it.
+        """
+        entry = self._entries.pop(session_id, None)
+        self._purge()
+        if entry is None:
+            return None
+        scheduled_at, owner, task = entry
+        log = bind(logger, session_id=session_id, user_id=user_id, workflow_id=workflow_id)
+        try:
+            prepared = await task
+        except Exception as e:
+            log.warning("Pre-warm failed, building the session inline: %s", e)
+            return None
+        if owner != (user_id, workflow_id) or time.monotonic() - scheduled_at > self._ttl:
+            reason = "expired" if owner == (user_id, workflow_id) else "owner mismatch"
+            log.info("Pre-warmed session not usable", extra={"reason": reason})
+            # Awaited so the inline fallback can reuse the session id
+            await self._discard(prepared)
+            return None
+        return prepared
+
+    def _purge(self):
+        """Drop prepared interviews nobody claimed within the validity window"""
+        now = time.monotonic()
+        for session_id, (scheduled_at, _, task) in list(self._entries.items()):
+            if now - scheduled_at > self._ttl:
+                del self._entries[session_id]
+                self._drop(session_id, task)
+
+    def _drop(self, session_id: str, task: asyncio.Task):
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            asyncio.create_task(self._discard(task.result()))
+        logger.info("Dropped unclaimed pre-warmed session", extra={"session_id": session_id})
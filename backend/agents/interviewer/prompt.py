@@ -1,3 +1,14 @@
+# Sent to the live model when it opens the interview itself (InterviewConfig.CACHED_OPENING off)
+OPENING_REQUEST = "Please start the mock interview. Ask me to do a self introduction first."
+
+def get_opening_greeting(title=None):
+    """The interviewer's first turn, precomputed so it can be sent before the live model answers"""
+    role = f" for the {title} role" if title else ""
+    return (
+        f"Hi, thanks for joining this mock interview{role}. I'll be your interviewer today. "
+        "Let's start with a brief self introduction: tell me about your background and what brings you to this role."
+    )
+
 def get_background_prompt(personal_experience, recommend_qas):
     return f"""
         You are an experienced and insightful technical + behavioral interviewer tasked with conducting a high-quality mock interview.
@@ -20,7 +31,7 @@ def get_background_prompt(personal_experience, recommend_qas):
         Job Description:
         {personal_experience.get('jobDescription')}
 
-        Recommended Q&A (use at least half, directly or as follow-ups):
+        Recommended questions with topic tags (use at least half, directly or as follow-ups):
         {recommend_qas}
 
         Guidelines:
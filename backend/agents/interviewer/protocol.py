@@ -0,0 +1,70 @@
+"""
+Wire protocol for the interview WebSocket (/ws/{session_id}).
+
+The client picks the protocol with the `protocol` query parameter:
+
+- json (default): every message is a JSON text frame with a top-level type
+      {"type": "audio", "data": <base64 PCM>}
+      {"type": "text", "data": <text>}
+      {"type": "control", "action": "end_interview", ...}
+  Control messages are recognised from "type" alone, so audio and text payloads
+  are never parsed. Untyped {"mime_type", "data"} messages from older clients are
+  still accepted.
+- binary: audio travels as binary frames, raw 16-bit little-endian PCM behind a
+  4-byte header; JSON text frames are used only for text and control messages.
+
+      byte 0      protocol version (FRAME_VERSION)
+      byte 1      frame kind (FRAME_AUDIO_PCM)
+      bytes 2-3   sequence number, big-endian, wraps at 65536
+      bytes 4-    payload
+
+Binary mode avoids base64 (+33% size) and the JSON encode/decode of every audio chunk.
+The server accepts permessage-deflate whenever the client offers it, and it then applies
+to every frame of the connection; raw PCM barely compresses, so binary clients should not
+offer the extension (json clients benefit from it).
+"""
+
+import struct
+from typing import Tuple
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY)
+
+FRAME_VERSION = 1
+FRAME_AUDIO_PCM = 1
+
+AUDIO_MIME_TYPE = "audio/pcm"
+
+# Top-level "type" of JSON client messages
+MESSAGE_AUDIO = "audio"
+MESSAGE_TEXT = "text"
+MESSAGE_CONTROL = "control"
+MESSAGE_TYPES = (MESSAGE_AUDIO, MESSAGE_TEXT, MESSAGE_CONTROL)
+
+_HEADER = struct.Struct("!BBH")
+HEADER_SIZE = _HEADER.size
+
+
+class FrameError(ValueError):
+    """Raised for binary frames that do not follow the protocol"""
+
+
+def encode_audio_frame(pcm: bytes, seq: int) -> bytes:
+    """Binary frame carrying one PCM chunk"""
+    return _HEADER.pack(FRAME_VERSION, FRAME_AUDIO_PCM, seq & 0xFFFF) + pcm
+
+
+def decode_frame(frame: bytes) -> Tuple[int, int, bytes]:
+    """
+    Split a binary frame into (kind, seq, payload).
+
+    Raises:
+        FrameError: If the frame is too short or uses an unknown version
+    """
+    if len(frame) < HEADER_SIZE:
+        raise FrameError(f"Binary frame too short ({len(frame)} bytes)")
+    version, kind, seq = _HEADER.unpack_from(frame)
+    if version != FRAME_VERSION:
+        raise FrameError(f"Unsupported binary frame version {version}")
+    return kind, seq, frame[HEADER_SIZE:]
@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.agents.interviewer import agent, checkpoint
+from backend.agents.interviewer.checkpoint import TranscriptCheckpointer, flush_transcript
+from backend.agents.interviewer.transcript import ROLE_AI, ROLE_USER, transcript_for
+from backend.agents.interviewer.tests.test_protocol import make_session
+
+
+def make_db():
+    fake_db = MagicMock()
+    fake_db.append_interview_turns.return_value = {"message": "ok", "data": None}
+    return fake_db
+
+
+def written_turns(fake_db):
+    return [t["turn"] for c in fake_db.append_interview_turns.call_args_list for t in c.kwargs["turns"]]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_append_settled_turns_and_final_save_writes_tail():
+    session = make_session()
+    session.state["workflow_id"] = "wf1"
+    transcript = transcript_for(session)
+    fake_db = make_db()
+
+    with patch.object(checkpoint, "firestore_db", fake_db):
+        transcript.add_text(ROLE_AI, "Introduce yourself")
+        transcript.add_audio(ROLE_USER, 3200, 16000)
+        # both are the latest turn of their speaker: nothing settled yet
+        assert flush_transcript(session) == 0
+        fake_db.append_interview_turns.assert_not_called()
+
+        transcript.end_turn(ROLE_AI, "Why this role?")
+        transcript.add_text(ROLE_USER, "Because")
+        transcript.add_text(ROLE_AI, "Thanks")
+        assert flush_transcript(session) == 3
+        first = fake_db.append_interview_turns.call_args.kwargs
+        assert first["fields"]["status"] == "in_progress"
+        assert [t["message"] for t in first["turns"]] == ["Introduce yourself", "[audio message]", "Why this role?"]
+
+        session.state["duration"] = 3
+        await agent.save_transcript(session)
+        final = fake_db.append_interview_turns.call_args.kwargs
+        # saving again is a no-op for the transcript
+        await agent.save_transcript(session)
+
+    assert final["fields"]["status"] == "completed"
+    assert final["fields"]["duration_minutes"] == 3
+    assert "createAt" not in final["fields"]
+    assert [t["message"] for t in final["turns"]] == ["Because", "Thanks"]
+    assert written_turns(fake_db) == [0, 1, 2, 3, 4]
+    assert fake_db.append_interview_turns.call_args.kwargs["turns"] == []
+
+
+@pytest.mark.asyncio
+async def test_checkpointer_flushes_in_background_after_max_turns():
+    session = make_session()
+    transcript = transcript_for(session)
+    fake_db = make_db()
+
+    with patch.object(checkpoint, "firestore_db", fake_db):
+        checkpointer = TranscriptCheckpointer(session, interval_seconds=60, max_turns=3, poll_seconds=0.01)
+        checkpointer.start()
+        for i in range(3):
+            transcript.add_text(ROLE_USER, f"answer {i}")
+            transcript.add_text(ROLE_AI, f"question {i}")
+        await asyncio.sleep(0.1)
+        await checkpointer.stop()
+
+    # the latest user and AI turns stay in memory until they settle
+    assert written_turns(fake_db) == [0, 1, 2, 3]
+    assert session.state["transcript_checkpoint"]["flushed"] == 4
+    # no final save (e.g. a crashed handler): stopping still releases the session's lock
+    assert session.id not in checkpoint._locks
+
+
+@pytest.mark.asyncio
+async def test_final_save_does_not_block_the_event_loop():
+    session = make_session()
+    session.state["workflow_id"] = "wf1"
+    transcript_for(session).add_text(ROLE_AI, "Introduce yourself")
+    fake_db = make_db()
+    fake_db.append_interview_turns.side_effect = lambda **kwargs: time.sleep(0.2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    with patch.object(checkpoint, "firestore_db", fake_db):
+        await agent.save_transcript(session)
+    task.cancel()
+
+    fake_db.append_interview_turns.assert_called_once()
+    # other sessions keep running while Firestore is written
+    assert ticks >= 10
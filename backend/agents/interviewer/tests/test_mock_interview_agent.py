@@ -22,12 +22,13 @@ async def test_transcript_updates():
         ("agent", "Hi there!")
     ]
 @pytest.mark.asyncio
-@patch("backend.data.database.firestore_db.get_personal_experience")
-@patch("backend.data.database.firestore_db.get_recommended_qas")
-async def test_start_agent_session_sets_state(mock_get_qas, mock_get_exp):
+@patch("backend.data.database.firestore_db.get_interview_context")
+async def test_start_agent_session_sets_state(mock_get_context):
     # Mock Firestore returns
-    mock_get_exp.return_value = {"experience": "Test"}
-    mock_get_qas.return_value = [{"question": "Why this role?"}]
+    mock_get_context.return_value = {
+        "personalExperience": {"experience": "Test"},
+        "recommendedQAs": [{"question": "Why this role?"}],
+    }
 
     # Setup
     session_id = "test-session"
@@ -66,9 +67,8 @@ async def test_session_expiry_logic():
 
 
 @pytest.mark.asyncio
-@patch("backend.data.database.firestore_db.get_personal_experience")
-@patch("backend.data.database.firestore_db.get_recommended_qas")
-async def test_system_instruction_is_set_correctly(mock_get_qas, mock_get_exp):
+@patch("backend.data.database.firestore_db.get_interview_context")
+async def test_system_instruction_is_set_correctly(mock_get_context):
     # Mock input data to prompt function
     mock_personal_experience = {
         "resumeInfo": "Backend dev experience in Python",
@@ -82,8 +82,7 @@ async def test_system_instruction_is_set_correctly(mock_get_qas, mock_get_exp):
         {"question": "Tell me about a time you optimized a system.", "answer": "I improved API response by 30%."}
     ]
 
-    mock_get_exp.return_value = mock_personal_experience
-    mock_get_qas.return_value = mock_recommended_qas
+    mock_get_context.return_value = {"personalExperience": mock_personal_experience, "recommendedQAs": mock_recommended_qas}
 
     # Start session
     _, _, session = await start_agent_session(
@@ -0,0 +1,78 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from google.adk.flows.llm_flows.contents import _get_contents
+from google.genai.types import Content, Part
+
+from backend.agents.interviewer import agent
+from backend.agents.interviewer.agent import agent_to_client_messaging, start_agent_session
+from backend.agents.interviewer.prompt import OPENING_REQUEST, get_opening_greeting
+
+CONTEXT = {
+    "title": "Backend Engineer",
+    "personalExperience": {"jobDescription": "Backend engineer"},
+    "recommendedQAs": [],
+}
+
+
+class MockWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message):
+        self.sent.append(json.loads(message))
+
+
+async def model_reply(text, release):
+    await release.wait()
+    yield SimpleNamespace(turn_complete=False, interrupted=False, content=Content(role="model", parts=[Part(text=text)]))
+    await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+@patch("backend.data.database.firestore_db.get_interview_context", return_value=CONTEXT)
+async def test_cached_opening_is_sent_before_the_model_answers(mock_get_context):
+    _, live_queue, session = await start_agent_session("opening-session", "user", "wf", 10)
+    greeting = get_opening_greeting("Backend Engineer")
+
+    # nothing is sent to the live model; it sees the greeting as history and waits
+    assert live_queue._queue.empty()
+    contents = _get_contents(None, session.events, agent.MockInterviewAgent().name)
+    assert [(c.role, c.parts[0].text) for c in contents] == [("user", OPENING_REQUEST), ("model", greeting)]
+    assert session.state["transcript"][0]["message"] == greeting
+
+    websocket = MockWebSocket()
+    release = asyncio.Event()
+    task = asyncio.create_task(agent_to_client_messaging(websocket, model_reply("Nice to meet you.", release), session))
+    await asyncio.sleep(0.01)
+    assert websocket.sent == [{"mime_type": "text/plain", "data": greeting}, {"turn_complete": True, "interrupted": False}]
+    first_message_ms = session.state["first_message_ms"]
+
+    release.set()
+    await asyncio.sleep(0.01)
+    task.cancel()
+    assert websocket.sent[-1]["data"] == "Nice to meet you."
+    # only the first message is timed
+    assert session.state["first_message_ms"] == first_message_ms
+
+
+@pytest.mark.asyncio
+@patch("backend.data.database.firestore_db.get_interview_context", return_value=CONTEXT)
+async def test_live_model_opens_when_the_cache_is_off(mock_get_context, monkeypatch):
+    monkeypatch.setattr(agent.InterviewConfig, "CACHED_OPENING", False)
+    _, live_queue, session = await start_agent_session("model-opening-session", "user", "wf", 10)
+
+    assert live_queue._queue.qsize() == 1
+    assert session.events == []
+
+    websocket = MockWebSocket()
+    release = asyncio.Event()
+    release.set()
+    task = asyncio.create_task(agent_to_client_messaging(websocket, model_reply("Hello! Tell me about yourself.", release), session))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    assert websocket.sent == [{"mime_type": "text/plain", "data": "Hello! Tell me about yourself."}]
+    assert session.state["first_message_ms"] >= 0
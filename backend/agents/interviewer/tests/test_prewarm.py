@@ -0,0 +1,63 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.agents.interviewer import agent
+from backend.agents.interviewer.agent import APP_NAME, prewarm_interview, start_agent_session
+from backend.agents.interviewer.prewarm import PrewarmRegistry
+from backend.coordinator.session_manager import session_service
+
+CONTEXT = {
+    "personalExperience": {"jobDescription": "Backend engineer"},
+    "recommendedQAs": [{"question": "Why this role?", "answer": "Impact", "tags": ["motivation"]}],
+}
+
+
+@pytest.mark.asyncio
+@patch("backend.data.database.firestore_db.get_interview_context", return_value=CONTEXT)
+async def test_websocket_picks_up_the_prewarmed_session(mock_get_context):
+    prewarm_interview("prewarm-session", "prewarm-user", "wf")
+    await asyncio.sleep(0.05)
+    assert mock_get_context.call_count == 1
+
+    with patch.object(agent, "prepare_interview") as inline:
+        _, _, session = await start_agent_session("prewarm-session", "prewarm-user", "wf", 10)
+
+    inline.assert_not_called()
+    assert session.state["personal_experience"] == CONTEXT["personalExperience"]
+    assert session.state["recommend_qas"] == CONTEXT["recommendedQAs"]
+    assert session.state["duration_minutes"] == 10
+    assert session.state["transcript"][0]["role"] == "AI"
+    # one document read for the whole setup
+    assert mock_get_context.call_count == 1
+
+
+@pytest.mark.asyncio
+@patch("backend.data.database.firestore_db.get_interview_context", return_value=CONTEXT)
+async def test_mismatched_or_expired_prewarm_is_rebuilt_inline(mock_get_context):
+    prewarm_interview("stolen-session", "owner", "wf")
+    _, _, session = await start_agent_session("stolen-session", "someone-else", "wf", 10)
+    assert session.user_id == "someone-else"
+    assert await session_service.get_session(app_name=APP_NAME, user_id="owner", session_id="stolen-session") is None
+
+    discarded = []
+
+    async def discard(prepared):
+        discarded.append(prepared)
+
+    async def prepare():
+        return "prepared"
+
+    registry = PrewarmRegistry(discard=discard, ttl_seconds=0.01)
+    registry.schedule("late", "user", "wf", prepare)
+    await asyncio.sleep(0.05)
+    assert await registry.claim("late", "user", "wf") is None
+    assert discarded == ["prepared"]
+
+    registry.schedule("never-claimed", "user", "wf", prepare)
+    await asyncio.sleep(0.05)
+    registry.schedule("next", "user", "wf", prepare)
+    await asyncio.sleep(0)
+    assert len(registry) == 1
+    assert discarded == ["prepared", "prepared"]
@@ -0,0 +1,147 @@
+import base64
+import json
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from google.adk.sessions import Session
+
+from backend.agents.interviewer import agent
+from backend.agents.interviewer.protocol import (
+    FRAME_AUDIO_PCM, HEADER_SIZE, FrameError, decode_frame, encode_audio_frame
+)
+
+
+def make_session():
+    session = Session(app_name="MockInterviewerAgent", user_id="test", id="protocol-test")
+    session.state["transcript"] = []
+    session.state["start_time"] = datetime.now(timezone.utc)
+    session.state["duration_minutes"] = 10
+    return session
+
+
+def test_audio_frame_round_trip():
+    pcm = bytes(range(256)) * 4
+    frame = encode_audio_frame(pcm, 70000)
+
+    assert len(frame) == HEADER_SIZE + len(pcm)
+    assert decode_frame(frame) == (FRAME_AUDIO_PCM, 70000 % 65536, pcm)
+
+    with pytest.raises(FrameError):
+        decode_frame(b"\x01")
+    with pytest.raises(FrameError):
+        decode_frame(b"\x09\x01\x00\x00pcm")
+
+
+@pytest.mark.asyncio
+async def test_binary_client_audio_is_forwarded_without_base64():
+    pcm = b"\x01\x02" * 800
+    websocket = MagicMock()
+    websocket.receive = AsyncMock(side_effect=[
+        {"type": "websocket.receive", "bytes": encode_audio_frame(pcm, 0)},
+        {"type": "websocket.receive", "text": json.dumps({"mime_type": "text/plain", "data": "Hello"})},
+        {"type": "websocket.disconnect", "code": 1000},
+    ])
+    live_request_queue = MagicMock()
+    session = make_session()
+
+    await agent.client_to_agent_messaging(websocket, live_request_queue, session, binary=True)
+
+    blob = live_request_queue.send_realtime.call_args.args[0]
+    assert blob.data == pcm
+    assert blob.mime_type == "audio/pcm"
+    live_request_queue.send_content.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_binary_agent_audio_is_sent_as_binary_frames():
+    pcm = b"\x00\x01" * 100
+    audio_event = SimpleNamespace(
+        turn_complete=False,
+        interrupted=False,
+        content=SimpleNamespace(role="model", parts=[SimpleNamespace(inline_data=SimpleNamespace(mime_type="audio/pcm;rate=24000", data=pcm), text=None)]),
+    )
+
+    async def live_events():
+        yield audio_event
+        yield audio_event
+
+    websocket = MagicMock()
+    websocket.send_bytes = AsyncMock()
+    websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    session = make_session()
+
+    with patch.object(agent, "is_session_expired", side_effect=[False, True]), \
+         patch.object(agent, "save_transcript"), \
+         patch.object(agent.feedback_queue, "enqueue"):
+        await agent.agent_to_client_messaging(websocket, live_events(), session, binary=True)
+
+    frames = [c.args[0] for c in websocket.send_bytes.call_args_list]
+    assert [decode_frame(f) for f in frames] == [(FRAME_AUDIO_PCM, 0, pcm), (FRAME_AUDIO_PCM, 1, pcm)]
+    # only the time's-up and end messages go out as text
+    sent_text = [json.loads(c.args[0]) for c in websocket.send_text.call_args_list]
+    assert all(m.get("mime_type") != "audio/pcm" for m in sent_text)
+    assert base64.b64encode(pcm).decode("ascii") not in "".join(c.args[0] for c in websocket.send_text.call_args_list)
+
+
+def make_websocket(messages):
+    websocket = MagicMock()
+    websocket.receive_text = AsyncMock(side_effect=[json.dumps(m) for m in messages] + [Exception("closed")])
+    websocket.close = AsyncMock()
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_typed_messages_are_dispatched_without_parsing_payloads():
+    audio = base64.b64encode(b"\x00\x01" * 4000).decode("ascii")
+    websocket = make_websocket([
+        {"type": "audio", "data": audio},
+        {"mime_type": "audio/pcm", "data": audio},
+        {"type": "text", "data": "{\"type\": \"control\"} is just text here"},
+        {"type": "control", "action": "end_interview", "reason": "user_stopped"},
+    ])
+    live_request_queue = MagicMock()
+    session = make_session()
+    real_loads = json.loads
+    parsed = []
+
+    def tracking_loads(s, *args, **kwargs):
+        parsed.append(s)
+        return real_loads(s, *args, **kwargs)
+
+    with patch.object(agent.json, "loads", side_effect=tracking_loads), \
+         patch.object(agent, "save_transcript") as save, \
+         patch.object(agent.feedback_queue, "enqueue") as judge:
+        await agent.client_to_agent_messaging(websocket, live_request_queue, session)
+
+    # only the four envelopes were parsed, never a payload
+    assert len(parsed) == 4
+    assert live_request_queue.send_realtime.call_count == 2
+    live_request_queue.send_content.assert_called_once()
+    save.assert_called_once_with(session)
+    judge.assert_called_once_with(session, agent.PRIORITY_HIGH)
+    websocket.close.assert_awaited_once_with(code=1000)
+    assert session.state["inbound_cpu"]["audio"]["count"] == 2
+    assert session.state["inbound_cpu"]["text"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_legacy_nested_control_still_ends_interview():
+    control = json.dumps({"type": "control", "action": "end_interview"})
+    websocket = make_websocket([
+        {"mime_type": "text/plain", "data": "Hello"},
+        {"mime_type": "text/plain", "data": control},
+        {"mime_type": "text/plain", "data": "never read"},
+    ])
+    live_request_queue = MagicMock()
+    session = make_session()
+
+    with patch.object(agent, "save_transcript") as save, \
+         patch.object(agent.feedback_queue, "enqueue"):
+        await agent.client_to_agent_messaging(websocket, live_request_queue, session)
+
+    save.assert_called_once_with(session)
+    live_request_queue.send_content.assert_called_once()
+    assert session.state["transcript"] == [{"role": "user", "message": "Hello"}]
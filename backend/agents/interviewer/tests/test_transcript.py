@@ -0,0 +1,103 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.agents.interviewer import agent
+from backend.agents.interviewer.transcript import (
+    ROLE_AI, ROLE_USER, TranscriptBuilder, sample_rate_from_mime
+)
+from backend.agents.interviewer.tests.test_protocol import make_session
+
+
+def test_audio_chunks_merge_into_one_entry_per_turn():
+    state = {}
+    transcript = TranscriptBuilder(state)
+
+    for _ in range(50):
+        transcript.add_audio(ROLE_USER, 3200, 16000)  # 0.1s each
+    for _ in range(30):
+        TranscriptBuilder(state).add_audio(ROLE_AI, 4800, 24000)
+    transcript.end_turn(ROLE_AI)
+    transcript.add_audio(ROLE_AI, 4800, 24000)
+    transcript.end_turn(ROLE_AI, "Second question?")
+
+    assert state["transcript"] == [
+        {"role": "user", "message": "[audio message]",
+         "audio": {"chunks": 50, "bytes": 160000, "duration_seconds": 5.0}},
+        {"role": "AI", "message": "[audio response sent]",
+         "audio": {"chunks": 30, "bytes": 144000, "duration_seconds": 3.0}},
+        {"role": "AI", "message": "Second question?",
+         "audio": {"chunks": 1, "bytes": 4800, "duration_seconds": 0.1}},
+    ]
+
+
+def test_transcription_fills_audio_turns_even_when_late():
+    state = {}
+    transcript = TranscriptBuilder(state)
+
+    transcript.add_audio(ROLE_USER, 3200, 16000)
+    transcript.add_transcription(ROLE_USER, " I worked on")
+    transcript.add_audio(ROLE_AI, 4800, 24000)
+    # arrives after the AI started answering
+    transcript.add_transcription(ROLE_USER, " payments.")
+    transcript.end_turn(ROLE_AI, "Tell me more. ")
+    transcript.add_text(ROLE_USER, "Sure")
+
+    assert [(e["role"], e["message"]) for e in state["transcript"]] == [
+        ("user", "I worked on payments."),
+        ("AI", "Tell me more."),
+        ("user", "Sure"),
+    ]
+
+
+def test_text_turns_and_sample_rate():
+    state = {}
+    transcript = TranscriptBuilder(state)
+    transcript.end_turn(ROLE_AI)  # nothing open, nothing recorded
+    transcript.end_turn(ROLE_AI, "Hello")
+    transcript.add_text(ROLE_USER, "Hi")
+
+    assert state["transcript"] == [{"role": "AI", "message": "Hello"}, {"role": "user", "message": "Hi"}]
+    assert sample_rate_from_mime("audio/pcm;rate=24000", 16000) == 24000
+    assert sample_rate_from_mime("audio/pcm", 16000) == 16000
+
+
+@pytest.mark.asyncio
+async def test_agent_audio_turn_is_recorded_once_with_transcription():
+    def event(part=None, role="model", turn_complete=False):
+        content = SimpleNamespace(role=role, parts=[part]) if part else None
+        return SimpleNamespace(turn_complete=turn_complete, interrupted=False, content=content)
+
+    def audio(pcm):
+        return SimpleNamespace(inline_data=SimpleNamespace(mime_type="audio/pcm;rate=24000", data=pcm), text=None)
+
+    def text(value):
+        return SimpleNamespace(inline_data=None, text=value)
+
+    async def live_events():
+        yield event(text("My answer"), role="user")
+        for _ in range(20):
+            yield event(audio(b"\x00" * 4800))
+        yield event(text("Thanks, "))
+        yield event(text("Thanks, next question."))
+        yield event(turn_complete=True)
+
+    websocket = MagicMock()
+    websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    session = make_session()
+
+    with patch.object(agent, "is_session_expired", side_effect=[False, True]), \
+         patch.object(agent, "save_transcript"), \
+         patch.object(agent.feedback_queue, "enqueue"):
+        await agent.agent_to_client_messaging(websocket, live_events(), session)
+
+    assert session.state["transcript"] == [
+        {"role": "user", "message": "My answer"},
+        {"role": "AI", "message": "Thanks, next question.",
+         "audio": {"chunks": 20, "bytes": 96000, "duration_seconds": 2.0}},
+    ]
+    # the user's transcription is not echoed back as an AI message
+    sent = [json.loads(c.args[0]).get("data") for c in websocket.send_text.call_args_list]
+    assert "My answer" not in sent
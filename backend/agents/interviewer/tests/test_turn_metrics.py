@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.agents.interviewer import agent, checkpoint, turn_metrics
+from backend.agents.interviewer.agent import save_transcript
+from backend.agents.interviewer.tests.test_protocol import make_session
+from backend.agents.interviewer.turn_metrics import session_summary, turn_metrics_for
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_turns_record_latency_bytes_interruptions_and_queue_depth(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(turn_metrics.time, "perf_counter", clock)
+    first_response_count = turn_metrics.FIRST_RESPONSE_SECONDS._count
+    interruptions = turn_metrics.INTERRUPTIONS._value
+    session = make_session()
+    metrics = turn_metrics_for(session)
+
+    # opening: nothing to respond to, so bytes only
+    metrics.agent_output(120)
+    assert metrics.end_turn(False, 40) == {
+        "first_response_ms": None, "turn_complete_ms": None, "outbound_bytes": 160,
+        "interrupted": False, "max_queue_depth": 0,
+    }
+
+    metrics.user_input(queue_depth=1)
+    clock.now += 0.5
+    metrics.user_input(queue_depth=3)  # latency counts from the last input
+    clock.now += 0.8
+    metrics.agent_output(1000)
+    clock.now += 1.2
+    metrics.agent_output(1000)
+    # the candidate barges in: the next turn answers this input
+    metrics.user_input(queue_depth=0)
+    input_at = clock.now
+    clock.now += 0.1
+    assert turn_metrics_for(session).end_turn(True, 45) == {
+        "first_response_ms": 800.0, "turn_complete_ms": None, "outbound_bytes": 2045,
+        "interrupted": True, "max_queue_depth": 3,
+    }
+    # turn_complete after an interruption without new output is not a turn
+    assert metrics.end_turn(False) is None
+
+    clock.now = input_at + 0.6
+    metrics.agent_output(500)
+    clock.now += 1.0
+    assert metrics.end_turn(False)["turn_complete_ms"] == 1600.0
+
+    summary = session_summary(session)
+    assert summary["turns"] == 3
+    assert summary["first_response_ms"] == {"p50": 600.0, "p95": 800.0, "max": 800.0}
+    assert summary["turn_complete_ms"] == {"p50": 1600.0, "p95": 1600.0, "max": 1600.0}
+    assert summary["outbound_bytes"] == 160 + 2045 + 500
+    assert summary["interruptions"] == 1
+    assert summary["max_queue_depth"] == 3
+
+    assert turn_metrics.FIRST_RESPONSE_SECONDS._count == first_response_count + 2
+    assert turn_metrics.INTERRUPTIONS._value == interruptions + 1
+
+
+def test_audio_turns_are_anchored_on_the_candidates_speech(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(turn_metrics.time, "perf_counter", clock)
+    metrics = turn_metrics_for(make_session())
+
+    # the microphone streams continuously: chunks alone anchor nothing
+    metrics.audio_input(queue_depth=0)
+    clock.now += 1.0
+    metrics.user_speech()
+    clock.now += 2.0
+    metrics.user_speech()  # end of the answer
+    for _ in range(5):
+        clock.now += 0.1
+        metrics.audio_input(queue_depth=1)  # trailing silence
+    clock.now += 0.2
+    metrics.agent_output(100)
+    clock.now += 1.0
+    metrics.user_speech()  # transcription lag, not a new answer
+    metrics.agent_output(100)
+    assert metrics.end_turn(False)["first_response_ms"] == 700.0
+
+    # the candidate barges in: their speech anchors the next turn
+    metrics.agent_output(100)
+    barge_in_at = clock.now
+    metrics.user_speech()
+    metrics.end_turn(True)
+    clock.now += 0.9
+    metrics.agent_output(100)
+    assert metrics.end_turn(False)["first_response_ms"] == pytest.approx((clock.now - barge_in_at) * 1000)
+
+
+@pytest.mark.asyncio
+async def test_latency_summary_is_saved_with_the_interview():
+    session = make_session()
+    session.state["workflow_id"] = "wf1"
+    session.state["inbound_cpu"] = {"text": {"count": 1, "cpu_seconds": 0.001}}
+    live_request_queue = agent.LiveRequestQueue()
+    agent._handle_client_text(live_request_queue, session, "Hello")
+    turn_metrics_for(session).agent_output(10)
+    turn_metrics_for(session).end_turn(False)
+
+    fake_db = MagicMock()
+    with patch.object(checkpoint, "firestore_db", fake_db):
+        await save_transcript(session)
+
+    fields = fake_db.append_interview_turns.call_args.kwargs["fields"]
+    assert fields["status"] == "completed"
+    assert fields["latency"]["turns"] == 1
+    assert fields["latency"]["max_queue_depth"] == 1
+    assert fields["latency"]["inbound_cpu"] == session.state["inbound_cpu"]
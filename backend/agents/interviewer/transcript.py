@@ -0,0 +1,126 @@
+"""
+Turn-aware interview transcript.
+
+Audio arrives as many small PCM chunks per turn. Instead of one transcript entry per
+chunk, consecutive chunks from the same speaker are merged into one entry per turn:
+
+    {"role": "user", "message": "<transcription or [audio message]>",
+     "audio": {"chunks": 42, "bytes": 134400, "duration_seconds": 4.2}}
+
+Text-only turns keep the plain {"role", "message"} shape. The entries live in
+session.state["transcript"] (what save_transcript and the judge read); open and latest
+turns per role are tracked in session.state["transcript_turns"], so a builder holds
+no state of its own and can be created per call.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+ROLE_AI = "AI"
+ROLE_USER = "user"
+
+AUDIO_PLACEHOLDERS = {ROLE_USER: "[audio message]", ROLE_AI: "[audio response sent]"}
+
+_RATE_PATTERN = re.compile(r"rate=(\d+)")
+
+
+def sample_rate_from_mime(mime_type: Optional[str], default: int) -> int:
+    """Read the rate from e.g. "audio/pcm;rate=24000" """
+    match = _RATE_PATTERN.search(mime_type or "")
+    return int(match.group(1)) if match else default
+
+
+class TranscriptBuilder:
+    """Appends to a session transcript, one entry per speaker turn"""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.entries: List[Dict[str, Any]] = state.setdefault("transcript", [])
+        # role -> index of the open turn / of the latest turn
+        turns = state.setdefault("transcript_turns", {"open": {}, "last": {}})
+        self._open: Dict[str, int] = turns["open"]
+        self._last: Dict[str, int] = turns["last"]
+
+    def _entry(self, index: Optional[int]) -> Optional[Dict[str, Any]]:
+        if index is None or index >= len(self.entries):
+            return None
+        return self.entries[index]
+
+    def _close(self, role: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(self._open.pop(role, None))
+        if entry is not None:
+            entry["message"] = entry["message"].strip() or AUDIO_PLACEHOLDERS.get(role, "")
+        return entry
+
+    def _append(self, role: str, entry: Dict[str, Any], keep_open: bool) -> Dict[str, Any]:
+        # A new entry ends every open turn, including the other speaker's
+        for open_role in list(self._open):
+            self._close(open_role)
+        self.entries.append(entry)
+        self._last[role] = len(self.entries) - 1
+        if keep_open:
+            self._open[role] = self._last[role]
+        return entry
+
+    def add_text(self, role: str, text: str) -> None:
+        """Record a complete text message as its own turn"""
+        self._append(role, {"role": role, "message": text}, keep_open=False)
+
+    def add_audio(self, role: str, num_bytes: int, sample_rate: int) -> None:
+        """Merge a PCM chunk (16-bit mono) into the speaker's current audio turn"""
+        entry = self._entry(self._open.get(role))
+        if entry is None or "audio" not in entry:
+            entry = self._append(role, {
+                "role": role,
+                "message": AUDIO_PLACEHOLDERS[role],
+                "audio": {"chunks": 0, "bytes": 0, "duration_seconds": 0.0},
+            }, keep_open=True)
+        audio = entry["audio"]
+        audio["chunks"] += 1
+        audio["bytes"] += num_bytes
+        audio["duration_seconds"] = round(audio["duration_seconds"] + num_bytes / (2 * sample_rate), 3)
+
+    def add_transcription(self, role: str, text: str) -> None:
+        """
+        Append live transcription text to the speaker's current turn. Transcription
+        can lag the audio, so an audio turn the other speaker has just closed still
+        receives it.
+        """
+        if not text:
+            return
+        entry = self._entry(self._open.get(role))
+        if entry is None:
+            entry = self._entry(self._last.get(role))
+            if entry is None or "audio" not in entry:
+                entry = self._append(role, {"role": role, "message": ""}, keep_open=True)
+        if entry["message"] == AUDIO_PLACEHOLDERS.get(role):
+            entry["message"] = ""
+        entry["message"] += text
+        if self._open.get(role) != self._last.get(role):
+            # late text for a closed turn: keep it tidy now, nothing will close it again
+            entry["message"] = entry["message"].strip()
+
+    def end_turn(self, role: str, text: Optional[str] = None) -> None:
+        """
+        Close the speaker's current turn. `text` (e.g. the model's full response or
+        output transcription) replaces the turn's message, or becomes a text turn
+        when no turn is open.
+        """
+        text = (text or "").strip()
+        entry = self._close(role)
+        if entry is None:
+            if text:
+                self.add_text(role, text)
+        elif text:
+            entry["message"] = text
+
+    def settled_count(self) -> int:
+        """
+        Number of leading entries that will not change any more: everything before
+        the open turns and before each speaker's latest turn (late transcription).
+        """
+        pending = list(self._open.values()) + list(self._last.values())
+        return min([len(self.entries)] + pending)
+
+
+def transcript_for(session) -> TranscriptBuilder:
+    return TranscriptBuilder(session.state)
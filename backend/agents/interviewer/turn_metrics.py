@@ -0,0 +1,180 @@
+"""
+Per-turn latency of the live interview loop.
+
+client_to_agent_messaging reports every client message together with the
+LiveRequestQueue depth after queueing it; agent_to_client_messaging reports the
+input transcription of the candidate's speech, the frames it sends and the end of
+every model turn. Each model turn is recorded as:
+
+    {"first_response_ms": 820.5, "turn_complete_ms": 2310.0, "outbound_bytes": 96412,
+     "interrupted": false, "max_queue_depth": 3}
+
+Latencies run from the turn's anchor to its first text or audio (first_response_ms)
+and to turn_complete (turn_complete_ms):
+
+- a text message anchors the turn at the last message before the first output
+- audio is streamed continuously (silence included), so a chunk marks nothing;
+  the last input transcription before the first output, i.e. roughly the end of
+  the candidate's speech, anchors the turn. Transcriptions arriving while the agent
+  already answers are transcription lag and ignored, unless the candidate barges in:
+  then the last one anchors the next turn. Latencies therefore include the live
+  model's end-of-speech detection.
+
+A turn without an anchor (the cached opening) has no latencies. Like the
+transcript, the records live in session.state, in "turn_metrics"; session_summary()
+condenses them for the interview record, and every turn also feeds the process-wide
+histograms served at GET /metrics.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from backend.tools.metrics import registry
+
+FIRST_RESPONSE_SECONDS = registry.histogram(
+    "interview_first_response_seconds",
+    "Time from the last client message to the first agent text or audio of a turn",
+    [0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 13, 20],
+)
+TURN_COMPLETE_SECONDS = registry.histogram(
+    "interview_turn_complete_seconds",
+    "Time from the last client message to turn_complete of an agent turn",
+    [0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60],
+)
+TURN_OUTBOUND_BYTES = registry.histogram(
+    "interview_turn_outbound_bytes",
+    "Bytes sent to the client during one agent turn",
+    [1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000],
+)
+LIVE_QUEUE_DEPTH = registry.histogram(
+    "interview_live_queue_depth",
+    "LiveRequestQueue depth after queueing a client message",
+    [0, 1, 2, 5, 10, 25, 50, 100],
+)
+INTERRUPTIONS = registry.counter(
+    "interview_interruptions_total",
+    "Agent turns interrupted by the candidate",
+)
+
+
+def _new_turn(input_at: Optional[float] = None) -> Dict[str, Any]:
+    return {"input_at": input_at, "first_output_at": None, "bytes": 0, "max_queue_depth": 0}
+
+
+def _ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return round((end - start) * 1000, 1)
+
+
+def _distribution(values: List[float]) -> Optional[Dict[str, float]]:
+    """Nearest-rank p50/p95 and max"""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+    return {"p50": rank(50), "p95": rank(95), "max": ordered[-1]}
+
+
+class TurnMetrics:
+    """Records the turns of one session in session.state["turn_metrics"]"""
+
+    def __init__(self, state: Dict[str, Any]):
+        self._metrics = state.setdefault(
+            "turn_metrics",
+            {"current": _new_turn(), "next_input_at": None, "barge_in_at": None, "turns": [], "interruptions": 0},
+        )
+
+    @property
+    def turns(self) -> List[Dict[str, Any]]:
+        return self._metrics["turns"]
+
+    @property
+    def interruptions(self) -> int:
+        return self._metrics["interruptions"]
+
+    def user_input(self, queue_depth: int) -> None:
+        """A text message: anchors the turn answering it"""
+        current = self._metrics["current"]
+        if current["first_output_at"] is None:
+            current["input_at"] = time.perf_counter()
+        else:
+            # The agent is already answering: this input is what the next turn responds to
+            self._metrics["next_input_at"] = time.perf_counter()
+        self._queued(queue_depth)
+
+    def audio_input(self, queue_depth: int) -> None:
+        """An audio chunk: counted for the queue depth only"""
+        self._queued(queue_depth)
+
+    def user_speech(self) -> None:
+        """Input transcription of the candidate's audio"""
+        current = self._metrics["current"]
+        if current["first_output_at"] is None:
+            current["input_at"] = time.perf_counter()
+        else:
+            self._metrics["barge_in_at"] = time.perf_counter()
+
+    def _queued(self, queue_depth: int) -> None:
+        current = self._metrics["current"]
+        current["max_queue_depth"] = max(current["max_queue_depth"], queue_depth)
+        LIVE_QUEUE_DEPTH.observe(queue_depth)
+
+    def agent_output(self, nbytes: int) -> None:
+        current = self._metrics["current"]
+        current["bytes"] += nbytes
+        if current["first_output_at"] is None:
+            current["first_output_at"] = time.perf_counter()
+            if current["input_at"] is not None:
+                FIRST_RESPONSE_SECONDS.observe(current["first_output_at"] - current["input_at"])
+
+    def end_turn(self, interrupted: bool, nbytes: int = 0) -> Optional[Dict[str, Any]]:
+        """Close the agent turn (turn_complete or interrupted); returns its record"""
+        if interrupted:
+            self._metrics["interruptions"] += 1
+            INTERRUPTIONS.inc()
+        current = self._metrics["current"]
+        if current["first_output_at"] is None:
+            # Nothing was sent in this turn (e.g. turn_complete right after an interruption)
+            return None
+        now = time.perf_counter()
+        record = {
+            "first_response_ms": _ms(current["input_at"], current["first_output_at"]),
+            "turn_complete_ms": None if interrupted else _ms(current["input_at"], now),
+            "outbound_bytes": current["bytes"] + nbytes,
+            "interrupted": interrupted,
+            "max_queue_depth": current["max_queue_depth"],
+        }
+        if record["turn_complete_ms"] is not None:
+            TURN_COMPLETE_SECONDS.observe(now - current["input_at"])
+        TURN_OUTBOUND_BYTES.observe(record["outbound_bytes"])
+        self.turns.append(record)
+        next_input_at = self._metrics["next_input_at"]
+        if next_input_at is None and interrupted:
+            next_input_at = self._metrics["barge_in_at"]
+        self._metrics["current"] = _new_turn(next_input_at)
+        self._metrics["next_input_at"] = None
+        self._metrics["barge_in_at"] = None
+        return record
+
+
+def turn_metrics_for(session) -> TurnMetrics:
+    return TurnMetrics(session.state)
+
+
+def session_summary(session) -> Dict[str, Any]:
+    """Latency summary of an interview, stored with its record"""
+    turns = turn_metrics_for(session).turns
+    return {
+        "turns": len(turns),
+        "first_message_ms": session.state.get("first_message_ms"),
+        "first_response_ms": _distribution([t["first_response_ms"] for t in turns if t["first_response_ms"] is not None]),
+        "turn_complete_ms": _distribution([t["turn_complete_ms"] for t in turns if t["turn_complete_ms"] is not None]),
+        "outbound_bytes": sum(t["outbound_bytes"] for t in turns),
+        "interruptions": turn_metrics_for(session).interruptions,
+        "max_queue_depth": max((t["max_queue_depth"] for t in turns), default=0),
+        "inbound_cpu": session.state.get("inbound_cpu"),
+    }
@@ -4,13 +4,12 @@ import json
 import os
 import asyncio
 import sys
-import re
 
 # Add the project root to the Python path if necessary
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
 # Import unified config
-from backend.config import set_google_cloud_env_vars
+from backend.config import set_google_cloud_env_vars, WorkflowConfig
 
 # Load environment variables
 set_google_cloud_env_vars()
@@ -19,8 +18,12 @@ from google.adk.agents import LlmAgent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
+from backend.tools.json_parser import parse_json_response
 from .prompt import QUESTION_GENERATION_PROMPT
-from backend.data.database import firestore_db
+from backend.data.bq_index import select_general_bqs, compact_bqs
+from backend.tools.log import get_logger
+
+logger = get_logger(__name__)
 
 # Create global agent instance
 QUESTION_GENERATOR_AGENT = LlmAgent(
@@ -49,16 +52,6 @@ def generate_custom_questions(personal_summary, industry_faqs, num_questions=50)
 async def _run_question_generator(personal_summary, industry_faqs, num_questions):
     """Internal async function that executes the AI call"""
     
-    # Get general behavioral questions from database
-    try:
-        general_bqs = firestore_db.get_general_bqs()
-        if not general_bqs:
-            general_bqs = []
-            print("Warning: No general BQs found in database")
-    except Exception as e:
-        print(f"Warning: Could not fetch general BQs from database: {e}")
-        general_bqs = []
-    
     # Extract key components for better analysis
     target_job_title = personal_summary.get("title", "Unknown Position")
     job_description = personal_summary.get("jobDescription", "")
@@ -69,6 +62,17 @@ async def _run_question_generator(personal_summary, industry_faqs, num_questions
         "githubInfo": personal_summary.get("githubInfo", ""),
         "portfolioInfo": personal_summary.get("portfolioInfo", "")
     }
+
+    # Pick the general behavioral questions most relevant to the role from the local index
+    try:
+        general_bqs = await asyncio.to_thread(
+            select_general_bqs, f"{target_job_title} {job_description}", WorkflowConfig.GENERAL_BQ_TOP_K
+        )
+        if not general_bqs:
+            logger.warning("No general BQs found in database")
+    except Exception as e:
+        logger.warning("Could not fetch general BQs from database: %s", e)
+        general_bqs = []
     
     # Prepare structured input data
     input_data = f"""
@@ -87,7 +91,7 @@ async def _run_question_generator(personal_summary, industry_faqs, num_questions
     {json.dumps(industry_faqs, indent=2)}
     
     ## GENERAL BEHAVIORAL QUESTIONS (from database)
-    {json.dumps(general_bqs, indent=2)}
+    {compact_bqs(general_bqs)}
     
     ## TASK REQUIREMENTS
     IMPORTANT: The output JSON array must contain EXACTLY {num_questions} questions(NO MORE, NO LESS).
@@ -127,36 +131,6 @@ async def _run_question_generator(personal_summary, industry_faqs, num_questions
             break
     
     # Parse JSON result
-    try:
-        markdown_json_pattern = r"```(?:json)?\s*([\s\S]*?)\s*```"
-        markdown_matches = re.findall(markdown_json_pattern, response_text)
-        
-        if markdown_matches:
-            clean_json_str = markdown_matches[0].strip()
-            result = json.loads(clean_json_str)
-        else:
-            result = json.loads(response_text)
-            
-    except json.JSONDecodeError:
-        try:
-            start_index = response_text.find('[')
-            end_index = response_text.rfind(']') + 1
-            if start_index >= 0 and end_index > start_index:
-                json_str = response_text[start_index:end_index]
-                result = json.loads(json_str)
-            else:
-                # Fallback: try to find object notation
-                start_index = response_text.find('{')
-                end_index = response_text.rfind('}') + 1
-                if start_index >= 0 and end_index > start_index:
-                    json_str = response_text[start_index:end_index]
-                    result = json.loads(json_str)
-                else:
-                    raise ValueError("Could not find valid JSON in the response")
-        except Exception as e:
-            result = {
-                "error": f"Error parsing response: {str(e)}",
-                "raw_response": response_text
-            }
+    result = parse_json_response(response_text)
     
     return result 
\ No newline at end of file
@@ -9,6 +9,9 @@ You are an expert interview coach and question generator. Your task is to create
 **Industry FAQs from Search Agent:**
 {industry_faqs}
 
+**General Behavioral Questions (from database, most relevant to the role first):**
+{general_bqs?}
+
 ## CRITICAL REQUIREMENT: EXACT QUESTION COUNT
 
 **MANDATORY**: Look for the line "Number of questions to generate: [NUMBER]" in the personal summary above.
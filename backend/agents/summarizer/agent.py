@@ -1,10 +1,8 @@
 """Resume summarization agent - Convert user's resume content into structured JSON format"""
 
-import json
 import os
 import asyncio
 import sys
-import re
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
@@ -19,6 +17,7 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import google_search
 from google.genai import types
+from backend.tools.json_parser import parse_json_response
 from .prompt import SUMMARIZER_PROMPT
 
 # Create global agent instance
@@ -107,29 +106,6 @@ async def _run_summarizer(resume_text, linkedinLink, githubLink, portfolioLink,
             break
     
     # Parse JSON result
-    try:
-        markdown_json_pattern = r"```(?:json)?\s*([\s\S]*?)\s*```"
-        markdown_matches = re.findall(markdown_json_pattern, response_text)
-        
-        if markdown_matches:
-            clean_json_str = markdown_matches[0].strip()
-            result = json.loads(clean_json_str)
-        else:
-            result = json.loads(response_text)
-            
-    except json.JSONDecodeError:
-        try:
-            start_index = response_text.find('{')
-            end_index = response_text.rfind('}') + 1
-            if start_index >= 0 and end_index > start_index:
-                json_str = response_text[start_index:end_index]
-                result = json.loads(json_str)
-            else:
-                raise ValueError("Could not find valid JSON in the response")
-        except Exception as e:
-            result = {
-                "error": f"Error parsing response: {str(e)}",
-                "raw_response": response_text
-            }
+    result = parse_json_response(response_text)
     
     return result
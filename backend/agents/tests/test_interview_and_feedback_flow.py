@@ -27,7 +27,7 @@ class MockWebSocket:
         self.queue.put_nowait(json.dumps({"mime_type": mime_type, "data": data}))
 
 @pytest.mark.asyncio
-@patch("backend.agents.interviewer.agent._run_judge_from_session", new_callable=AsyncMock)
+@patch("backend.agents.interviewer.agent.feedback_queue.enqueue")
 @patch("backend.agents.interviewer.agent.save_transcript")
 async def test_feedback_is_generated_and_stored(
     mock_save_transcript,
@@ -62,13 +62,13 @@ async def test_feedback_is_generated_and_stored(
 
     # Assertions
     mock_save_transcript.assert_called_once()
-    mock_judge_run.assert_awaited_once()
+    mock_judge_run.assert_called_once()
 
     print("Feedback and transcript were both generated and stored correctly.")
 
 @pytest.mark.asyncio
-@patch("backend.agents.interviewer.agent._run_judge_from_session", new_callable=AsyncMock)
-@patch("backend.agents.interviewer.agent.save_transcript", new_callable=AsyncMock)
+@patch("backend.agents.interviewer.agent.feedback_queue.enqueue")
+@patch("backend.agents.interviewer.agent.save_transcript")
 @patch("backend.data.database.firestore_db.get_feedback")
 async def test_full_interview_to_feedback_flow(
         mock_get_feedback,
@@ -129,7 +129,7 @@ async def test_full_interview_to_feedback_flow(
 
 
 @pytest.mark.asyncio
-@patch("backend.agents.interviewer.agent._run_judge_from_session", new_callable=AsyncMock)
+@patch("backend.agents.interviewer.agent.feedback_queue.enqueue")
 @patch("backend.agents.interviewer.agent.save_transcript")
 async def test_feedback_on_client_disconnect(
     mock_save_transcript,
@@ -173,5 +173,5 @@ async def test_feedback_on_client_disconnect(
 
     # Step 6: Assertions
     mock_save_transcript.assert_called_once()
-    mock_judge_run.assert_awaited_once()
+    mock_judge_run.assert_called_once()
     print("✅ Feedback and transcript were saved correctly after disconnect.")
\ No newline at end of file
@@ -1,21 +1,29 @@
 from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException, Body, WebSocket, WebSocketDisconnect, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, List
 import time
 from backend.tools.firebase_config import auth
 from backend.data.database import firestore_db
+from backend.data.snapshots import general_bqs_snapshot, problems_snapshot
+from backend.data.bq_index import general_bq_index
+from backend.data.problem_index import problem_index, SORT_FIELDS
 from backend.data.schemas import Profile
-from backend.agents.interviewer.agent import start_agent_session, client_to_agent_messaging, agent_to_client_messaging, save_transcript
+from backend.agents.interviewer.agent import start_agent_session, client_to_agent_messaging, agent_to_client_messaging, save_transcript, prewarm_interview
+from backend.agents.interviewer.checkpoint import TranscriptCheckpointer
+from backend.agents.interview_judge.incremental import TurnEvaluator
+from backend.agents.interviewer.protocol import PROTOCOLS, PROTOCOL_JSON, PROTOCOL_BINARY
 from backend.tools.connection_manager import manager
+from backend.tools.log import get_logger, bind
+from backend.tools.metrics import registry as metrics_registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
 from backend.api.schemas import InterviewStartRequest
 import asyncio
 from datetime import datetime, timezone
 from backend.coordinator.preparation_workflow import generate_session_id
-from backend.agents.interview_judge.agent import _run_judge_from_session
-from backend.coordinator.session_manager import session_service
+from backend.coordinator.feedback_queue import feedback_queue, PRIORITY_LOW
 
 # PDF processing imports
-from backend.config import PDFConfig
+from backend.config import PDFConfig, FeedbackConfig, InterviewConfig
 from backend.services.pdf import PDFProcessor
 from backend.coordinator.preparation_workflow import run_preparation_workflow
 from backend.services.pdf.exceptions import (
@@ -28,6 +36,7 @@ from backend.services.pdf.exceptions import (
 
 router = APIRouter()
 bearer = HTTPBearer()
+logger = get_logger(__name__)
 
 # Initialize PDF processor with configuration
 pdf_config = PDFConfig()
@@ -44,7 +53,7 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(beare
             name = user_record.display_name or ""
             picture = user_record.photo_url or ""
         except Exception as e:
-            print(f"Warning: Could not fetch user record: {e}")
+            logger.warning("Could not fetch user record: %s", e)
             # Fallback to token data
             name = decoded_token.get("name", "")
             picture = decoded_token.get("picture", "")
@@ -56,13 +65,80 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(beare
             "picture": picture
         }
     except Exception as e:
-        print(f"Token verification failed: {e}")
+        logger.warning("Token verification failed: %s", e)
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 @router.get("/")
 def public_route():
     return {"success": True, "data": None}
 
+# Prometheus scrape endpoint (process-wide live interview histograms, tools/metrics.py)
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+# diagnostics route
+@router.get("/diagnostics/snapshots")
+def get_snapshot_diagnostics(user=Depends(verify_token)):
+    return {
+        "success": True,
+        "data": {
+            "bqs": general_bqs_snapshot.diagnostics(),
+            "bqsIndex": general_bq_index.diagnostics(),
+            "problems": problems_snapshot.diagnostics(),
+            "problemsIndex": problem_index.diagnostics()
+        }
+    }
+
+# coding problems route (served from the in-memory problem index)
+@router.get("/problems")
+def list_problems(
+    topic: Optional[List[str]] = Query(None),
+    difficulty: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None),
+    q: Optional[str] = Query(None),
+    sort_by: Optional[str] = Query(None),
+    order: str = Query("desc"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    user=Depends(verify_token)
+):
+    if sort_by and sort_by not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort_by. Use one of: {', '.join(SORT_FIELDS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+
+    result = problem_index.query(
+        topics=topic,
+        difficulty=difficulty,
+        category=category,
+        prefix=q,
+        sort_by=sort_by,
+        descending=order == "desc",
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+    return {
+        "success": True,
+        "data": {
+            "problems": result["items"],
+            "total": result["total"],
+            "page": page,
+            "pageSize": page_size
+        }
+    }
+
+@router.get("/problems/{problem_id}/similar")
+def get_similar_problems(problem_id: str, user=Depends(verify_token)):
+    # similar_questions is precomputed offline (backend/scripts/similarity.py)
+    result = firestore_db.get_coding_problems(problem_id)
+    if not result["data"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return {
+        "success": True,
+        "data": result["data"].get("similar_questions", [])
+    }
+
 # Default avatar URL for users without profile pictures
 DEFAULT_AVATAR_URL = "https://api.dicebear.com/7.x/avataaars/svg?seed=default"
 
@@ -153,29 +229,47 @@ async def websocket_endpoint(
     user_id: str = Query(...),
     workflow_id: str = Query(...),
     duration: int = Query(10), #change the default duration here
-    is_audio: bool = Query(False)
+    is_audio: bool = Query(False),
+    protocol: str = Query(PROTOCOL_JSON) # "binary": audio as binary frames (see agents/interviewer/protocol.py)
 ):    
     """Client WebSocket endpoint to interact with real-time interview agent."""
 
+    log = bind(logger, session_id=session_id, user_id=user_id, workflow_id=workflow_id)
+
     # Wait for client connection
     await manager.connect(websocket)
-    print(f"Client #{session_id} connected, audio mode: {is_audio}")
+    if protocol not in PROTOCOLS:
+        log.warning("Client requested unsupported protocol '%s'", protocol)
+        manager.disconnect(websocket)
+        await websocket.close(code=1003)
+        return
+    binary = protocol == PROTOCOL_BINARY
+    log.info("Client connected", extra={"is_audio": is_audio, "protocol": protocol})
 
+    checkpointer = None
+    evaluator = None
     try: 
         # Start agent session
         live_events, live_request_queue, session = await start_agent_session(session_id, user_id, workflow_id, duration, is_audio)
+        # Append settled transcript turns to Firestore while the interview runs
+        checkpointer = TranscriptCheckpointer(session)
+        checkpointer.start()
+        # Score completed Q/A turns in the background so final feedback only synthesizes notes
+        if FeedbackConfig.TURN_EVAL_ENABLED:
+            evaluator = TurnEvaluator(session)
+            evaluator.start()
 
         # Start tasks
         agent_to_client_task = asyncio.create_task(
-            agent_to_client_messaging(websocket, live_events, session)
+            agent_to_client_messaging(websocket, live_events, session, binary)
         )
         client_to_agent_task = asyncio.create_task(
-            client_to_agent_messaging(websocket, live_request_queue, session)
+            client_to_agent_messaging(websocket, live_request_queue, session, binary)
         )
         await asyncio.gather(agent_to_client_task, client_to_agent_task)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
-        print(f"❌ Client #{session_id} disconnected")
+        log.info("Client disconnected")
         try:
             # Manually expire session
             session.state["duration"] = int(
@@ -183,44 +277,43 @@ async def websocket_endpoint(
             )
 
             # Save transcript
-            save_transcript(session)
-            print(f"[SAVE]: Transcript saved for session {session_id}")
+            await save_transcript(session)
+            log.info("Transcript saved")
 
-            # Generate feedback
-            await _run_judge_from_session(session)
-            print(f"[FEEDBACK]: Feedback generated for session {session_id}")
-
-            # FINALIZE: close the session
-            try:
-                await session_service.delete_session(
-                    app_name=session.app_name,
-                    user_id=session.user_id,
-                    session_id=session.id
-                )
-                print(f"[CLEANUP]: Session {session.id} successfully closed.")
-            except Exception as e:
-                print(f"[CLEANUP ERROR]: Failed to close session {session.id}: {e}")
+            # Generate feedback in the background (no-op when an end path already queued
+            # it); the queue closes the session once judging is finished
+            feedback_queue.enqueue(session, PRIORITY_LOW)
         except Exception as e:
-            print(f"[ERROR]: Failed to finalize session after disconnect: {e}")
+            log.error("Failed to finalize session after disconnect: %s", e)
     except Exception as e:
-        print(f"[ERROR] Client #{session_id} error: {e}")
+        log.error("Client error: %s", e)
         manager.disconnect(websocket)
         try:
             await websocket.close()
         except Exception:
             pass
+    finally:
+        if checkpointer:
+            await checkpointer.stop()
+        if evaluator:
+            await evaluator.stop()
 
 @router.post("/interviews/start")
 async def start_interview(request: InterviewStartRequest, user=Depends(verify_token)):
     session_id = generate_session_id()
 
-    # You might want to store this session info in the database here
+    # Load the workflow, build the instruction and create the ADK session while the
+    # client opens its WebSocket; the handler claims the ready session
+    if InterviewConfig.PREWARM_ENABLED:
+        prewarm_interview(session_id, user["uid"], request.workflow_id)
 
     # Format WebSocket parameters
     websocket_parameter = (
         f"?user_id={user['uid']}&workflow_id={request.workflow_id}"
         f"&duration={request.duration}&is_audio={str(request.is_audio).lower()}"
     )
+    if request.protocol != PROTOCOL_JSON:
+        websocket_parameter += f"&protocol={request.protocol}"
 
     return {
         "success": True,
@@ -236,7 +329,10 @@ async def generate_feedback(workflow_id: str, session_id: str, user=Depends(veri
 
     return {
         "success": feedback_result["data"] is not None,
-        "data": feedback_result["data"]
+        "data": feedback_result["data"],
+        # Background job state while the feedback is not stored yet (queued, running,
+        # retrying, failed); None when this process has no job for the session
+        "status": feedback_queue.status(session_id) if feedback_result["data"] is None else "done"
     }
 
 # Authenticated workflow APIs
@@ -282,9 +378,9 @@ async def start_workflow_with_pdf(
                 
                 # Update profile in database
                 firestore_db.create_or_update_profile(user_id, updated_profile)
-                print(f"Updated user profile with social links for user {user_id}")
+                logger.info("Updated user profile with social links", extra={"user_id": user_id})
             except Exception as profile_error:
-                print(f"Warning: Failed to update user profile: {profile_error}")
+                logger.warning("Failed to update user profile: %s", profile_error, extra={"user_id": user_id})
                 # Continue with workflow even if profile update fails
         
         # Start the preparation workflow
@@ -369,9 +465,9 @@ async def start_workflow_with_text(
                 
                 # Update profile in database
                 firestore_db.create_or_update_profile(user_id, updated_profile)
-                print(f"Updated user profile with social links for user {user_id}")
+                logger.info("Updated user profile with social links", extra={"user_id": user_id})
             except Exception as profile_error:
-                print(f"Warning: Failed to update user profile: {profile_error}")
+                logger.warning("Failed to update user profile: %s", profile_error, extra={"user_id": user_id})
                 # Continue with workflow even if profile update fails
         
         # Start the preparation workflow
@@ -16,3 +16,4 @@ class InterviewStartRequest(BaseModel):
     workflow_id: str
     duration: int = 15 #can set the default value here
     is_audio: bool = False
+    protocol: str = "json" # "binary" sends audio as binary WebSocket frames
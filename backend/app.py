@@ -1,11 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from backend.api.routes import router
+from backend.coordinator.feedback_queue import feedback_queue
+from backend.data.snapshots import general_bqs_snapshot, problems_snapshot
+from backend.tools.log import get_logger, setup_logging, shutdown_logging
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = get_logger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Structured logs are written by a background thread, never on the event loop
+    setup_logging()
+    # Load system data snapshots once; listeners keep them fresh afterwards
+    snapshots = [general_bqs_snapshot, problems_snapshot]
+    # Concurrently, so a slow Firestore delays startup once rather than once per collection
+    results = await asyncio.gather(
+        *(asyncio.to_thread(snapshot.start) for snapshot in snapshots), return_exceptions=True
+    )
+    for snapshot, result in zip(snapshots, results):
+        if isinstance(result, Exception):
+            logger.warning(
+                "Could not load '%s' snapshot at startup: %s", snapshot.collection_name, result,
+                extra={"collection": snapshot.collection_name}
+            )
+    # Judge workers for finished interviews
+    feedback_queue.start()
+    yield
+    # Give queued feedback jobs a moment to finish before shutting down
+    await feedback_queue.stop()
+    for snapshot in snapshots:
+        snapshot.stop()
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",            # for local React dev
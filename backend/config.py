@@ -61,4 +61,122 @@ class PDFConfig:
     MIN_TEXT_QUALITY_WORDS = 5   # minimum words for quality analysis
     
     # PDF processing limits
-    MAX_PAGE_COUNT = 50  # maximum pages to process
\ No newline at end of file
+    MAX_PAGE_COUNT = 50  # maximum pages to process
+
+
+class WorkflowConfig:
+    """
+    Interview preparation workflow settings
+    """
+    # Overlap question and answer generation instead of running them back to back
+    PIPELINED = True
+
+    # Number of questions generated per question_generator call in pipelined mode
+    QUESTION_BATCH_SIZE = 10
+
+    # Number of streamed questions that start an answer_generator call in pipelined mode
+    ANSWER_BATCH_SIZE = 5
+
+    # Number of general behavioral questions (ranked by relevance to the role) given to the question generator
+    GENERAL_BQ_TOP_K = 15
+
+
+class InterviewConfig:
+    """
+    Live mock interview settings
+    """
+    # Ask the live model to transcribe both sides of audio interviews into the transcript
+    TRANSCRIBE_AUDIO = True
+
+    # Sample rates of the 16-bit mono PCM streams (client microphone / model voice)
+    INPUT_SAMPLE_RATE = 16000
+    OUTPUT_SAMPLE_RATE = 24000
+
+    # Live transcripts are appended to Firestore every CHECKPOINT_INTERVAL_SECONDS
+    # or as soon as CHECKPOINT_MAX_TURNS settled turns are waiting
+    CHECKPOINT_INTERVAL_SECONDS = 15
+    CHECKPOINT_MAX_TURNS = 6
+
+    # Recommended QAs in the interviewer's system instruction (data/qa_context.py):
+    # most relevant and varied questions, without answers, within a token budget
+    QA_TOP_K = 15
+    QA_TOKEN_BUDGET = 1200
+
+    # POST /interviews/start prepares the session in the background (agents/interviewer/prewarm.py);
+    # a WebSocket connecting later than this builds it again inline
+    PREWARM_ENABLED = True
+    PREWARM_TTL_SECONDS = 120
+
+    # Send a precomputed greeting as the first interviewer turn instead of waiting for
+    # the live model to generate it; the model takes over from the candidate's answer
+    CACHED_OPENING = True
+
+
+class LoggingConfig:
+    """
+    Structured logging settings (see tools/log.py)
+    """
+    LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+    # One JSON object per line (Cloud Logging structured logs); plain text lines otherwise
+    JSON = os.getenv("LOG_FORMAT", "json").lower() == "json"
+
+    # Max records per second for chunk-level categories; other records are not limited
+    RATE_LIMITS = {
+        "audio": 1.0,           # every PCM chunk in either direction
+        "text_chunk": 2.0,      # streamed model text
+        "workflow_event": 5.0,  # ADK events of the preparation workflow
+    }
+
+    # Records waiting for the writer thread; further records are dropped, never blocked on
+    QUEUE_SIZE = 10000
+
+
+class FeedbackConfig:
+    """
+    Interview feedback (judge) settings
+    """
+    # Resource link validation (tools/link_validator.py); results are shared across sessions
+    LINK_TTL_SECONDS = 6 * 60 * 60
+    LINK_NEGATIVE_TTL_SECONDS = 30 * 60
+    LINK_TIMEOUT_SECONDS = 5
+    LINK_MAX_BYTES = 64 * 1024  # body prefix read per link
+    LINK_MAX_CONCURRENCY = 8
+    LINK_USER_AGENT = "Mozilla/5.0 (compatible; Intelliview-LinkCheck/1.0)"
+
+    # Replacement resource search (tools/resource_search.py), memoized per normalized topic
+    SEARCH_TTL_SECONDS = 24 * 60 * 60
+    SEARCH_NEGATIVE_TTL_SECONDS = 5 * 60
+    SEARCH_DEADLINE_SECONDS = 6  # overall budget for all lookups of one feedback
+    SEARCH_MAX_CONCURRENCY = 4
+
+    # Curated resource library (data/resource_library.py): cosine score an improvement
+    # area needs to be covered locally; lower-scoring areas fall back to web search
+    LIBRARY_MIN_SCORE = 0.2
+    LIBRARY_RESOURCES_PER_AREA = 1
+
+    # Background judge jobs (coordinator/feedback_queue.py)
+    QUEUE_WORKERS = 2  # judge runs at once, so ending interviews don't crowd out live ones
+    QUEUE_MAX_ATTEMPTS = 3
+    QUEUE_BACKOFF_SECONDS = 2  # first retry delay, doubled per attempt
+    QUEUE_BACKOFF_MAX_SECONDS = 30
+    QUEUE_STATUS_TTL_SECONDS = 60 * 60  # finished jobs remembered for dedup and status
+    QUEUE_DRAIN_SECONDS = 20  # shutdown grace period for queued jobs
+
+    # Rolling per-turn evaluation during live interviews (agents/interview_judge/incremental.py)
+    TURN_EVAL_ENABLED = True
+    TURN_EVAL_MAX_CONCURRENCY = 2  # evaluation calls at once, across all live interviews
+    TURN_EVAL_MAX_WAITING = 20  # further completed turns are left to the final judge
+    TURN_EVAL_POLL_SECONDS = 2
+    TURN_EVAL_FINISH_SECONDS = 5  # how long the final judge waits for evaluations in flight
+
+    # Map-reduce judging (agents/interview_judge/map_reduce.py): transcript text the judge
+    # would read raw above this estimate is judged in concurrent windows first
+    JUDGE_MAP_REDUCE_ENABLED = True
+    JUDGE_MAP_REDUCE_THRESHOLD_TOKENS = 8000
+    JUDGE_WINDOW_TOKENS = 3000
+    JUDGE_MAP_MAX_CONCURRENCY = 4
+
+    # Recommended QAs (with reference answers) given to the full-transcript judge
+    JUDGE_QA_TOP_K = 8
+    JUDGE_QA_TOKEN_BUDGET = 2500
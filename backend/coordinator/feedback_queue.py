@@ -0,0 +1,232 @@
+"""
+Background feedback jobs.
+
+Ending an interview (time up, end_interview control, client disconnect) enqueues a
+judge job and returns at once; a small pool of workers runs the judge off the socket
+handlers. Jobs are deduplicated by session id, so the same interview is judged once
+even when several end paths fire, and run in priority order (an explicit end before
+a timeout before a disconnect). Failed attempts are retried with exponential backoff.
+Clients learn about the result through the feedback route, which reports the job
+status until the feedback document exists.
+"""
+
+import asyncio
+import itertools
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.agents.interview_judge.agent import _run_judge_from_session, close_judge_session
+from backend.config import FeedbackConfig
+from backend.tools.log import bind, get_logger
+from backend.tools.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+# Lower runs first
+PRIORITY_HIGH = 0    # candidate ended the interview and is waiting for feedback
+PRIORITY_NORMAL = 1  # interview time ran out
+PRIORITY_LOW = 2     # client disconnected
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_RETRYING = "retrying"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+async def judge_session(session) -> Dict[str, Any]:
+    """Default job: run the judge, keeping the ADK session open for retries"""
+    feedback = await _run_judge_from_session(session, close_session=False)
+    if feedback is None:
+        raise RuntimeError("Feedback invalid or could not be parsed")
+    return feedback
+
+
+class FeedbackJob:
+    def __init__(self, session, priority: int):
+        self.session = session
+        self.priority = priority
+        self.attempts = 0
+        self.status = STATUS_QUEUED
+        self.error: Optional[str] = None
+
+
+class FeedbackQueue:
+    """
+    Priority queue of judge jobs drained by a bounded worker pool.
+
+    Args:
+        handler: Async job body, called with the ADK session; raising means retry
+        cleanup: Async callback run once per job after its last attempt
+        workers: Jobs running at once
+        max_attempts: Attempts per job before it is marked failed
+        backoff_seconds: Delay before the first retry; doubles per attempt (with jitter)
+        backoff_max_seconds: Upper bound of the retry delay
+        status_ttl_seconds: How long finished jobs are remembered (dedup and status)
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]] = judge_session,
+        cleanup: Optional[Callable[[Any], Awaitable[None]]] = close_judge_session,
+        workers: int = FeedbackConfig.QUEUE_WORKERS,
+        max_attempts: int = FeedbackConfig.QUEUE_MAX_ATTEMPTS,
+        backoff_seconds: float = FeedbackConfig.QUEUE_BACKOFF_SECONDS,
+        backoff_max_seconds: float = FeedbackConfig.QUEUE_BACKOFF_MAX_SECONDS,
+        status_ttl_seconds: float = FeedbackConfig.QUEUE_STATUS_TTL_SECONDS,
+    ):
+        self.handler = handler
+        self.cleanup = cleanup
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.status_ttl_seconds = status_ttl_seconds
+        self._jobs: Dict[str, FeedbackJob] = {}  # session id -> queued/running/retrying job
+        self._finished = TTLCache()  # session id -> done/failed
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks = []
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._sequence = itertools.count()  # FIFO within one priority
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        """Start the workers on the running loop (idempotent)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        for job in self._jobs.values():
+            if job.status == STATUS_QUEUED:
+                self._put(job)
+
+    async def stop(self, timeout: float = FeedbackConfig.QUEUE_DRAIN_SECONDS) -> None:
+        """
+        Let queued jobs finish for up to timeout seconds, then cancel the workers and
+        mark the jobs left (including ones waiting for a retry) failed
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Feedback queue not drained on shutdown", extra={"pending": len(self._jobs)})
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        # Jobs still queued, running or waiting for a retry will not run any more
+        for job in list(self._jobs.values()):
+            bind(logger, session_id=job.session.id).warning(
+                "Feedback job abandoned on shutdown", extra={"status": job.status, "attempts": job.attempts}
+            )
+            await self._finish(job, STATUS_FAILED)
+
+    # --- Jobs ---
+    def enqueue(self, session, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Queue feedback for a session and return immediately.
+
+        Returns False when the session already has a pending or finished job. A pending
+        job is promoted when the new request has a higher priority.
+        """
+        job = self._jobs.get(session.id)
+        if job is not None:
+            if priority < job.priority and job.status == STATUS_QUEUED:
+                job.priority = priority
+                self._put(job)  # the stale lower-priority entry is skipped by the worker
+            return False
+        if self._finished.get(session.id) == STATUS_DONE:
+            return False
+
+        self.start()
+        job = FeedbackJob(session, priority)
+        self._jobs[session.id] = job
+        self._put(job)
+        bind(logger, session_id=session.id).info("Feedback job queued", extra={"priority": priority})
+        return True
+
+    def status(self, session_id: str) -> Optional[str]:
+        job = self._jobs.get(session_id)
+        if job is not None:
+            return job.status
+        return self._finished.get(session_id)
+
+    def _put(self, job: FeedbackJob) -> None:
+        self._queue.put_nowait((job.priority, next(self._sequence), job.session.id, job.priority))
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.backoff_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _requeue(self, session_id: str) -> None:
+        self._retry_handles.pop(session_id, None)
+        job = self._jobs.get(session_id)
+        if job is not None and self._queue is not None:
+            job.status = STATUS_QUEUED
+            self._put(job)
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            _, _, session_id, priority = await self._queue.get()
+            try:
+                job = self._jobs.get(session_id)
+                # Entries left behind by a promotion or a finished job
+                if job is None or job.status != STATUS_QUEUED or job.priority != priority:
+                    continue
+                await self._run(job, worker_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: FeedbackJob, worker_id: int) -> None:
+        session = job.session
+        log = bind(logger, session_id=session.id, worker=worker_id)
+        job.status = STATUS_RUNNING
+        job.attempts += 1
+        try:
+            await self.handler(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts < self.max_attempts:
+                delay = self._retry_delay(job.attempts)
+                job.status = STATUS_RETRYING
+                log.warning("Feedback attempt %d failed, retrying in %.1fs: %s", job.attempts, delay, e)
+                self._retry_handles[session.id] = asyncio.get_running_loop().call_later(
+                    delay, self._requeue, session.id
+                )
+                return
+            log.error("Feedback failed after %d attempts: %s", job.attempts, e)
+            await self._finish(job, STATUS_FAILED)
+            return
+        log.info("Feedback generated", extra={"attempts": job.attempts})
+        await self._finish(job, STATUS_DONE)
+
+    async def _finish(self, job: FeedbackJob, status: str) -> None:
+        job.status = status
+        self._jobs.pop(job.session.id, None)
+        self._finished.set(job.session.id, status, self.status_ttl_seconds)
+        if self.cleanup is not None:
+            try:
+                await self.cleanup(job.session)
+            except Exception as e:
+                logger.warning("Feedback job cleanup failed for %s: %s", job.session.id, e)
+
+    def diagnostics(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": statuses,
+            "finished": len(self._finished),
+        }
+
+
+feedback_queue = FeedbackQueue()
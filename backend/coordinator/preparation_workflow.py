@@ -6,7 +6,6 @@ import os
 import sys
 import asyncio
 import json
-import traceback
 import time
 import secrets
 import string
@@ -19,9 +18,10 @@ from google.adk.agents import SequentialAgent, LlmAgent, ParallelAgent
 from google.adk.runners import Runner
 from google.adk.tools import google_search
 from google.genai import types
+from google.adk.agents.run_config import RunConfig, StreamingMode
 
 # Import config
-from backend.config import set_google_cloud_env_vars
+from backend.config import set_google_cloud_env_vars, WorkflowConfig
 
 # Import prompts
 from backend.agents.summarizer.prompt import SUMMARIZER_PROMPT
@@ -29,11 +29,18 @@ from backend.agents.search.prompt import SEARCH_PROMPT
 from backend.agents.question_generator.prompt import QUESTION_GENERATION_PROMPT
 from backend.agents.answer_generator.prompt import ANSWER_GENERATION_PROMPT
 from backend.coordinator.session_manager import session_service
+from backend.tools.json_parser import IncrementalJSONParser, parse_json_response
+from backend.tools.log import get_logger, bind
 
 
 # Load environment variables
 set_google_cloud_env_vars()
 
+# App name for the short-lived per-batch sessions used in pipelined mode
+PIPELINE_APP_NAME = "interview_preparation_pipeline_app"
+
+logger = get_logger(__name__)
+
 def generate_session_id(input_data: str = ""):
     """Generate a random session ID similar to Firestore document IDs"""
     alphabet = string.ascii_letters + string.digits
@@ -52,33 +59,7 @@ def extract_json_from_response(response_text: str) -> dict:
     """
     if not response_text:
         return {}
-        
-    try:
-        import re
-        # Extract JSON from markdown code blocks if present
-        markdown_json_pattern = r"```(?:json)?\s*([\s\S]*?)\s*```"
-        markdown_matches = re.findall(markdown_json_pattern, response_text)
-        
-        if markdown_matches:
-            clean_json_str = markdown_matches[0].strip()
-            return json.loads(clean_json_str)
-        else:
-            return json.loads(response_text)
-
-    except json.JSONDecodeError:
-        try:
-            start_index = response_text.find('{')
-            end_index = response_text.rfind('}') + 1
-            if start_index >= 0 and end_index > start_index:
-                json_str = response_text[start_index:end_index]
-                return json.loads(json_str)
-            else:
-                raise ValueError("Could not find valid JSON in the response")
-        except Exception as e:
-            return {
-                "error": f"Error parsing response: {str(e)}",
-                "raw_response": response_text
-            }
+    return parse_json_response(response_text)
 
 def create_fresh_agents():
     """Create fresh agent instances to avoid parent workflow conflicts"""
@@ -150,7 +131,7 @@ async def run_preparation_workflow(
     additional_info: str = "",
     num_questions: int = 50,
     session_id: Optional[str] = None,
-    
+    pipelined: Optional[bool] = None,
 ):
     """
     Run the complete interview preparation workflow using ADK SequentialAgent
@@ -165,11 +146,13 @@ async def run_preparation_workflow(
         additional_info: Additional user information (optional)
         num_questions: Number of questions to generate (default: 50)
         session_id: Session ID (optional, will auto-generate if not provided, serves as workflow_id)
+        pipelined: Overlap question and answer generation in batches (default: WorkflowConfig.PIPELINED)
     
     Returns:
         dict: Result with workflow completion status, generated session_id, and any errors
     """
     # Create fresh session service for each workflow to avoid state conflicts
+    log = bind(logger, user_id=user_id)
     
     try:
         # Auto-generate session_id if not provided
@@ -178,6 +161,7 @@ async def run_preparation_workflow(
             session_id = generate_session_id(input_signature)
         
         workflow_id = session_id  # session_id serves as workflow_id
+        log = log.bind(workflow_id=workflow_id)
         
         # Process GitHub URL if provided
         github_analysis_result = ""
@@ -186,9 +170,9 @@ async def run_preparation_workflow(
                 from backend.services.github import GitHubAnalyzer
                 github_analyzer = GitHubAnalyzer()
                 github_analysis_result = github_analyzer.get_github_summary_for_workflow(github_link)
-                print(f"GitHub analysis completed: {len(github_analysis_result)} characters")
+                log.info("GitHub analysis completed: %d characters", len(github_analysis_result))
             except Exception as e:
-                print(f"Warning: GitHub analysis failed: {e}")
+                log.warning("GitHub analysis failed: %s", e)
         
         # Analyze portfolio URL if provided
         portfolio_content = ""
@@ -196,14 +180,26 @@ async def run_preparation_workflow(
             try:
                 from backend.services.portfolio.portfolio_analyzer import analyze_portfolio_url
                 portfolio_content = await analyze_portfolio_url(portfolio_link.strip())
-                print(f"Portfolio analysis completed. Content length: {len(portfolio_content)}")
+                log.info("Portfolio analysis completed: %d characters", len(portfolio_content))
             except Exception as e:
-                print(f"Portfolio analysis failed for URL {portfolio_link}: {e}")
+                log.warning("Portfolio analysis failed for URL %s: %s", portfolio_link, e)
         
         
+        if pipelined is None:
+            pipelined = WorkflowConfig.PIPELINED
+
         # Create workflow with unique name and fresh agents to avoid conflicts
         workflow_name = f"interview_preparation_workflow_{session_id}"
-        preparation_workflow = create_preparation_workflow(workflow_name)
+        if pipelined:
+            # Only summarizer and search run inside ADK; questions and answers are pipelined below
+            summarizer_agent, search_agent, question_generator_agent, answer_generator_agent = create_fresh_agents()
+            preparation_workflow = ParallelAgent(
+                name=workflow_name,
+                sub_agents=[summarizer_agent, search_agent],
+                description="Runs resume summarization and industry FAQ search in parallel"
+            )
+        else:
+            preparation_workflow = create_preparation_workflow(workflow_name)
         
         # Create runner with fresh session service
         runner = Runner(
@@ -212,11 +208,14 @@ async def run_preparation_workflow(
             session_service=session_service
         )
         
-        # Create session
+        # Create session (general BQs ranked by relevance to the job description; off the
+        # event loop, an unloaded snapshot falls back to reading Firestore)
+        general_bqs = await asyncio.to_thread(_select_general_bqs_for_role, job_description)
         await session_service.create_session(
             app_name="interview_preparation_app",
             user_id=user_id,
-            session_id=session_id
+            session_id=session_id,
+            state={"general_bqs": general_bqs}
         )
         
         # Prepare input for SUMMARIZER_AGENT (include num_questions in the input)
@@ -255,7 +254,7 @@ async def run_preparation_workflow(
         )
         
         # Run ADK SequentialAgent workflow
-        print("=== Starting ADK SequentialAgent workflow ===")
+        log.info("Starting ADK workflow", extra={"pipelined": pipelined})
         
         event_count = 0
         completed_agents = []
@@ -274,21 +273,20 @@ async def run_preparation_workflow(
             if event.author not in agent_start_times:
                 agent_start_times[event.author] = now
             
-            print(f"\n--- Event {event_count}: {event.author} ---")
-            
             if hasattr(event, 'content') and event.content:
                 content_text = event.content.parts[0].text
-                print(f"Content preview: {content_text[:100]}...")
+                log.debug(
+                    "Event %d from %s", event_count, event.author,
+                    extra={"category": "workflow_event", "author": event.author, "preview": (content_text or "")[:100]}
+                )
                 
                 if event.is_final_response() and event.author not in agent_end_times:
                     agent_end_times[event.author] = now
                     duration = now - agent_start_times[event.author]
                     completed_agents.append(event.author)
-                    print(f"=== {event.author} completed in {duration:.2f}s ===")
+                    log.info("%s completed in %.2fs", event.author, duration, extra={"author": event.author, "seconds": round(duration, 2)})
         
-        print(f"\n=== ADK workflow completed ===")
-        print(f"Total events: {event_count}")
-        print(f"Completed agents: {completed_agents}")
+        log.info("ADK workflow completed", extra={"events": event_count, "completed_agents": completed_agents})
         
         app_name = "interview_preparation_app"
         # Get final session state
@@ -298,7 +296,7 @@ async def run_preparation_workflow(
             session_id=session_id
         )
         
-        print(f"Final session state keys: {list(session.state.keys())}")
+        log.debug("Final session state keys: %s", list(session.state.keys()))
         
         # Extract and process results
         session_state_updates = {}
@@ -310,8 +308,28 @@ async def run_preparation_workflow(
                 else:
                     session_state_updates[key] = raw_data
         
-        # Save to database
-        await _save_workflow_results_to_database(user_id, session_id, session_state_updates)
+        if pipelined:
+            # Save the summary first so the workflow shows up while QAs are still being generated
+            await _save_personal_summary_to_database(user_id, session_id, session_state_updates.get("personal_summary", {}))
+
+            questions_data, answers_data = await _run_question_answer_pipeline(
+                user_id=user_id,
+                workflow_id=session_id,
+                personal_summary=session.state.get("personal_summary", ""),
+                industry_faqs=session.state.get("industry_faqs", ""),
+                num_questions=num_questions,
+                question_generator_agent=question_generator_agent,
+                answer_generator_agent=answer_generator_agent
+            )
+            completed_agents.extend([question_generator_agent.name, answer_generator_agent.name])
+            session.state["questions_data"] = questions_data
+            session.state["answers_data"] = answers_data
+            session_state_updates["questions_data"] = questions_data
+            session_state_updates["answers_data"] = answers_data
+        
+        # Save to database (pipelined mode already persisted the summary and every answer batch)
+        if not pipelined:
+            await _save_workflow_results_to_database(user_id, session_id, session_state_updates)
         
         return {
             "success": True,
@@ -327,8 +345,7 @@ async def run_preparation_workflow(
         }
         
     except Exception as e:
-        print(f"Error in run_preparation_workflow: {e}")
-        print(traceback.format_exc())
+        log.exception("Error in run_preparation_workflow: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -343,15 +360,263 @@ async def run_preparation_workflow(
                 user_id=session.user_id,
                 session_id=session_id
             )
-            print(f"[CLEANUP]: Session {session.id} successfully closed.")
+            log.info("Session closed")
         except Exception as e:
-            print(f"[CLEANUP ERROR]: Failed to close session {session.id}: {e}")
+            log.error("Failed to close session: %s", e)
+
+async def _run_agent_once(agent, user_id: str, session_id: str, state: dict, message: str, on_item=None) -> str:
+    """
+    Run a single agent in its own short-lived session and return its final response text.
+
+    When on_item is given the response is streamed and every JSON array element (or the
+    top-level object) is passed to on_item as soon as it closes.
+    """
+    runner = Runner(
+        agent=agent,
+        app_name=PIPELINE_APP_NAME,
+        session_service=session_service
+    )
+    await session_service.create_session(
+        app_name=PIPELINE_APP_NAME,
+        user_id=user_id,
+        session_id=session_id,
+        state=state
+    )
+    content = types.Content(
+        role="user",
+        parts=[types.Part(text=message)]
+    )
+    parser = IncrementalJSONParser(on_item=on_item) if on_item else None
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE if parser else StreamingMode.NONE)
+
+    response_text = ""
+    streamed = False
+    try:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=content,
+            run_config=run_config
+        ):
+            if not (event.content and event.content.parts):
+                continue
+            text = event.content.parts[0].text or ""
+            if event.partial:
+                if parser:
+                    parser.feed(text)
+                    streamed = True
+            elif event.is_final_response():
+                response_text = text
+                if parser and not streamed:
+                    parser.feed(text)
+        return response_text
+    finally:
+        try:
+            await session_service.delete_session(
+                app_name=PIPELINE_APP_NAME,
+                user_id=user_id,
+                session_id=session_id
+            )
+        except Exception as e:
+            logger.error("Failed to close session: %s", e, extra={"session_id": session_id, "user_id": user_id})
+
+def _extract_item_list(parsed) -> list:
+    """Return the list of question/answer dicts from a parsed agent response"""
+    if isinstance(parsed, list):
+        return [item for item in parsed if isinstance(item, dict)]
+    if isinstance(parsed, dict):
+        for key in ['questions', 'customized_questions', 'interview_questions', 'answers', 'data']:
+            if isinstance(parsed.get(key), list):
+                return [item for item in parsed[key] if isinstance(item, dict)]
+        if "question" in parsed:
+            return [parsed]
+    return []
+
+async def _run_question_answer_pipeline(
+    user_id: str,
+    workflow_id: str,
+    personal_summary,
+    industry_faqs,
+    num_questions: int,
+    question_generator_agent,
+    answer_generator_agent,
+    batch_size: int = WorkflowConfig.QUESTION_BATCH_SIZE,
+    answer_batch_size: int = WorkflowConfig.ANSWER_BATCH_SIZE
+):
+    """
+    Generate questions in batches and answer them while the next questions are still being generated.
+
+    Question responses are streamed: every question is picked up the moment its JSON object
+    closes, and an answer batch starts as soon as answer_batch_size new questions exist.
+    Completed answer batches are persisted as partial recommendedQAs (in question order) so
+    the UI can show early results before the whole workflow finishes.
+
+    Returns:
+        tuple: (questions, answers) lists in question order
+    """
+    log = bind(logger, user_id=user_id, workflow_id=workflow_id)
+    general_bqs = await asyncio.to_thread(_select_general_bqs_for_role, personal_summary)
+    if not isinstance(personal_summary, str):
+        personal_summary = json.dumps(personal_summary, ensure_ascii=False)
+    if not isinstance(industry_faqs, str):
+        industry_faqs = json.dumps(industry_faqs, ensure_ascii=False)
+
+    num_batches = max(1, -(-num_questions // batch_size))
+    questions = []
+    pending = []
+    answered_batches = {}
+    answer_tasks = []
+    persist_lock = asyncio.Lock()
+
+    async def answer_batch(index: int, batch: list):
+        started = time.time()
+        response_text = await _run_agent_once(
+            answer_generator_agent,
+            user_id=user_id,
+            session_id=f"{workflow_id}_answers_{index}",
+            state={
+                "personal_summary": personal_summary,
+                "questions_data": json.dumps(batch, ensure_ascii=False)
+            },
+            message=f"Generate answers for the {len(batch)} questions above, in the same order."
+        )
+        answers = _extract_item_list(extract_json_from_response(response_text))
+
+        # Keep the question generator's tags, matching answers to questions by position
+        merged = []
+        for i, question in enumerate(batch):
+            answer = answers[i] if i < len(answers) else {}
+            merged.append({
+                "question": question.get("question", ""),
+                "answer": answer.get("answer", ""),
+                "tags": question.get("tags", [])
+            })
+        log.info(
+            "Answer batch %d (%d questions) completed in %.2fs", index + 1, len(batch), time.time() - started,
+            extra={"batch": index + 1, "questions": len(batch)}
+        )
+
+        async with persist_lock:
+            answered_batches[index] = merged
+            partial = [qa for i in sorted(answered_batches) for qa in answered_batches[i]]
+            recommended_qas = _to_recommended_qas(partial)
+            if recommended_qas:
+                try:
+                    from backend.data.database import firestore_db
+                    await asyncio.to_thread(firestore_db.set_recommended_qas, user_id, workflow_id, recommended_qas)
+                    log.info("Saved %d partial recommended QAs", len(recommended_qas))
+                except Exception as e:
+                    log.warning("Could not save partial RecommendedQAs to database: %s", e)
+
+    def start_answer_batch():
+        if pending:
+            batch = list(pending)
+            pending.clear()
+            answer_tasks.append(asyncio.create_task(answer_batch(len(answer_tasks), batch)))
+
+    try:
+        for index in range(num_batches):
+            count = min(batch_size, num_questions - index * batch_size)
+            if count <= 0:
+                break
+            started = time.time()
+            batch_start = len(questions)
+
+            def on_question(item, count=count, batch_start=batch_start):
+                for question in _extract_item_list(item):
+                    if len(questions) - batch_start >= count:
+                        return
+                    questions.append(question)
+                    pending.append(question)
+                    if len(pending) >= answer_batch_size:
+                        start_answer_batch()
+
+            already_asked = [q.get("question", "") for q in questions]
+            message = f"""
+            Number of questions to generate: {count}
+            This is batch {index + 1} of {num_batches}. Generate EXACTLY {count} questions.
+            Keep the overall question type distribution across batches.
+            Do NOT repeat or rephrase any of these already generated questions:
+            {json.dumps(already_asked, ensure_ascii=False)}
+            """
+            await _run_agent_once(
+                question_generator_agent,
+                user_id=user_id,
+                session_id=f"{workflow_id}_questions_{index}",
+                state={
+                    "personal_summary": personal_summary,
+                    "industry_faqs": industry_faqs,
+                    "general_bqs": general_bqs
+                },
+                message=message,
+                on_item=on_question
+            )
+            start_answer_batch()
+            log.info(
+                "Question batch %d/%d completed in %.2fs (%d questions)",
+                index + 1, num_batches, time.time() - started, len(questions) - batch_start,
+                extra={"batch": index + 1, "questions": len(questions) - batch_start}
+            )
+
+        await asyncio.gather(*answer_tasks)
+    except BaseException:
+        for task in answer_tasks:
+            task.cancel()
+        raise
+
+    answers = [qa for i in sorted(answered_batches) for qa in answered_batches[i]]
+    return questions, answers
+
+def _select_general_bqs_for_role(role) -> str:
+    """Compact JSON of the general BQs most relevant to a role (summary dict or raw text)"""
+    if isinstance(role, str) and role.lstrip()[:1] in ("{", "`"):
+        parsed = extract_json_from_response(role)
+        if isinstance(parsed, dict) and "error" not in parsed:
+            role = parsed
+    if isinstance(role, dict):
+        role = f"{role.get('title', '')} {role.get('jobDescription', '')}"
+    try:
+        from backend.data.bq_index import select_general_bqs, compact_bqs
+        return compact_bqs(select_general_bqs(str(role or ""), WorkflowConfig.GENERAL_BQ_TOP_K))
+    except Exception as e:
+        logger.warning("Could not select general BQs: %s", e)
+        return "[]"
+
+def _to_recommended_qas(items) -> list:
+    """Convert answer dicts into RecommendedQA objects, normalizing tags to a list"""
+    from backend.data.schemas import RecommendedQA
+
+    recommended_qas = []
+    for item in items:
+        if isinstance(item, dict):
+            validated_item = {
+                "question": item.get("question", ""),
+                "answer": item.get("answer", ""),
+                "tags": item.get("tags", [])
+            }
+            # Ensure tags is a list
+            if not isinstance(validated_item["tags"], list):
+                if isinstance(validated_item["tags"], str):
+                    validated_item["tags"] = [validated_item["tags"]]
+                else:
+                    validated_item["tags"] = []
+            
+            recommended_qas.append(RecommendedQA(**validated_item))
+    return recommended_qas
 
 async def _save_workflow_results_to_database(user_id, session_id, session_state_updates):
     """Save workflow results to database without re-executing agent logic"""
+    try:
+        await _save_personal_summary_to_database(user_id, session_id, session_state_updates.get("personal_summary", {}))
+        await _save_recommended_qas_to_database(user_id, session_id, session_state_updates.get("answers_data", []))
+    except Exception as e:
+        logger.error("Error in database save operations: %s", e, extra={"user_id": user_id, "workflow_id": session_id})
+
+async def _save_personal_summary_to_database(user_id, session_id, personal_summary):
+    """Save the workflow title and PersonalExperience produced by the summarizer"""
+    log = bind(logger, user_id=user_id, workflow_id=session_id)
     try:
         # Save PersonalExperience if summarizer completed successfully
-        personal_summary = session_state_updates.get("personal_summary", {})
         if personal_summary and isinstance(personal_summary, dict) and "error" not in personal_summary:
             try:
                 from backend.data.schemas import PersonalExperience, Workflow
@@ -362,7 +627,7 @@ async def _save_workflow_results_to_database(user_id, session_id, session_state_
                 if title:
                     workflow_data = Workflow(title=title)
                     firestore_db.create_or_update_workflow(user_id, session_id, workflow_data)
-                    print(f"Saved workflow title '{title}' to database for user {user_id}, workflow {session_id}")
+                    log.info("Saved workflow title '%s' to database", title)
                 
                 # Convert to PersonalExperience object for database storage
                 personal_experience = PersonalExperience(
@@ -377,53 +642,41 @@ async def _save_workflow_results_to_database(user_id, session_id, session_state_
                 
                 # Save to database
                 firestore_db.set_personal_experience(user_id, session_id, personal_experience)
-                print(f"Saved personal experience to database for user {user_id}, workflow {session_id}")
+                log.info("Saved personal experience to database")
                 
             except Exception as e:
-                print(f"Warning: Could not save PersonalExperience to database: {e}")
-        
+                log.warning("Could not save PersonalExperience to database: %s", e)
+    except Exception as e:
+        log.error("Error in database save operations: %s", e)
+
+async def _save_recommended_qas_to_database(user_id, session_id, final_answers):
+    """Save the final RecommendedQAs produced by the answer generator"""
+    log = bind(logger, user_id=user_id, workflow_id=session_id)
+    try:
         # Save RecommendedQAs if answer generator completed successfully  
-        final_answers = session_state_updates.get("answers_data", [])
         if final_answers and isinstance(final_answers, list) and len(final_answers) > 0:
             try:
                 # Check if questions have answers (indicating answer generator ran)
                 sample_question = final_answers[0] if final_answers else {}
                 if isinstance(sample_question, dict) and sample_question.get("answer"):
-                    from backend.data.schemas import RecommendedQA
                     from backend.data.database import firestore_db
                     
                     # Convert to RecommendedQA objects for database storage
-                    recommended_qas = []
-                    for item in final_answers:
-                        if isinstance(item, dict):
-                            validated_item = {
-                                "question": item.get("question", ""),
-                                "answer": item.get("answer", ""),
-                                "tags": item.get("tags", [])
-                            }
-                            # Ensure tags is a list
-                            if not isinstance(validated_item["tags"], list):
-                                if isinstance(validated_item["tags"], str):
-                                    validated_item["tags"] = [validated_item["tags"]]
-                                else:
-                                    validated_item["tags"] = []
-                            
-                            qa = RecommendedQA(**validated_item)
-                            recommended_qas.append(qa)
+                    recommended_qas = _to_recommended_qas(final_answers)
                     
                     # Save to database
                     if recommended_qas:
                         firestore_db.set_recommended_qas(user_id, session_id, recommended_qas)
-                        print(f"Saved {len(recommended_qas)} recommended QAs to database for user {user_id}, workflow {session_id}")
+                        log.info("Saved %d recommended QAs to database", len(recommended_qas))
                 else:
-                    print(f"Warning: Sample question doesn't have answer field or answer is empty.")
+                    log.warning("Sample question doesn't have answer field or answer is empty")
             except Exception as e:
-                print(f"Warning: Could not save RecommendedQAs to database: {e}")
+                log.warning("Could not save RecommendedQAs to database: %s", e)
         else:
-            print(f"Warning: No valid answers_data found for database storage.")
+            log.warning("No valid answers_data found for database storage")
                 
     except Exception as e:
-        print(f"Error in database save operations: {e}")
+        log.error("Error in database save operations: %s", e)
 
 def run_preparation_workflow_sync(*args, **kwargs):
     """
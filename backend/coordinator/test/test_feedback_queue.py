@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.coordinator.feedback_queue import (
+    PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, FeedbackQueue,
+)
+
+
+def make_session(session_id):
+    return SimpleNamespace(id=session_id, app_name="app", user_id="user", state={})
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_deduplicated_and_run_by_priority():
+    order = []
+    closed = []
+    release = asyncio.Event()
+
+    async def handler(session):
+        order.append(session.id)
+        if session.id == "first":
+            await release.wait()
+
+    async def cleanup(session):
+        closed.append(session.id)
+
+    queue = FeedbackQueue(handler=handler, cleanup=cleanup, workers=1)
+    assert queue.enqueue(make_session("first"), PRIORITY_LOW) is True
+    await wait_until(lambda: queue.status("first") == "running")
+
+    # enqueue returns at once while the only worker is busy
+    assert queue.enqueue(make_session("timeout"), PRIORITY_NORMAL) is True
+    assert queue.enqueue(make_session("disconnect"), PRIORITY_LOW) is True
+    assert queue.enqueue(make_session("ended"), PRIORITY_HIGH) is True
+    # the same interview ending twice is judged once
+    assert queue.enqueue(make_session("first"), PRIORITY_HIGH) is False
+    # a disconnect after an explicit end promotes the queued job
+    assert queue.enqueue(make_session("disconnect"), PRIORITY_HIGH) is False
+    assert queue.status("ended") == "queued"
+
+    release.set()
+    await queue.stop()
+
+    assert order == ["first", "ended", "disconnect", "timeout"]
+    assert sorted(closed) == sorted(order)
+    assert queue.status("timeout") == "done"
+    assert queue.enqueue(make_session("timeout")) is False
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_with_backoff_then_marked_failed():
+    attempts = {}
+    closed = []
+
+    async def handler(session):
+        attempts[session.id] = attempts.get(session.id, 0) + 1
+        if session.id == "broken" or attempts[session.id] < 3:
+            raise RuntimeError("model overloaded")
+
+    async def cleanup(session):
+        closed.append(session.id)
+
+    queue = FeedbackQueue(handler=handler, cleanup=cleanup, workers=2, max_attempts=3,
+                          backoff_seconds=0.01, backoff_max_seconds=0.02)
+    queue.enqueue(make_session("flaky"))
+    queue.enqueue(make_session("broken"))
+
+    await wait_until(lambda: queue.status("flaky") == "done" and queue.status("broken") == "failed")
+    await queue.stop()
+
+    assert attempts == {"flaky": 3, "broken": 3}
+    # the session is closed once, after the last attempt
+    assert sorted(closed) == ["broken", "flaky"]
+    # a failed job may be requested again
+    assert queue.enqueue(make_session("broken")) is True
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_queued_jobs_up_to_the_timeout():
+    done = []
+
+    async def handler(session):
+        await asyncio.sleep(0.05 if session.id == "quick" else 10)
+        done.append(session.id)
+
+    queue = FeedbackQueue(handler=handler, cleanup=None, workers=1)
+    queue.enqueue(make_session("quick"))
+    queue.enqueue(make_session("slow"))
+
+    await queue.stop(timeout=0.2)
+
+    assert done == ["quick"]
+    assert queue.diagnostics()["workers"] == 0
+    # the unfinished job is not left behind
+    assert queue.status("slow") == "failed"
+    assert queue.diagnostics()["jobs"] == {}
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_jobs_waiting_for_a_retry():
+    closed = []
+
+    async def handler(session):
+        raise RuntimeError("model overloaded")
+
+    async def cleanup(session):
+        closed.append(session.id)
+
+    queue = FeedbackQueue(handler=handler, cleanup=cleanup, workers=1, max_attempts=3, backoff_seconds=60)
+    queue.enqueue(make_session("retrying"))
+    await wait_until(lambda: queue.status("retrying") == "retrying")
+
+    await queue.stop()
+
+    assert queue.status("retrying") == "failed"
+    assert queue.diagnostics()["jobs"] == {}
+    assert closed == ["retrying"]
@@ -0,0 +1,96 @@
+"""
+Tests for the pipelined question/answer generation mode
+"""
+
+import asyncio
+import json
+import os
+import sys
+import pytest
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from backend.coordinator import preparation_workflow
+from backend.coordinator.preparation_workflow import _run_question_answer_pipeline
+
+
+class FakeAgent:
+    def __init__(self, name):
+        self.name = name
+
+
+def make_fake_run_agent_once(timeline):
+    async def fake_run_agent_once(agent, user_id, session_id, state, message, on_item=None):
+        index = int(session_id.rsplit("_", 1)[1])
+        timeline.append((agent.name, index, "start"))
+        if agent.name == "question_generator":
+            count = int(message.split("Number of questions to generate:")[1].split()[0])
+            items = [{"question": f"Q{index}-{i}", "answer": "", "tags": ["Behavioral"]} for i in range(count)]
+            # Stream questions one at a time like SSE partial events
+            for item in items:
+                await asyncio.sleep(0.02)
+                on_item(item)
+            timeline.append((agent.name, index, "end"))
+            return "```json\n" + json.dumps(items) + "\n```"
+        await asyncio.sleep(0.05)
+        timeline.append((agent.name, index, "end"))
+        batch = json.loads(state["questions_data"])
+        return json.dumps([{"question": q["question"], "answer": f"A for {q['question']}"} for q in batch])
+    return fake_run_agent_once
+
+
+@pytest.mark.asyncio
+async def test_answers_start_before_all_questions_are_generated():
+    timeline = []
+
+    with patch.object(preparation_workflow, "_run_agent_once", side_effect=make_fake_run_agent_once(timeline)), \
+         patch("backend.data.database.firestore_db.set_recommended_qas") as mock_set_qas:
+        questions, answers = await _run_question_answer_pipeline(
+            user_id="user123",
+            workflow_id="wf_001",
+            personal_summary={"title": "Backend Engineer"},
+            industry_faqs={},
+            num_questions=6,
+            question_generator_agent=FakeAgent("question_generator"),
+            answer_generator_agent=FakeAgent("answer_generator"),
+            batch_size=2,
+            answer_batch_size=2
+        )
+
+    assert [q["question"] for q in questions] == ["Q0-0", "Q0-1", "Q1-0", "Q1-1", "Q2-0", "Q2-1"]
+    assert [a["answer"] for a in answers] == [f"A for {q['question']}" for q in questions]
+    # tags come from the question generator
+    assert all(a["tags"] == ["Behavioral"] for a in answers)
+
+    # the first answer batch starts while the second question batch is still running
+    assert timeline.index(("answer_generator", 0, "start")) < timeline.index(("question_generator", 1, "end"))
+
+    # partial results are persisted as each batch completes
+    saved_counts = [len(call.args[2]) for call in mock_set_qas.call_args_list]
+    assert saved_counts == [2, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_streamed_questions_start_answers_mid_batch():
+    timeline = []
+
+    with patch.object(preparation_workflow, "_run_agent_once", side_effect=make_fake_run_agent_once(timeline)), \
+         patch("backend.data.database.firestore_db.set_recommended_qas"):
+        questions, answers = await _run_question_answer_pipeline(
+            user_id="user123",
+            workflow_id="wf_002",
+            personal_summary="{}",
+            industry_faqs="{}",
+            num_questions=4,
+            question_generator_agent=FakeAgent("question_generator"),
+            answer_generator_agent=FakeAgent("answer_generator"),
+            batch_size=4,
+            answer_batch_size=2
+        )
+
+    assert len(questions) == 4
+    assert len(answers) == 4
+    # answers for the first two streamed questions start before the question batch finishes
+    assert timeline.index(("answer_generator", 0, "start")) < timeline.index(("question_generator", 0, "end"))
@@ -0,0 +1,88 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from backend.data.snapshots import CollectionSnapshot, general_bqs_snapshot
+from backend.tools.text_index import TfidfIndex
+
+
+class GeneralBQIndex:
+    """
+    TF-IDF index over the general behavioral questions (question, category, tags).
+
+    The index is rebuilt whenever the backing snapshot reloads, so selecting the
+    questions relevant to a role is a local lookup instead of sending the whole bank
+    to the model.
+    """
+
+    def __init__(self, snapshot: CollectionSnapshot):
+        self.snapshot = snapshot
+        self._lock = threading.Lock()
+        self._bqs: List[Dict[str, Any]] = []
+        self._index: Optional[TfidfIndex] = None
+        self._attached = False
+
+    def _ensure_attached(self) -> None:
+        if not self._attached:
+            self._attached = True
+            # Runs rebuild right away if the snapshot is already loaded
+            self.snapshot.add_listener(self.rebuild)
+        if self._index is None:
+            self.rebuild(self.snapshot.get())
+
+    def rebuild(self, bqs: List[Dict[str, Any]]) -> None:
+        documents = [
+            " ".join([
+                bq.get("question") or "",
+                bq.get("category") or "",
+                " ".join(bq.get("tags") or []),
+            ])
+            for bq in bqs
+        ]
+        index = TfidfIndex(documents)
+        with self._lock:
+            self._bqs = list(bqs)
+            self._index = index
+
+    def select(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Return the top_k questions most relevant to the query.
+
+        When fewer than top_k questions match, the rest is filled in bank order so the
+        prompt always gets a full set of examples.
+        """
+        self._ensure_attached()
+        with self._lock:
+            bqs, index = self._bqs, self._index
+        if top_k <= 0 or not bqs:
+            return []
+
+        positions = [pos for pos, _ in index.search(query or "", top_k)]
+        if len(positions) < top_k:
+            chosen = set(positions)
+            positions.extend(pos for pos in range(len(bqs)) if pos not in chosen)
+        return [bqs[pos] for pos in positions[:top_k]]
+
+    def diagnostics(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "documents": len(index) if index else 0,
+            "terms": len(index.vocabulary) if index else 0,
+        }
+
+
+def compact_bqs(bqs: List[Dict[str, Any]]) -> str:
+    """Serialize BQs for a prompt: only the fields the model needs, no indentation."""
+    return json.dumps(
+        [{"question": bq.get("question") or "", "category": bq.get("category") or "", "tags": bq.get("tags") or []} for bq in bqs],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+general_bq_index = GeneralBQIndex(general_bqs_snapshot)
+
+
+def select_general_bqs(query: str, top_k: int) -> List[Dict[str, Any]]:
+    """Top-k general BQs for a role description (job title, job description, summary)."""
+    return general_bq_index.select(query, top_k)
@@ -1,13 +1,25 @@
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Callable
 from pydantic import HttpUrl, EmailStr
 from firebase_admin import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
 
 from backend.data.schemas import (
     Profile, Interview, Workflow, Feedback,
     PersonalExperience, RecommendedQA, GeneralBQ, CodingProblems
 )
+from backend.data.snapshots import touch_snapshot_marker
 from backend.tools.firebase_config import db
+from backend.tools.log import get_logger
+
+logger = get_logger(__name__)
+
+# Bulk operations: BulkWriter sends batches in parallel, ramping up to this rate
+BULK_MAX_OPS_PER_SECOND = 2000
+# Documents per page when listing references for deletes
+BULK_PAGE_SIZE = 500
+# Attempts per failed bulk write before giving up on it
+BULK_MAX_ATTEMPTS = 5
 
 class FirestoreDB:
     def __init__(self,db):
@@ -80,6 +92,30 @@ class FirestoreDB:
             "data": None
         }
 
+    def append_interview_turns(
+        self,
+        user_id: str,
+        workflow_id: str,
+        session_id: str,
+        turns: List[Dict[str, Any]],
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, str]:
+        """
+        Append transcript turns to an interview with ArrayUnion, creating the record if needed.
+        Turns must carry a unique "turn" number: ArrayUnion skips elements already stored,
+        which makes re-sending a turn harmless but would also merge identical turns.
+        """
+        doc_ref = self.db.collection('users').document(user_id).collection('interviews').document(workflow_id).collection("sessions").document(session_id)
+        update = dict(fields or {})
+        if turns:
+            update["transcript"] = firestore.ArrayUnion(turns)
+        if update:
+            doc_ref.set(update, merge=True)
+        return {
+            "message": f"Appended {len(turns)} turn(s) to interview {session_id}",
+            "data": None
+        }
+
     def get_interview(self, user_id: str, workflow_id: str, interview_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve an interview record."""
         doc_ref = self.db.collection('users').document(user_id).collection('interviews').document(workflow_id).collection("sessions").document(interview_id)
@@ -220,6 +256,25 @@ class FirestoreDB:
             "data": None
         }
 
+    def get_interview_context(self, user_id: str, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Title, personal experience and recommended QAs of a workflow in one document read"""
+        doc_ref = self.db.collection('users').document(user_id).collection('workflows').document(workflow_id)
+        doc = doc_ref.get()
+        if doc.exists:
+            data = doc.to_dict()
+            return {
+                "message": f"Interview context for user {user_id}, workflow {workflow_id} retrieved successfully",
+                "data": {
+                    "title": data.get("title"),
+                    "personalExperience": data.get("personalExperience"),
+                    "recommendedQAs": data.get("recommendedQAs"),
+                }
+            }
+        return {
+            "message": f"Workflow not found for user {user_id}, workflow {workflow_id}",
+            "data": None
+        }
+
     # --- Transcript Operations ---
     def get_transcript(self, user_id: str, workflow_id: str, interview_id: str) -> Optional[List[Dict[str, Any]]]:
         """Retrieve transcript of an interview."""
@@ -261,12 +316,12 @@ class FirestoreDB:
     # --- General Behavioral Questions Operations ---
     def set_general_bqs(self, bqs: List[GeneralBQ]) -> Dict[str, str]:
         """Set general behavioral questions."""
-        doc_ref = self.db.collection("bqs")
-        for bq in bqs:
-            doc_ref.document(bq.id).set(bq.model_dump(exclude={"id"}))
+        result = self.bulk_set("bqs", ((bq.id, bq.model_dump(exclude={"id"})) for bq in bqs))
         return {
             "message": "General behavioral questions set successfully",
-            "data": None
+            "data": None,
+            "written": result["written"],
+            "failed": result["failed"],
         }
 
     def get_general_bqs(self) -> Optional[List[Dict[str, Any]]]:
@@ -285,11 +340,7 @@ class FirestoreDB:
 
     def delete_general_bqs(self) -> Dict[str, str]:
         """Delete system data (general questions)."""
-        docs = list(self.db.collection("bqs").stream())
-        deleted_count = 0
-        for doc in docs:
-            doc.reference.delete()
-            deleted_count += 1
+        deleted_count = self.bulk_delete_collection("bqs")["deleted"]
 
         return {
             "message": f"Deleted {deleted_count} behavioral questions from 'bqs' collection successfully",
@@ -299,27 +350,75 @@ class FirestoreDB:
     # --- Coding Problems Operations ---
     def set_coding_problems(self, problems: List[CodingProblems]) -> Dict[str, str]:
         """Set coding problems."""
+        result = self.bulk_set(
+            "problems",
+            ((str(p.id), p.model_dump(exclude={"id"})) for p in problems),
+            merge=True,  # merge=False to overwrite
+        )
+        touch_snapshot_marker(self.db, "problems")
+        return {
+            "message": "Coding problems written",
+            "written": result["written"],
+            "failed": result["failed"],
+        }
+
+    def sync_coding_problems(
+        self,
+        problems: Iterable[CodingProblems] = (),
+        delete_ids: Iterable[str] = (),
+        on_written: Optional[Callable[[str, bool], None]] = None,
+        max_attempts: int = BULK_MAX_ATTEMPTS,
+    ) -> Dict[str, Any]:
+        """
+        Upsert and delete coding problems through a BulkWriter (concurrent, rate-limited batches).
+
+        Args:
+            problems: Problems to write; each document is overwritten
+            delete_ids: Problem ids to delete
+            on_written: Called with (problem_id, deleted) after each successful write,
+                from BulkWriter threads - use it to checkpoint progress
+            max_attempts: Retries per failed write before it is reported as failed
+
+        Returns:
+            dict: message plus written/deleted/failed counts and failed ids
+        """
         col = self.db.collection("problems")
-        BATCH_SIZE = 500
-        written = 0
-        batches = 0
-
-        for start in range(0, len(problems), BATCH_SIZE):
-            batch = self.db.batch()
-            for p in problems[start:start + BATCH_SIZE]:
-                doc_id = str(p.id)  # ensure string
-                data = p.model_dump(exclude={"id"})
-                batch.set(col.document(doc_id), data, merge=True)  # merge=False to overwrite
-                written += 1
-            batch.commit()
-            batches += 1
+        deleting = set()
+        counts = {"written": 0, "deleted": 0}
+
+        def on_result(reference, result, bulk_writer):
+            deleted = reference.id in deleting
+            counts["deleted" if deleted else "written"] += 1
+            if on_written:
+                on_written(reference.id, deleted)
+
+        writer, failed = self._bulk_writer(on_result, max_attempts)
+        try:
+            for p in problems:
+                writer.set(col.document(str(p.id)), p.model_dump(exclude={"id"}))
+            for problem_id in delete_ids:
+                deleting.add(str(problem_id))
+                writer.delete(col.document(str(problem_id)))
+        finally:
+            writer.close()
+            # also after a partial sync: whatever was written is live
+            if counts["written"] or counts["deleted"]:
+                touch_snapshot_marker(self.db, "problems")
 
         return {
-            "message": "Coding problems written",
-            "written": written,
-            "batches": batches,
+            "message": "Coding problems synced",
+            "written": counts["written"],
+            "deleted": counts["deleted"],
+            "failed": failed,
         }
 
+    def list_coding_problem_ids(self) -> Dict[str, Any]:
+        """List the ids of all coding problems (empty field mask, no document data is read)."""
+        docs = self.db.collection("problems").select([]).stream()
+        return {
+            "message": "Coding problem ids retrieved successfully",
+            "data": [doc.id for doc in docs]
+        }
 
     def get_coding_problems(self, problem_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a single coding problem by ID."""
@@ -337,17 +436,105 @@ class FirestoreDB:
 
     def delete_coding_problems(self) -> Dict[str, str]:
         """Delete system data (coding problems)."""
-        docs = list(self.db.collection("problems").stream())
-        deleted_count = 0
-        for doc in docs:
-            doc.reference.delete()
-            deleted_count += 1
+        deleted_count = self.bulk_delete_collection("problems")["deleted"]
+        touch_snapshot_marker(self.db, "problems")
 
         return {
             "message": f"Deleted {deleted_count} coding problems from 'problems' collection successfully",
             "data": None
         }
-    
+
+    # --- Bulk Operations ---
+    def _bulk_writer(self, on_result=None, max_attempts: int = BULK_MAX_ATTEMPTS):
+        """
+        BulkWriter with bounded throughput and retries.
+
+        Returns:
+            tuple: (writer, failed) where failed collects the ids of writes that gave up
+        """
+        writer = self.db.bulk_writer(options=BulkWriterOptions(max_ops_per_second=BULK_MAX_OPS_PER_SECOND))
+        failed: List[str] = []
+
+        def on_error(failure, bulk_writer) -> bool:
+            if failure.attempts < max_attempts:
+                return True
+            failed.append(failure.operation.reference.id)
+            logger.warning("Giving up on %s: %s", failure.operation.reference.path, failure.message)
+            return False
+
+        if on_result:
+            writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+        return writer, failed
+
+    def bulk_set(self, collection_name: str, docs: Iterable, merge: bool = False) -> Dict[str, Any]:
+        """Write (doc_id, data) pairs to a collection through a BulkWriter."""
+        col = self.db.collection(collection_name)
+        counts = {"written": 0}
+
+        def on_result(reference, result, bulk_writer):
+            counts["written"] += 1
+
+        writer, failed = self._bulk_writer(on_result)
+        try:
+            for doc_id, data in docs:
+                writer.set(col.document(str(doc_id)), data, merge=merge)
+        finally:
+            writer.close()
+        return {
+            "message": f"Wrote {counts['written']} documents to '{collection_name}'",
+            "written": counts["written"],
+            "failed": failed,
+        }
+
+    def _recursive_delete(self, reference, page_size: int = BULK_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Delete a collection or document together with all of its subcollections.
+
+        References are paged with a document-id-only field mask (no document data is
+        downloaded) and deleted through a BulkWriter.
+        """
+        writer, failed = self._bulk_writer()
+        deleted = self.db.recursive_delete(reference, bulk_writer=writer, chunk_size=page_size)
+        return {"deleted": deleted - len(failed), "failed": failed}
+
+    def bulk_delete_collection(self, collection_name: str, page_size: int = BULK_PAGE_SIZE) -> Dict[str, Any]:
+        """Delete every document (and subcollection) of a top-level collection."""
+        result = self._recursive_delete(self.db.collection(collection_name), page_size)
+        return {
+            "message": f"Deleted {result['deleted']} documents from '{collection_name}'",
+            **result,
+        }
+
+    def delete_workflows_recursive(self, user_id: str, workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Delete a user's workflows together with their interviews and interview sessions.
+
+        With workflow_id, only that workflow document and its interviews/{workflow_id}/sessions
+        subtree are deleted; otherwise the user's whole workflows and interviews subtrees.
+        """
+        user_ref = self.db.collection("users").document(user_id)
+        if workflow_id:
+            targets = [
+                user_ref.collection("workflows").document(workflow_id),
+                user_ref.collection("interviews").document(workflow_id),
+            ]
+        else:
+            targets = [user_ref.collection("workflows"), user_ref.collection("interviews")]
+
+        deleted = 0
+        failed: List[str] = []
+        for target in targets:
+            result = self._recursive_delete(target)
+            deleted += result["deleted"]
+            failed += result["failed"]
+        return {
+            "message": f"Deleted {deleted} workflow and interview documents for user {user_id} successfully",
+            "data": None,
+            "deleted": deleted,
+            "failed": failed,
+        }
+
 
 # Create shared FirestoreDB instance
 firestore_db = FirestoreDB(db)
@@ -0,0 +1,180 @@
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.data.snapshots import CollectionSnapshot, problems_snapshot
+
+# Sortable fields: stats.* plus title
+SORT_FIELDS = ["acceptance_rate", "likes", "dislikes", "submissions", "accepted", "title"]
+
+
+def _normalize(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+class ProblemIndex:
+    """
+    In-memory query index over the coding problems snapshot.
+
+    - Inverted indexes (value -> sorted positions) on topics, difficulty and category
+    - Sorted prefix index over titles, title words and slugs
+    - Precomputed sort orders for stats fields
+
+    Filters are combined as boolean masks over positions and applied to a precomputed
+    sort order, so a query never touches Firestore and costs a few vector operations.
+    Rebuilt whenever the snapshot reloads.
+    """
+
+    def __init__(self, snapshot: CollectionSnapshot):
+        self.snapshot = snapshot
+        self._lock = threading.Lock()
+        self._attached = False
+        self._built = False
+        self._problems: List[Dict[str, Any]] = []
+        self._by_topic: Dict[str, np.ndarray] = {}
+        self._by_difficulty: Dict[str, np.ndarray] = {}
+        self._by_category: Dict[str, np.ndarray] = {}
+        self._prefix_keys: List[str] = []
+        self._prefix_positions: np.ndarray = np.empty(0, dtype=np.int32)
+        self._orders: Dict[tuple, np.ndarray] = {}
+
+    def _ensure_attached(self) -> None:
+        if not self._attached:
+            self._attached = True
+            self.snapshot.add_listener(self.rebuild)
+        if not self._built:
+            self.rebuild(self.snapshot.get())
+
+    # --- Building ---
+    @staticmethod
+    def _inverted(values_per_problem: Iterable[Iterable[str]]) -> Dict[str, np.ndarray]:
+        postings: Dict[str, List[int]] = {}
+        for pos, values in enumerate(values_per_problem):
+            for value in set(_normalize(v) for v in values if v):
+                postings.setdefault(value, []).append(pos)
+        return {key: np.asarray(positions, dtype=np.int32) for key, positions in postings.items()}
+
+    def rebuild(self, problems: List[Dict[str, Any]]) -> None:
+        problems = list(problems)
+
+        by_topic = self._inverted(p.get("topics") or [] for p in problems)
+        by_difficulty = self._inverted([p.get("difficulty")] for p in problems)
+        by_category = self._inverted([p.get("category")] for p in problems)
+
+        prefix_entries = []
+        for pos, p in enumerate(problems):
+            title = _normalize(p.get("title"))
+            keys = {title, _normalize(p.get("slug"))}
+            keys.update(title.split())
+            prefix_entries.extend((key, pos) for key in keys if key)
+        prefix_entries.sort()
+
+        # (field, descending) -> positions in sorted order; missing stats sort last either way
+        orders = {}
+        for field in SORT_FIELDS:
+            if field == "title":
+                keys = [_normalize(p.get("title")) for p in problems]
+                ascending = np.asarray(sorted(range(len(problems)), key=keys.__getitem__), dtype=np.int32)
+                orders[(field, False)] = ascending
+                orders[(field, True)] = ascending[::-1].copy()
+                continue
+            values = np.array(
+                [(p.get("stats") or {}).get(field) for p in problems], dtype=np.float64
+            ) if problems else np.empty(0)
+            missing = np.isnan(values)
+            orders[(field, False)] = np.argsort(np.where(missing, np.inf, values), kind="stable").astype(np.int32)
+            orders[(field, True)] = np.argsort(np.where(missing, np.inf, -values), kind="stable").astype(np.int32)
+
+        with self._lock:
+            self._problems = problems
+            self._by_topic = by_topic
+            self._by_difficulty = by_difficulty
+            self._by_category = by_category
+            self._prefix_keys = [key for key, _ in prefix_entries]
+            self._prefix_positions = np.asarray([pos for _, pos in prefix_entries], dtype=np.int32)
+            self._orders = orders
+            self._built = True
+
+    # --- Querying ---
+    def _prefix_match(self, prefix: str) -> np.ndarray:
+        lo = bisect.bisect_left(self._prefix_keys, prefix)
+        hi = bisect.bisect_left(self._prefix_keys, prefix + "\uffff")
+        return self._prefix_positions[lo:hi]
+
+    def query(
+        self,
+        topics: Optional[List[str]] = None,
+        difficulty: Optional[List[str]] = None,
+        category: Optional[List[str]] = None,
+        prefix: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Filter and page through problems.
+
+        Args:
+            topics: Problems must have ALL of these topics
+            difficulty: Problems must have ANY of these difficulties
+            category: Problems must be in ANY of these categories
+            prefix: Prefix of the title, a title word or the slug
+            sort_by: One of SORT_FIELDS; default keeps snapshot order
+            descending: Sort direction for sort_by
+            offset, limit: Page window
+
+        Returns:
+            dict: {"items", "total", "offset", "limit"}
+        """
+        if sort_by and sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field '{sort_by}'. Use one of: {', '.join(SORT_FIELDS)}")
+        self._ensure_attached()
+
+        with self._lock:
+            problems = self._problems
+            n = len(problems)
+            mask = np.ones(n, dtype=bool)
+
+            for topic in topics or []:
+                topic_mask = np.zeros(n, dtype=bool)
+                topic_mask[self._by_topic.get(_normalize(topic), [])] = True
+                mask &= topic_mask
+            for values, inverted in ((difficulty, self._by_difficulty), (category, self._by_category)):
+                if values:
+                    any_mask = np.zeros(n, dtype=bool)
+                    for value in values:
+                        any_mask[inverted.get(_normalize(value), [])] = True
+                    mask &= any_mask
+            if prefix and _normalize(prefix):
+                prefix_mask = np.zeros(n, dtype=bool)
+                prefix_mask[self._prefix_match(_normalize(prefix))] = True
+                mask &= prefix_mask
+
+            if sort_by:
+                order = self._orders[(sort_by, descending)]
+                matched = order[mask[order]]
+            else:
+                matched = np.flatnonzero(mask)
+
+        offset = max(0, offset)
+        limit = max(0, limit)
+        page = matched[offset:offset + limit]
+        return {
+            "items": [problems[i] for i in page],
+            "total": int(len(matched)),
+            "offset": offset,
+            "limit": limit,
+        }
+
+    def diagnostics(self) -> Dict[str, Any]:
+        return {
+            "problems": len(self._problems),
+            "topics": len(self._by_topic),
+            "prefixKeys": len(self._prefix_keys),
+        }
+
+
+problem_index = ProblemIndex(problems_snapshot)
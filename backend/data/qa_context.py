@@ -0,0 +1,88 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.tools.text_index import TfidfIndex
+from backend.tools.tokens import estimate_tokens
+
+# How strongly a QA's already-covered tags count against its relevance
+DIVERSITY_WEIGHT = 0.15
+
+
+def _qa_item(qa: Dict[str, Any], include_answer: bool) -> Dict[str, Any]:
+    item = {"question": qa.get("question", ""), "tags": qa.get("tags") or []}
+    if include_answer:
+        item["answer"] = qa.get("answer", "")
+    return item
+
+
+def select_qas(
+    qas: Any,
+    context: str,
+    top_k: int,
+    token_budget: int,
+    include_answers: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Pick the recommended QAs worth putting in a prompt.
+
+    QAs are ranked by TF-IDF relevance of question and tags to the context (personal
+    experience, job description, transcript), discounted for tags already covered by
+    earlier picks so the set spans different topics. Picks stop at top_k, and QAs that
+    would overflow token_budget are skipped. Answers are kept only when
+    include_answers is set.
+    """
+    if not isinstance(qas, list) or top_k <= 0:
+        return []
+    qas = [qa for qa in qas if isinstance(qa, dict) and qa.get("question")]
+    if not qas:
+        return []
+
+    index = TfidfIndex([" ".join([qa["question"], " ".join(qa.get("tags") or [])]) for qa in qas])
+    relevance = index.scores(context or "")
+    tags = [{t.lower() for t in qa.get("tags") or []} for qa in qas]
+
+    selected: List[Dict[str, Any]] = []
+    used_tokens = 0
+    covered = Counter()
+    remaining = list(range(len(qas)))
+    while remaining and len(selected) < top_k:
+        def score(i):
+            overlap = sum(covered[t] for t in tags[i]) / max(1, len(tags[i]))
+            return relevance[i] - DIVERSITY_WEIGHT * overlap
+        # max() keeps the earliest on ties: generator order breaks them
+        best = max(remaining, key=score)
+        remaining.remove(best)
+        item = _qa_item(qas[best], include_answers)
+        cost = estimate_tokens(item)
+        if used_tokens + cost > token_budget:
+            continue
+        selected.append(item)
+        used_tokens += cost
+        covered.update(tags[best])
+    return selected
+
+
+def compact_qas(items: Sequence[Dict[str, Any]]) -> str:
+    """Serialize selected QAs for a prompt: no indentation, no extra fields"""
+    return json.dumps(list(items), separators=(",", ":"), ensure_ascii=False)
+
+
+def build_qa_context(
+    qas: Any,
+    context: str,
+    top_k: int,
+    token_budget: int,
+    include_answers: bool = False,
+) -> str:
+    return compact_qas(select_qas(qas, context, top_k, token_budget, include_answers))
+
+
+def profile_context(personal_experience: Optional[Dict[str, Any]]) -> str:
+    """Relevance query text from a personal experience record"""
+    if not isinstance(personal_experience, dict):
+        return ""
+    return " ".join(
+        str(personal_experience.get(field) or "")
+        for field in ("jobDescription", "resumeInfo", "additionalInfo", "githubInfo", "portfolioInfo")
+    )
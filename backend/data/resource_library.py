@@ -0,0 +1,191 @@
+"""
+Curated library of interview-prep resources, indexed locally.
+
+Feedback resources are attached per improvement area by a TF-IDF lookup over these
+vetted records (title, topic, keywords) instead of asking the model to search the web
+and then validating whatever links it returns. Only areas the library does not cover
+fall back to web search (tools/resource_search.py).
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.config import FeedbackConfig
+from backend.tools.text_index import TfidfIndex
+
+# Vetted records; "keywords" are the words feedback topics/suggestions tend to use
+CURATED_RESOURCES: List[Dict[str, Any]] = [
+    {
+        "title": "The STAR Interview Method: How to Answer Behavioral Questions",
+        "link": "https://www.themuse.com/advice/star-interview-method",
+        "topic": "STAR method",
+        "keywords": ["star", "situation", "task", "action", "result", "structure", "story", "storytelling", "format"],
+    },
+    {
+        "title": "How to Use the STAR Interview Response Technique",
+        "link": "https://www.indeed.com/career-advice/interviewing/how-to-use-the-star-interview-response-technique",
+        "topic": "Story structure",
+        "keywords": ["star", "structure", "organize", "outcome", "result", "impact", "quantify", "metrics", "narrative"],
+    },
+    {
+        "title": "Behavioral Interviews: How to Prepare and Ace Them",
+        "link": "https://www.techinterviewhandbook.org/behavioral-interview/",
+        "topic": "Behavioral interview preparation",
+        "keywords": ["behavioral", "preparation", "stories", "experiences", "examples", "practice", "specific"],
+    },
+    {
+        "title": "Behavioral Interview Questions Commonly Asked",
+        "link": "https://www.techinterviewhandbook.org/behavioral-interview-questions/",
+        "topic": "Common behavioral questions",
+        "keywords": ["behavioral", "questions", "conflict", "failure", "challenge", "teamwork", "leadership", "mistake"],
+    },
+    {
+        "title": "Self Introduction: How to Answer \"Tell Me About Yourself\"",
+        "link": "https://www.techinterviewhandbook.org/self-introduction/",
+        "topic": "Self introduction",
+        "keywords": ["introduction", "yourself", "background", "pitch", "elevator", "opening", "first impression"],
+    },
+    {
+        "title": "Interview Question: \"Tell Me About Yourself\"",
+        "link": "https://www.indeed.com/career-advice/interviewing/interview-question-tell-me-about-yourself",
+        "topic": "Personal pitch",
+        "keywords": ["yourself", "pitch", "summary", "background", "motivation", "career", "story"],
+    },
+    {
+        "title": "Final Questions to Ask Your Interviewer",
+        "link": "https://www.techinterviewhandbook.org/final-questions/",
+        "topic": "Questions for the interviewer",
+        "keywords": ["questions", "ask", "interviewer", "curiosity", "engagement", "closing", "company", "research"],
+    },
+    {
+        "title": "Coding Interview Techniques",
+        "link": "https://www.techinterviewhandbook.org/coding-interview-techniques/",
+        "topic": "Problem solving approach",
+        "keywords": ["problem", "solving", "approach", "clarify", "edge", "cases", "think", "aloud", "coding", "optimize", "test"],
+    },
+    {
+        "title": "Coding Interview Prep Guide",
+        "link": "https://www.techinterviewhandbook.org/coding-interview-prep/",
+        "topic": "Coding interview preparation",
+        "keywords": ["coding", "technical", "preparation", "practice", "leetcode", "programming", "plan"],
+    },
+    {
+        "title": "Algorithms Study Cheatsheet",
+        "link": "https://www.techinterviewhandbook.org/algorithms/study-cheatsheet/",
+        "topic": "Data structures and algorithms",
+        "keywords": ["algorithms", "data", "structures", "arrays", "graphs", "trees", "recursion", "dynamic", "programming", "technical", "depth"],
+    },
+    {
+        "title": "Big-O Algorithm Complexity Cheat Sheet",
+        "link": "https://www.bigocheatsheet.com/",
+        "topic": "Time and space complexity",
+        "keywords": ["complexity", "big", "time", "space", "efficiency", "performance", "runtime", "tradeoffs"],
+    },
+    {
+        "title": "NeetCode Roadmap",
+        "link": "https://neetcode.io/roadmap",
+        "topic": "Coding practice",
+        "keywords": ["practice", "patterns", "problems", "leetcode", "coding", "roadmap", "algorithms"],
+    },
+    {
+        "title": "System Design Interviews",
+        "link": "https://www.techinterviewhandbook.org/system-design/",
+        "topic": "System design",
+        "keywords": ["system", "design", "architecture", "scalability", "requirements", "components", "tradeoffs"],
+    },
+    {
+        "title": "The System Design Primer",
+        "link": "https://github.com/donnemartin/system-design-primer",
+        "topic": "Scalable architecture",
+        "keywords": ["system", "design", "scalability", "caching", "databases", "load", "distributed", "availability"],
+    },
+    {
+        "title": "Amazon Leadership Principles",
+        "link": "https://www.amazon.jobs/content/en/our-workplace/leadership-principles",
+        "topic": "Leadership and ownership",
+        "keywords": ["leadership", "ownership", "initiative", "customer", "decision", "values", "culture", "fit"],
+    },
+    {
+        "title": "How We Hire at Google",
+        "link": "https://www.google.com/about/careers/applications/how-we-hire/",
+        "topic": "Hiring process and culture fit",
+        "keywords": ["culture", "fit", "company", "values", "hiring", "process", "research", "role", "motivation"],
+    },
+    {
+        "title": "Salary Negotiation for Software Engineers",
+        "link": "https://www.techinterviewhandbook.org/negotiation/",
+        "topic": "Salary negotiation",
+        "keywords": ["salary", "negotiation", "offer", "compensation", "expectations"],
+    },
+    {
+        "title": "5 Tips To Ace a Behavioral-Based Interview",
+        "link": "https://jobs.gartner.com/life-at-gartner/your-career/5-tips-to-ace-a-behavioral-based-interview/",
+        "topic": "Communication and clarity",
+        "keywords": ["communication", "clarity", "concise", "conciseness", "confidence", "specific", "details", "rambling", "focus"],
+    },
+]
+
+
+def library_document(record: Dict[str, Any]) -> str:
+    """Indexed text of a record; the topic is repeated so it outweighs the title"""
+    return " ".join([
+        record.get("title", ""),
+        record.get("topic", ""),
+        record.get("topic", ""),
+        " ".join(record.get("keywords") or []),
+    ])
+
+
+def area_query(area: Dict[str, Any]) -> str:
+    """Lookup text for one improvement area (the example quotes the candidate, so it is left out)"""
+    return " ".join([area.get("topic", ""), area.get("topic", ""), area.get("suggestion", "")])
+
+
+class ResourceLibrary:
+    """
+    TF-IDF index over curated resources.
+
+    Args:
+        records: Curated {title, link, topic, keywords} records
+        min_score: Minimum cosine similarity for a record to count as covering a query
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Dict[str, Any]] = CURATED_RESOURCES,
+        min_score: float = FeedbackConfig.LIBRARY_MIN_SCORE,
+    ):
+        self.records = list(records)
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self._index: Optional[TfidfIndex] = None
+
+    def _ensure_index(self) -> TfidfIndex:
+        # Built on first use so importing the module stays cheap
+        with self._lock:
+            if self._index is None:
+                self._index = TfidfIndex([library_document(r) for r in self.records])
+            return self._index
+
+    def lookup(self, text: str, top_k: int = 1) -> List[Dict[str, str]]:
+        """Best matching resources ({title, link}) scoring at least min_score"""
+        index = self._ensure_index()
+        return [
+            {"title": self.records[pos]["title"], "link": self.records[pos]["link"]}
+            for pos, score in index.search(text or "", top_k)
+            if score >= self.min_score
+        ]
+
+    def lookup_area(self, area: Dict[str, Any], top_k: int = 1) -> List[Dict[str, str]]:
+        """Resources covering one feedback improvement area; empty when the library has none"""
+        return self.lookup(area_query(area), top_k)
+
+    def diagnostics(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "documents": len(self.records),
+            "terms": len(index.vocabulary) if index else 0,
+        }
+
+
+resource_library = ResourceLibrary()
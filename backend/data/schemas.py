@@ -23,6 +23,8 @@ class Interview(BaseModel):
     duration_minutes: int
     feedback: Dict[str, Any] = None
     createAt: datetime = None
+    status: str = None # "in_progress" while checkpointing a live interview, then "completed"
+    latency: Dict[str, Any] = None # per-turn latency summary (agents/interviewer/turn_metrics.py)
 
 # Feedback Schema (nested within Interview)
 class FeedbackImprovementArea(BaseModel):
@@ -37,7 +39,7 @@ class FeedbackResource(BaseModel):
 class Feedback(BaseModel):
     positives: List[str]
     improvementAreas: List[FeedbackImprovementArea]
-    resources: List[FeedbackResource]
+    resources: List[FeedbackResource] = []  # attached after scoring (judge enrich_resources)
     reflectionPrompt: List[str]
     tone: str
     overallRating: int
@@ -120,6 +122,8 @@ class SimilarQuestion(BaseModel):
     title: str
     slug: str
     difficulty: str
+    id: Optional[str] = None
+    score: Optional[float] = None
 
 
 class CodingProblems(BaseModel):
@@ -0,0 +1,162 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Callable
+
+from backend.tools.firebase_config import db
+from backend.tools.log import get_logger
+
+logger = get_logger(__name__)
+
+# How long start() waits for the listener's first snapshot before reading the collection itself
+INITIAL_SNAPSHOT_TIMEOUT_SECONDS = 3
+
+# One marker document per projected collection ("snapshot_markers/<collection>"); writers
+# touch it after changing the collection (see touch_snapshot_marker)
+MARKER_COLLECTION = "snapshot_markers"
+
+
+class CollectionSnapshot:
+    """
+    In-process, versioned snapshot of a Firestore collection.
+
+    The collection is loaded once (at startup) and then kept fresh by a Firestore
+    on_snapshot listener, so readers get the documents from memory instead of
+    streaming the whole collection on every request. The listener's first snapshot
+    is the initial load, so the collection is read (and indexes rebuilt) only once.
+
+    With a projection (`fields`), the listener watches the collection's marker
+    document instead: a collection listener always streams whole documents, so every
+    marker change reloads the collection through the projected select() query and
+    the fields outside the projection are never read.
+    """
+
+    def __init__(self, db, collection_name: str, fields: Optional[List[str]] = None):
+        self.db = db
+        self.collection_name = collection_name
+        # Optional projection: only these top-level fields are read and kept in memory
+        self.fields = fields
+        self._lock = threading.Lock()
+        self._docs: List[Dict[str, Any]] = []
+        self._version = 0
+        self._loaded_at: Optional[float] = None
+        self._updated_at: Optional[datetime] = None
+        self._watch = None
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._first_snapshot = threading.Event()
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Register a callback run with the documents after every reload (e.g. to rebuild an index)."""
+        self._listeners.append(callback)
+        if self._version > 0:
+            callback(self._docs)
+
+    # --- Loading ---
+    def load(self) -> None:
+        """Read the whole collection once and replace the snapshot."""
+        query = self.db.collection(self.collection_name)
+        if self.fields:
+            query = query.select(self.fields)
+        self._apply(query.stream())
+
+    def start(self, listen: bool = True, timeout: float = INITIAL_SNAPSHOT_TIMEOUT_SECONDS) -> None:
+        """
+        Attach an on_snapshot listener to keep the collection fresh and wait for its
+        first snapshot, which loads it. Without a listener, or when the first snapshot
+        does not arrive within `timeout` seconds, the collection is read directly.
+        """
+        if not listen:
+            self.load()
+            return
+        if self._watch is None:
+            if self.fields:
+                marker = self.db.collection(MARKER_COLLECTION).document(self.collection_name)
+                self._watch = marker.on_snapshot(self._on_marker)
+            else:
+                self._watch = self.db.collection(self.collection_name).on_snapshot(self._on_snapshot)
+        if not self._first_snapshot.wait(timeout):
+            self.load()
+
+    def stop(self) -> None:
+        """Detach the listener; the last snapshot stays readable."""
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            finally:
+                self._watch = None
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        # Called on a Firestore background thread with the full current result set
+        if self._version > 0 and not changes:
+            return
+        self._apply(docs)
+        self._first_snapshot.set()
+
+    def _on_marker(self, docs, changes, read_time) -> None:
+        # Called on a Firestore background thread: first with the current marker, then on every touch
+        try:
+            self.load()
+        except Exception as e:
+            logger.warning("Reload of '%s' failed: %s", self.collection_name, e, extra={"collection": self.collection_name})
+            return
+        self._first_snapshot.set()
+
+    def _apply(self, docs) -> None:
+        data = []
+        for doc in docs:
+            item = doc.to_dict() or {}
+            if self.fields:
+                item = {key: item[key] for key in self.fields if key in item}
+            item["id"] = doc.id
+            data.append(item)
+        with self._lock:
+            self._docs = data
+            self._version += 1
+            self._loaded_at = time.monotonic()
+            self._updated_at = datetime.now(timezone.utc)
+        for callback in self._listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.warning("Listener failed for '%s': %s", self.collection_name, e, extra={"collection": self.collection_name})
+
+    # --- Reading ---
+    def get(self) -> List[Dict[str, Any]]:
+        """Return the documents in the snapshot, loading them on first use."""
+        if self._version == 0:
+            self.load()
+        return self._docs
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def diagnostics(self) -> Dict[str, Any]:
+        age = self.age_seconds
+        return {
+            "collection": self.collection_name,
+            "version": self._version,
+            "count": len(self._docs),
+            "updatedAt": self._updated_at.isoformat() if self._updated_at else None,
+            "ageSeconds": round(age, 3) if age is not None else None,
+            "listening": self._watch is not None,
+        }
+
+
+# Shared snapshot of the general behavioral questions ('bqs' collection)
+general_bqs_snapshot = CollectionSnapshot(db, "bqs")
+
+def touch_snapshot_marker(db, collection_name: str) -> None:
+    """Signal projected snapshots of `collection_name` that it changed"""
+    db.collection(MARKER_COLLECTION).document(collection_name).set({"updatedAt": datetime.now(timezone.utc)})
+
+
+# Shared snapshot of the coding problems ('problems' collection), summary fields only
+PROBLEM_SUMMARY_FIELDS = ["title", "slug", "difficulty", "category", "topics", "stats", "links"]
+problems_snapshot = CollectionSnapshot(db, "problems", fields=PROBLEM_SUMMARY_FIELDS)
@@ -114,4 +114,42 @@ generalBQ = [
         "category": "Conflict Resolution",
         "tags": []
     }
-]
\ No newline at end of file
+]
+codingProblems = [
+    {
+        "id": "1",
+        "title": "Two Sum",
+        "slug": "two-sum",
+        "difficulty": "Easy",
+        "category": "Algorithms",
+        "topics": ["Array", "Hash Table"],
+        "stats": {"acceptance_rate": 55.1, "likes": 60000},
+    },
+    {
+        "id": "2",
+        "title": "Add Two Numbers",
+        "slug": "add-two-numbers",
+        "difficulty": "Medium",
+        "category": "Algorithms",
+        "topics": ["Linked List", "Math", "Recursion"],
+        "stats": {"acceptance_rate": 45.2, "likes": 32000},
+    },
+    {
+        "id": "3",
+        "title": "Longest Substring Without Repeating Characters",
+        "slug": "longest-substring-without-repeating-characters",
+        "difficulty": "Medium",
+        "category": "Algorithms",
+        "topics": ["Hash Table", "String", "Sliding Window"],
+        "stats": {"acceptance_rate": 36.3, "likes": 41000},
+    },
+    {
+        "id": "175",
+        "title": "Combine Two Tables",
+        "slug": "combine-two-tables",
+        "difficulty": "Easy",
+        "category": "Database",
+        "topics": ["Database"],
+        "stats": {"acceptance_rate": 76.8, "likes": None},
+    },
+]
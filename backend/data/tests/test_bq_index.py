@@ -0,0 +1,53 @@
+import json
+from unittest.mock import MagicMock
+
+from backend.data.bq_index import GeneralBQIndex, compact_bqs
+from backend.data.snapshots import CollectionSnapshot
+from backend.data.tests.mock_data import generalBQ
+from backend.data.tests.test_snapshots import make_db, make_doc
+
+
+def test_select_ranks_relevant_bqs_and_pads_in_bank_order():
+    snapshot = CollectionSnapshot(make_db(generalBQ), "bqs")
+    index = GeneralBQIndex(snapshot)
+
+    selected = index.select("Team lead role: leadership and decision-making under pressure", top_k=3)
+    assert selected[0]["id"] == "bq002"
+    assert [bq["id"] for bq in selected[1:]] == ["bq003", "bq001"]
+
+    # no matches still yields a full set in bank order
+    assert [bq["id"] for bq in index.select("astronomy", top_k=2)] == ["bq001", "bq002"]
+
+
+def test_index_rebuilds_when_snapshot_reloads():
+    fake_db = make_db(generalBQ)
+    snapshot = CollectionSnapshot(fake_db, "bqs")
+    snapshot.start()
+    index = GeneralBQIndex(snapshot)
+    assert index.diagnostics()["documents"] == 0
+    index.select("conflict", top_k=1)
+    assert index.diagnostics()["documents"] == len(generalBQ)
+
+    callback = fake_db.collection.return_value.on_snapshot.call_args.args[0]
+    callback([make_doc(generalBQ[3])], [MagicMock()], None)
+
+    assert [bq["id"] for bq in index.select("conflict", top_k=5)] == ["bq004"]
+    assert json.loads(compact_bqs(generalBQ[3:])) == [
+        {"question": generalBQ[3]["question"], "category": "Conflict Resolution", "tags": []}
+    ]
+    assert ": " not in compact_bqs(generalBQ)
+
+
+def test_null_fields_are_indexed_as_empty():
+    # GeneralBQ.category is Optional: set_general_bqs stores None through model_dump
+    bqs = [
+        {"id": "bq101", "question": "Describe a conflict with a teammate.", "category": None, "tags": None},
+        {"id": "bq102", "question": None, "category": "Leadership", "tags": ["ownership"]},
+    ]
+    index = GeneralBQIndex(CollectionSnapshot(make_db(bqs), "bqs"))
+
+    assert [bq["id"] for bq in index.select("teammate conflict", top_k=1)] == ["bq101"]
+    assert json.loads(compact_bqs(bqs)) == [
+        {"question": "Describe a conflict with a teammate.", "category": "", "tags": []},
+        {"question": "", "category": "Leadership", "tags": ["ownership"]},
+    ]
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+from backend.data.database import FirestoreDB
+from backend.data.schemas import GeneralBQ
+from backend.data.tests.mock_data import generalBQ
+
+
+def make_db():
+    fake_db = MagicMock()
+    writer = fake_db.bulk_writer.return_value
+    fake_db.recursive_delete.return_value = 3
+    return fake_db, writer
+
+
+def test_set_general_bqs_uses_one_bulk_writer():
+    fake_db, writer = make_db()
+
+    FirestoreDB(fake_db).set_general_bqs([GeneralBQ(**bq) for bq in generalBQ])
+
+    fake_db.bulk_writer.assert_called_once()
+    assert writer.set.call_count == len(generalBQ)
+    fake_db.collection.return_value.document.return_value.set.assert_not_called()
+    writer.close.assert_called_once()
+
+
+def test_collection_deletes_page_references_recursively():
+    fake_db, writer = make_db()
+
+    result = FirestoreDB(fake_db).delete_coding_problems()
+
+    assert "Deleted 3 coding problems" in result["message"]
+    fake_db.collection.return_value.stream.assert_not_called()
+    args, kwargs = fake_db.recursive_delete.call_args
+    assert args[0] is fake_db.collection.return_value
+    assert kwargs["bulk_writer"] is writer
+    assert kwargs["chunk_size"] == 500
+    # projected problem snapshots reload when the marker is touched
+    fake_db.collection.assert_any_call("snapshot_markers")
+
+
+def test_delete_workflows_recursive_targets_workflow_and_interview_subtrees():
+    fake_db, _ = make_db()
+    user_ref = fake_db.collection.return_value.document.return_value
+
+    result = FirestoreDB(fake_db).delete_workflows_recursive("user123", "wf_001")
+
+    assert result["deleted"] == 6
+    targets = [c.args[0] for c in fake_db.recursive_delete.call_args_list]
+    assert targets == [user_ref.collection.return_value.document.return_value] * 2
+    assert [c.args[0] for c in user_ref.collection.call_args_list] == ["workflows", "interviews"]
+    assert [c.args[0] for c in user_ref.collection.return_value.document.call_args_list] == ["wf_001", "wf_001"]
@@ -0,0 +1,45 @@
+from backend.data.problem_index import ProblemIndex
+from backend.data.snapshots import CollectionSnapshot
+from backend.data.tests.mock_data import codingProblems
+from backend.data.tests.test_snapshots import make_db
+
+
+def make_index():
+    fake_db = make_db(codingProblems)
+    snapshot = CollectionSnapshot(fake_db, "problems", fields=["title", "slug", "difficulty", "category", "topics", "stats"])
+    return ProblemIndex(snapshot)
+
+
+def ids(result):
+    return [p["id"] for p in result["items"]]
+
+
+def test_filters_combine_inverted_indexes():
+    index = make_index()
+
+    assert ids(index.query(topics=["hash table"])) == ["1", "3"]
+    assert ids(index.query(topics=["Hash Table", "String"])) == ["3"]
+    assert ids(index.query(difficulty=["easy", "Hard"])) == ["1", "175"]
+    assert ids(index.query(category=["Database"], difficulty=["Easy"])) == ["175"]
+    assert index.query(topics=["Graph"])["total"] == 0
+
+
+def test_prefix_matches_title_words_and_slug():
+    index = make_index()
+
+    assert ids(index.query(prefix="Two")) == ["1", "2", "175"]
+    assert ids(index.query(prefix="longest-sub")) == ["3"]
+    assert ids(index.query(prefix="comb", category=["Algorithms"])) == []
+
+
+def test_sort_and_pagination():
+    index = make_index()
+
+    result = index.query(sort_by="likes", offset=0, limit=2)
+    assert ids(result) == ["1", "3"]
+    assert result["total"] == 4
+    # missing stats sort last in both directions
+    assert ids(index.query(sort_by="likes", offset=2, limit=2)) == ["2", "175"]
+    assert ids(index.query(sort_by="likes", descending=False))[-1] == "175"
+    assert ids(index.query(sort_by="acceptance_rate", descending=False, difficulty=["Medium"])) == ["3", "2"]
+    assert ids(index.query(sort_by="title", descending=False, limit=1)) == ["2"]
@@ -0,0 +1,45 @@
+import json
+
+from backend.data.qa_context import build_qa_context, select_qas
+from backend.tools.tokens import estimate_tokens
+
+QAS = [
+    {"question": "Design a URL shortener.", "answer": "A" * 400, "tags": ["system design"]},
+    {"question": "How would you scale a system design for a read-heavy API?", "answer": "B" * 400, "tags": ["system design"]},
+    {"question": "Tell me about a conflict with a teammate.", "answer": "C" * 400, "tags": ["teamwork"]},
+    {"question": "Explain Python generators.", "answer": "D" * 400, "tags": ["python"]},
+    {"question": "Describe a time you missed a deadline.", "answer": "E" * 400, "tags": ["time management"]},
+]
+
+
+def test_relevant_qas_come_first_and_tags_are_varied():
+    selected = select_qas(QAS, "Backend Python role: scale a read-heavy API (system design), teamwork", top_k=3, token_budget=10000)
+
+    questions = [qa["question"] for qa in selected]
+    assert questions[0] == "How would you scale a system design for a read-heavy API?"
+    # the second system design question loses to other topics
+    assert "Design a URL shortener." not in questions
+    assert {"Explain Python generators.", "Tell me about a conflict with a teammate."} <= set(questions)
+    # answers are left out unless asked for
+    assert all(set(qa) == {"question", "tags"} for qa in selected)
+
+
+def test_budget_limits_the_selection_and_answers_are_optional():
+    with_answers = select_qas(QAS, "python", top_k=5, token_budget=250, include_answers=True)
+
+    assert with_answers[0]["question"] == "Explain Python generators."
+    assert with_answers[0]["answer"] == "D" * 400
+    assert sum(estimate_tokens(qa) for qa in with_answers) <= 250
+    assert len(with_answers) == 2
+
+    # without answers everything fits
+    assert len(select_qas(QAS, "python", top_k=5, token_budget=250)) == 5
+
+
+def test_build_qa_context_handles_missing_data():
+    assert build_qa_context(None, "anything", top_k=5, token_budget=100) == "[]"
+    assert build_qa_context({"message": "not found", "data": None}, "x", top_k=5, token_budget=100) == "[]"
+    assert json.loads(build_qa_context(QAS, "", top_k=2, token_budget=1000)) == [
+        {"question": "Design a URL shortener.", "tags": ["system design"]},
+        {"question": "Tell me about a conflict with a teammate.", "tags": ["teamwork"]},
+    ]
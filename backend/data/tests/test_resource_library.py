@@ -0,0 +1,35 @@
+from backend.data.resource_library import CURATED_RESOURCES, ResourceLibrary
+
+RECORDS = [
+    {"title": "STAR guide", "link": "https://example.com/star", "topic": "STAR method",
+     "keywords": ["situation", "task", "action", "result", "structure"]},
+    {"title": "Design primer", "link": "https://example.com/design", "topic": "System design",
+     "keywords": ["architecture", "scalability", "tradeoffs"]},
+]
+
+
+def test_lookup_returns_title_and_link_above_min_score():
+    library = ResourceLibrary(RECORDS, min_score=0.2)
+
+    assert library.lookup("Discuss scalability tradeoffs in system design") == [
+        {"title": "Design primer", "link": "https://example.com/design"}
+    ]
+    assert library.lookup("kubernetes operators") == []
+
+
+def test_lookup_area_uses_topic_and_suggestion():
+    library = ResourceLibrary(RECORDS, min_score=0.2)
+
+    covered = {"topic": "Story Structure", "example": "...", "suggestion": "Use situation, task, action, result."}
+    uncovered = {"topic": "Kubernetes", "example": "...", "suggestion": "Learn container orchestration."}
+
+    assert [r["link"] for r in library.lookup_area(covered)] == ["https://example.com/star"]
+    assert library.lookup_area(uncovered) == []
+
+
+def test_curated_records_are_complete_and_unique():
+    links = [record["link"] for record in CURATED_RESOURCES]
+    assert len(links) == len(set(links))
+    for record in CURATED_RESOURCES:
+        assert record["title"] and record["topic"] and record["keywords"]
+        assert record["link"].startswith("https://")
@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock
+from backend.data.snapshots import CollectionSnapshot
+from backend.data.tests.mock_data import generalBQ
+
+
+def make_doc(item):
+    doc = MagicMock()
+    doc.id = item["id"]
+    doc.to_dict.return_value = {k: v for k, v in item.items() if k != "id"}
+    return doc
+
+
+def make_db(items, initial_snapshot=True):
+    fake_db = MagicMock()
+    collection = fake_db.collection.return_value
+    collection.stream.return_value = [make_doc(item) for item in items]
+    collection.select.return_value.stream.return_value = collection.stream.return_value
+
+    def on_snapshot(callback):
+        # Firestore delivers the full result set, every document ADDED, right after attaching
+        if initial_snapshot:
+            docs = [make_doc(item) for item in items]
+            callback(docs, [MagicMock() for _ in docs], None)
+        return MagicMock()
+
+    def on_marker_snapshot(callback):
+        if initial_snapshot:
+            callback([MagicMock()], [MagicMock()], None)
+        return MagicMock()
+
+    collection.on_snapshot.side_effect = on_snapshot
+    collection.document.return_value.on_snapshot.side_effect = on_marker_snapshot
+    return fake_db
+
+
+def test_snapshot_loads_once_and_reads_from_memory():
+    fake_db = make_db(generalBQ)
+    snapshot = CollectionSnapshot(fake_db, "bqs")
+    rebuilds = []
+    snapshot.add_listener(rebuilds.append)
+
+    snapshot.start()
+    first = snapshot.get()
+    second = snapshot.get()
+
+    # the listener's initial snapshot is the load: no separate read, one rebuild
+    fake_db.collection.return_value.stream.assert_not_called()
+    assert len(rebuilds) == 1
+    assert first is second
+    assert [bq["id"] for bq in first] == [bq["id"] for bq in generalBQ]
+    assert first[0]["question"] == generalBQ[0]["question"]
+    assert snapshot.version == 1
+    fake_db.collection.return_value.on_snapshot.assert_called_once()
+
+
+def test_listener_updates_bump_version():
+    fake_db = make_db(generalBQ)
+    snapshot = CollectionSnapshot(fake_db, "bqs")
+    snapshot.start()
+    callback = fake_db.collection.return_value.on_snapshot.call_args.args[0]
+
+    # no-op callback does not create a new version
+    callback([make_doc(bq) for bq in generalBQ], [], None)
+    assert snapshot.version == 1
+
+    updated = generalBQ[:1]
+    callback([make_doc(bq) for bq in updated], [MagicMock()], None)
+
+    assert snapshot.version == 2
+    assert len(snapshot.get()) == 1
+    diagnostics = snapshot.diagnostics()
+    assert diagnostics["version"] == 2
+    assert diagnostics["count"] == 1
+    assert diagnostics["listening"] is True
+    assert diagnostics["ageSeconds"] >= 0
+
+    snapshot.stop()
+    assert snapshot.diagnostics()["listening"] is False
+
+
+def test_start_reads_the_collection_when_the_listener_is_silent():
+    fake_db = make_db(generalBQ, initial_snapshot=False)
+    snapshot = CollectionSnapshot(fake_db, "bqs")
+
+    snapshot.start(timeout=0)
+
+    assert fake_db.collection.return_value.stream.call_count == 1
+    assert snapshot.version == 1
+    assert len(snapshot.get()) == len(generalBQ)
+    assert snapshot.diagnostics()["listening"] is True
+
+
+def test_projected_snapshot_reads_selected_fields_on_marker_changes():
+    fake_db = make_db(generalBQ)
+    collection = fake_db.collection.return_value
+    snapshot = CollectionSnapshot(fake_db, "bqs", fields=["question"])
+
+    snapshot.start()
+
+    # whole documents are never streamed: no collection listener, projected reads only
+    collection.on_snapshot.assert_not_called()
+    collection.stream.assert_not_called()
+    collection.select.assert_called_with(["question"])
+    assert snapshot.version == 1
+    assert set(snapshot.get()[0]) == {"question", "id"}
+
+    marker_callback = collection.document.return_value.on_snapshot.call_args.args[0]
+    collection.select.return_value.stream.return_value = [make_doc(generalBQ[0])]
+    marker_callback([MagicMock()], [MagicMock()], None)
+
+    assert snapshot.version == 2
+    assert [bq["id"] for bq in snapshot.get()] == [generalBQ[0]["id"]]
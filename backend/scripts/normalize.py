@@ -4,6 +4,8 @@ import argparse
 import os
 from typing import Any, Dict, List, Optional, Tuple
 
+from backend.scripts.similarity import K, add_similar_questions
+
 try:
     from bs4 import BeautifulSoup  # type: ignore
 
@@ -24,8 +26,11 @@ def _looks_like_html(s: str) -> bool:
 
 def _maybe_read_file(s: str) -> str:
     # if s is a real file path, read it; otherwise return s
+    # (only short single-line strings without markup can be paths, so skip the stat for HTML)
+    if not isinstance(s, str) or len(s) > 4096 or "<" in s or "\n" in s:
+        return s
     try:
-        if isinstance(s, str) and os.path.isfile(s):
+        if os.path.isfile(s):
             with open(s, "r", encoding="utf-8") as f:
                 return f.read()
     except Exception:
@@ -33,6 +38,62 @@ def _maybe_read_file(s: str) -> str:
     return s
 
 
+def _condense(text: str) -> str:
+    # condense blank lines
+    text = re.sub(r"\n\s*\n", "\n", text)
+    # collapse spaces on each line
+    text = "\n".join(line.strip() for line in text.splitlines())
+    return text.strip()
+
+
+def _sup_inline_text(node) -> str:
+    """Text of a parsed node with <sup> merged inline: "10<sup>4</sup>" -> "10^4" (read-only)"""
+    parts = []
+    for child in node.children:
+        if getattr(child, "name", None) == "sup":
+            parts.append("^" + child.get_text(strip=True))
+        elif getattr(child, "name", None):  # tag but not sup
+            parts.append(_sup_inline_text(child))
+        else:  # NavigableString
+            parts.append(str(child))
+    return "".join(parts)
+
+
+def _clean_soup_text(soup) -> str:
+    """Plain text of a parsed node with <sup>n</sup> as ^n (modifies the tree)"""
+    for sup in soup.find_all("sup"):
+        sup.replace_with("^" + (sup.get_text() or "").strip())
+    return _condense(soup.get_text("\n"))
+
+
+def _clean_regex_text(raw_html: str) -> str:
+    # Fallback: strip tags with a very rough regex
+    text = re.sub(
+        r"<sup>\s*(.*?)\s*</sup>", r"^\1", raw_html, flags=re.IGNORECASE | re.DOTALL
+    )
+    return _condense(re.sub(r"<[^>]+>", " ", text))
+
+
+def html_texts(raw_html: str) -> Tuple[str, str]:
+    """
+    Parse the HTML once and return both text views:
+    (clean text as in clean_html_to_text, sup-inline text as in html_to_text_with_sup_inline)
+    """
+    if not raw_html:
+        return "", ""
+    s = _maybe_read_file(raw_html)
+    if not _looks_like_html(s):
+        return str(s).strip(), str(s).strip()
+    if not BS4_AVAILABLE:
+        inline = re.sub(r"<sup>(.*?)</sup>", r"^\1", re.sub(r"<[^>]+>", " ", raw_html))
+        return _clean_regex_text(raw_html), inline
+
+    soup = BeautifulSoup(raw_html, "html.parser")
+    # Read-only walk first; the clean view rewrites <sup> tags in place
+    inline = _sup_inline_text(soup)
+    return _clean_soup_text(soup), inline
+
+
 def clean_html_to_text(raw_html: str) -> str:
     """Remove HTML and condense whitespace to plain text."""
     if not raw_html:
@@ -40,33 +101,36 @@ def clean_html_to_text(raw_html: str) -> str:
     s = _maybe_read_file(raw_html)
     if not _looks_like_html(s):
         # treat as plain text
-        text = str(s)
-    else:
-        if BS4_AVAILABLE:
-            soup = BeautifulSoup(raw_html, "html.parser")
-            # convert <sup>n</sup> to ^n
-            for sup in soup.find_all("sup"):
-                sup.replace_with("^" + (sup.get_text() or "").strip())
-            text = soup.get_text("\n")
-        else:
-            # Fallback: strip tags with a very rough regex
-            text = re.sub(
-                r"<sup>\s*(.*?)\s*</sup>", r"^\1", raw_html, flags=re.IGNORECASE | re.DOTALL
-            )
-            text = re.sub(r"<[^>]+>", " ", text)
-        # condense blank lines
-        text = re.sub(r"\n\s*\n", "\n", text)
-        # collapse spaces on each line
-        text = "\n".join(line.strip() for line in text.splitlines())
-    return text.strip()
-
-
-def extract_constraints_preserve_sup(raw_html: str) -> List[str]:
-    """
-    Extract constraints with exponents preserved inline (10^4, 10^9, etc.)
-    """
-    text = html_to_text_with_sup_inline(raw_html)
-
+        return str(s).strip()
+    if BS4_AVAILABLE:
+        return _clean_soup_text(BeautifulSoup(raw_html, "html.parser"))
+    return _clean_regex_text(raw_html)
+
+
+def clean_html_fragments(fragments: List[str]) -> List[str]:
+    """clean_html_to_text for several small fragments (e.g. hints) with a single parse."""
+    texts = [clean_html_to_text(f) if not _looks_like_html(f) else None for f in fragments]
+    html_positions = [i for i, text in enumerate(texts) if text is None]
+    if not html_positions:
+        return texts
+    if not BS4_AVAILABLE or len(html_positions) == 1:
+        for i in html_positions:
+            texts[i] = clean_html_to_text(fragments[i])
+        return texts
+
+    wrapped = "".join(f'<div data-fragment="{i}">{fragments[i]}</div>' for i in html_positions)
+    soup = BeautifulSoup(wrapped, "html.parser")
+    for div in soup.find_all("div", attrs={"data-fragment": True}, recursive=False):
+        if div.find("div", attrs={"data-fragment": True}) is None:
+            texts[int(div["data-fragment"])] = _clean_soup_text(div)
+    # A fragment with unbalanced markup can swallow its neighbours; parse those alone
+    for i in html_positions:
+        if texts[i] is None:
+            texts[i] = clean_html_to_text(fragments[i])
+    return texts
+
+
+def _constraints_from_inline_text(text: str) -> List[str]:
     # Isolate constraints section
     m = re.search(r"Constraints:\s*(.*)", text, flags=re.IGNORECASE | re.DOTALL)
     if not m:
@@ -83,6 +147,13 @@ def extract_constraints_preserve_sup(raw_html: str) -> List[str]:
     return constraints
 
 
+def extract_constraints_preserve_sup(raw_html: str) -> List[str]:
+    """
+    Extract constraints with exponents preserved inline (10^4, 10^9, etc.)
+    """
+    return _constraints_from_inline_text(html_to_text_with_sup_inline(raw_html))
+
+
 def html_to_text_with_sup_inline(raw_html: str) -> str:
     """
     Convert HTML to plain text while merging <sup> inline with preceding number.
@@ -98,20 +169,7 @@ def html_to_text_with_sup_inline(raw_html: str) -> str:
     if not BS4_AVAILABLE:
         return re.sub(r"<sup>(.*?)</sup>", r"^\1", re.sub(r"<[^>]+>", " ", raw_html))
 
-    soup = BeautifulSoup(raw_html, "html.parser")
-
-    def walk(node) -> str:
-        parts = []
-        for child in node.children:
-            if getattr(child, "name", None) == "sup":
-                parts.append("^" + child.get_text(strip=True))
-            elif getattr(child, "name", None):  # tag but not sup
-                parts.append(walk(child))
-            else:  # NavigableString
-                parts.append(str(child))
-        return "".join(parts)
-
-    return walk(soup)
+    return _sup_inline_text(BeautifulSoup(raw_html, "html.parser"))
 
 
 def parse_examples_from_text(desc_text: str) -> List[Dict[str, str]]:
@@ -300,10 +358,11 @@ def normalize_one(raw: Dict[str, Any], overrides: Dict[str, Any], start_id: Opti
     """
 
     desc_html = raw.get("description", "")
-    desc_text = clean_html_to_text(desc_html)
+    # One parse serves both the statement text and the sup-preserving constraints
+    desc_text, desc_inline_text = html_texts(desc_html)
 
     description, examples, _ = split_description_parts(desc_text)
-    constraints = extract_constraints_preserve_sup(desc_html)
+    constraints = _constraints_from_inline_text(desc_inline_text)
 
     stats = parse_stats(raw.get("stats"), raw.get("acceptance_rate"))
 
@@ -342,7 +401,7 @@ def normalize_one(raw: Dict[str, Any], overrides: Dict[str, Any], start_id: Opti
             "examples": examples,
             "constraints": constraints,
         },
-        "hints": [clean_html_to_text(h or "") for h in hints_list],
+        "hints": clean_html_fragments([h or "" for h in hints_list]),
         "solutions": [],
         "best_solution": None,
     }
@@ -400,27 +459,219 @@ def normalize_one(raw: Dict[str, Any], overrides: Dict[str, Any], start_id: Opti
     return cleaned
 
 
+# --- Streaming input ---
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStreamReader:
+    """Pull JSON values out of a file chunk by chunk without loading the whole document."""
+
+    def __init__(self, f, chunk_size: int = 1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character (not consumed), or None at end of input"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def consume(self) -> None:
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number (or literal) touching the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self):
+        """Yield the elements of the array whose '[' was just consumed"""
+        while True:
+            c = self.peek()
+            if c is None or c == "]":
+                self.consume()
+                return
+            if c == ",":
+                self.consume()
+                continue
+            yield self.value()
+
+
+def iter_records(input_path: str, list_keys=("problems", "items"), chunk_size: int = 1 << 20):
+    """
+    Stream problem records from a JSON dump (ijson-style, one record in memory at a time).
+
+    Accepts a top-level array, an object holding the array under one of list_keys, or a
+    single record object, like the previous json.load based reader.
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        reader = _JSONStreamReader(f, chunk_size)
+        root = reader.peek()
+        if root == "[":
+            reader.consume()
+            yield from reader.array_items()
+        elif root == "{":
+            reader.consume()
+            fields: Dict[str, Any] = {}
+            while True:
+                c = reader.peek()
+                if c is None or c == "}":
+                    break
+                if c == ",":
+                    reader.consume()
+                    continue
+                key = reader.value()
+                reader.peek()
+                reader.consume()  # ':'
+                if key in list_keys and reader.peek() == "[":
+                    reader.consume()
+                    yield from reader.array_items()
+                    return
+                fields[key] = reader.value()
+            yield fields
+
+
+def iter_normalized(path: str):
+    """Read normalized problems back from NDJSON or a JSON array, one at a time."""
+    if _is_ndjson(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from iter_records(path)
+
+
+def _is_ndjson(path: str) -> bool:
+    return path.endswith((".ndjson", ".jsonl"))
+
+
+# --- Parallel normalization ---
+_WORKER_OVERRIDES: Dict[str, Any] = {}
+
+
+def _init_worker(overrides: Dict[str, Any]) -> None:
+    global _WORKER_OVERRIDES
+    _WORKER_OVERRIDES = overrides
+
+
+def _normalize_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    cleaned_chunk = []
+    for problem_id, item in chunk:
+        cleaned = normalize_one(item, _WORKER_OVERRIDES)
+        cleaned["id"] = problem_id
+        cleaned_chunk.append(cleaned)
+    return cleaned_chunk
+
+
+def _chunked(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _normalize_stream(records, overrides: Dict[str, Any], workers: int, chunk_size: int):
+    """Yield normalized records in input order; at most workers * 4 chunks are in flight."""
+    chunks = _chunked(records, chunk_size)
+    if workers <= 1:
+        _init_worker(overrides)
+        for chunk in chunks:
+            yield from _normalize_chunk(chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(overrides,)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_normalize_chunk, chunk))
+            if len(in_flight) >= workers * 4:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+class _OutputWriter:
+    """Write records incrementally as NDJSON or as a JSON array"""
+
+    def __init__(self, path: str):
+        self.ndjson = _is_ndjson(path)
+        self.f = open(path, "w", encoding="utf-8")
+        self.count = 0
+        if not self.ndjson:
+            self.f.write("[\n")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.ndjson:
+            self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.f.write((",\n" if self.count else "") + json.dumps(record, indent=2, ensure_ascii=False))
+        self.count += 1
+
+    def close(self) -> None:
+        if not self.ndjson:
+            self.f.write("\n]\n")
+        self.f.close()
+
+
 def normalize_file(
     input_path: str,
     output_path: str,
     first_n: int,
     start_id: int,
     overrides_path: Optional[str] = None,
-) -> None:
-    with open(input_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    if isinstance(data, list):
-        items = data
-    elif isinstance(data, dict):
-        if "problems" in data and isinstance(data["problems"], list):
-            items = data["problems"]
-        elif "items" in data and isinstance(data["items"], list):
-            items = data["items"]
-        else:
-            items = [data]
-    else:
-        items = []
+    similar_k: Optional[int] = K,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> Dict[str, Any]:
+    """
+    Stream, normalize and write problems.
+
+    Records are read one at a time, normalized in a process pool (in input order) and
+    written incrementally; ".ndjson"/".jsonl" outputs get one record per line, anything
+    else a JSON array. With similar_k, records go to a temporary NDJSON file first and a
+    second streaming pass adds similar_questions once the whole set is known.
+
+    Returns:
+        dict: counts and timings
+    """
+    import itertools
+    import time
 
     overrides: Dict[str, Any] = {}
     if overrides_path:
@@ -430,19 +681,61 @@ def normalize_file(
         except Exception:
             overrides = {}
 
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    started = time.time()
+    records = iter_records(input_path)
     if first_n is not None:
-        items = items[:first_n]
-    cleaned_all = []
-    for i, item in enumerate(items):
-        if item.get("difficulty") in ("Easy", "Medium"):
-            cleaned = normalize_one(item, overrides)
-            cleaned["id"] = str(start_id + i)
-            cleaned_all.append(cleaned)
-        else:
-            pass
+        records = itertools.islice(records, first_n)
+    # Ids follow input positions, including skipped problems
+    selected = (
+        (str(start_id + i), item)
+        for i, item in enumerate(records)
+        if item.get("difficulty") in ("Easy", "Medium")
+    )
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(cleaned_all, f, indent=2, ensure_ascii=False)
+    first_pass_path = output_path + ".partial.ndjson" if similar_k else output_path
+    writer = _OutputWriter(first_pass_path)
+    # Only what the similarity stage needs is kept in memory
+    similarity_inputs: List[Dict[str, Any]] = []
+    try:
+        for cleaned in _normalize_stream(selected, overrides, workers, chunk_size):
+            writer.write(cleaned)
+            if similar_k:
+                similarity_inputs.append({
+                    "id": cleaned["id"],
+                    "title": cleaned["title"],
+                    "slug": cleaned["slug"],
+                    "difficulty": cleaned["difficulty"],
+                    "topics": cleaned["topics"],
+                    "statement": {"description": cleaned["statement"]["description"]},
+                })
+    finally:
+        writer.close()
+    normalized_at = time.time()
+
+    if similar_k:
+        # Precompute "next problem" suggestions over the whole normalized set
+        add_similar_questions(similarity_inputs, k=similar_k)
+        final_writer = _OutputWriter(output_path)
+        try:
+            for cleaned, light in zip(iter_normalized(first_pass_path), similarity_inputs):
+                cleaned["similar_questions"] = light["similar_questions"]
+                final_writer.write(cleaned)
+        finally:
+            final_writer.close()
+            os.remove(first_pass_path)
+
+    stats = {
+        "problems": writer.count,
+        "workers": workers,
+        "normalizeSeconds": round(normalized_at - started, 2),
+        "totalSeconds": round(time.time() - started, 2),
+    }
+    stats["problemsPerSecond"] = round(writer.count / max(stats["normalizeSeconds"], 1e-9), 1)
+    print(f"[NORMALIZE]: {stats}")
+    return stats
 
 
 def main():
@@ -452,8 +745,9 @@ def main():
     first_n = 1000   # set an int if you want to limit, e.g. 10
     overrides = None # or path to overrides.json
     start_id = 1
+    workers = None   # process pool size; None = CPU count
 
-    normalize_file(input_file, output_file, first_n, start_id, overrides)
+    normalize_file(input_file, output_file, first_n, start_id, overrides, workers=workers)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,15 @@
 import subprocess
 import json
+import hashlib
+import threading
+import time
 import firebase_admin
 from firebase_admin import credentials, firestore
 import argparse
 import os
 import sys
 from backend.data.database import firestore_db 
-from backend.scripts.normalize import normalize_file
+from backend.scripts.normalize import normalize_file, iter_normalized
 from backend.data.schemas import CodingProblems
 
 
@@ -14,12 +17,105 @@ from backend.data.schemas import CodingProblems
 def upload_to_firestore(output_path: str):
     """Upload normalized JSON to Firebase Firestore."""
     
-    with open(output_path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-    problems = [CodingProblems(**item) for item in raw]
+    problems = [CodingProblems(**item) for item in iter_normalized(output_path)]
     firestore_db.set_coding_problems(problems)
 
 
+def content_hash(item: dict) -> str:
+    """Stable hash of a normalized problem (key order and whitespace independent)."""
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class UploadManifest:
+    """
+    Local record of what Firestore holds: problem id -> content hash.
+
+    Updated only from successful write results and saved every checkpoint_every
+    writes, so an interrupted sync resumes where it stopped.
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = 200):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.hashes = {}
+        self.exists = os.path.exists(path)
+        if self.exists:
+            with open(path, "r", encoding="utf-8") as f:
+                self.hashes = json.load(f).get("problems", {})
+        self._lock = threading.Lock()
+        self._since_save = 0
+
+    def record(self, problem_id: str, content: str = None) -> None:
+        with self._lock:
+            if content is None:
+                self.hashes.pop(problem_id, None)
+            else:
+                self.hashes[problem_id] = content
+            self._since_save += 1
+            if self._since_save >= self.checkpoint_every:
+                self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"problems": self.hashes, "updatedAt": time.time()}, f)
+        os.replace(tmp_path, self.path)
+        self._since_save = 0
+
+
+def sync_to_firestore(output_path: str, manifest_path: str, checkpoint_every: int = 200) -> dict:
+    """
+    Incrementally sync normalized problems to Firestore.
+
+    Only problems whose content hash differs from the manifest are written (through
+    BulkWriter), and problems that disappeared from the dump are deleted. Without a
+    manifest, the existing ids are listed once so removed problems are still detected.
+    """
+    started = time.time()
+    manifest = UploadManifest(manifest_path, checkpoint_every)
+    if not manifest.exists:
+        # Unknown hashes: everything present is rewritten once, but deletions are detected
+        manifest.hashes = {pid: None for pid in firestore_db.list_coding_problem_ids()["data"]}
+
+    seen = set()
+    pending = {}
+
+    def changed_problems():
+        for item in iter_normalized(output_path):
+            problem_id = str(item["id"])
+            seen.add(problem_id)
+            digest = content_hash(item)
+            if manifest.hashes.get(problem_id) != digest:
+                pending[problem_id] = digest
+                yield CodingProblems(**item)
+
+    def on_written(problem_id: str, deleted: bool):
+        manifest.record(problem_id, None if deleted else pending.get(problem_id))
+
+    try:
+        upserts = firestore_db.sync_coding_problems(changed_problems(), on_written=on_written)
+        removed = [pid for pid in list(manifest.hashes) if pid not in seen]
+        deletes = firestore_db.sync_coding_problems(delete_ids=removed, on_written=on_written)
+    finally:
+        manifest.save()
+
+    result = {
+        "problems": len(seen),
+        "written": upserts["written"],
+        "deleted": deletes["deleted"],
+        "unchanged": len(seen) - len(pending),
+        "failed": upserts["failed"] + deletes["failed"],
+        "seconds": round(time.time() - started, 2),
+    }
+    print(f"[UPLOAD]: {result}")
+    return result
+
+
 def cleanup_file(files: list):
     """Delete a file if it exists."""
     for path in files:
@@ -33,11 +129,13 @@ def cleanup_file(files: list):
 def main():
     input_file = "backend/scripts/leetcode_problems.json"
     output_file = "backend/scripts/cleaned.json"
+    manifest_file = "backend/scripts/upload_manifest.json"  # keep between runs for incremental sync
     first_n = 1000   # set an int if you want to limit, e.g. 10
     overrides = None # or path to overrides.json
     start_id = 1
     # normalize_file(input_file, output_file, first_n, start_id, overrides)
     # print(upload_to_firestore(output_file))
+    # print(sync_to_firestore(output_file, manifest_file))
     cleanup_file([output_file, input_file])
 
 
@@ -0,0 +1,117 @@
+"""
+Offline k-nearest-neighbour graph over coding problems.
+
+Similarity = TOPIC_WEIGHT * topic Jaccard + (1 - TOPIC_WEIGHT) * TF-IDF cosine of
+title + statement. Both are computed in row blocks: topic overlap as a matrix
+product, text cosine from the sparse TF-IDF rows and postings (TfidfIndex.cosine_block).
+Only the score blocks are dense, so memory stays bounded by BLOCK_SIZE x n.
+"""
+
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from backend.tools.text_index import TfidfIndex
+
+K = 5
+TOPIC_WEIGHT = 0.5
+MAX_FEATURES = 20000
+BLOCK_SIZE = 512
+
+
+def _topic_matrix(problems: List[Dict[str, Any]]) -> np.ndarray:
+    """Binary (n_problems x n_topics) matrix"""
+    vocabulary: Dict[str, int] = {}
+    rows, cols = [], []
+    for i, p in enumerate(problems):
+        for topic in set(t.strip().lower() for t in (p.get("topics") or []) if t):
+            rows.append(i)
+            cols.append(vocabulary.setdefault(topic, len(vocabulary)))
+    matrix = np.zeros((len(problems), len(vocabulary)), dtype=np.float32)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
+def _statement_text(problem: Dict[str, Any]) -> str:
+    statement = problem.get("statement") or {}
+    return f"{problem.get('title') or ''}\n{statement.get('description') or ''}"
+
+
+def compute_similar_questions(
+    problems: List[Dict[str, Any]],
+    k: int = K,
+    topic_weight: float = TOPIC_WEIGHT,
+    max_features: int = MAX_FEATURES,
+    block_size: int = BLOCK_SIZE,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Return, for every problem, its k most similar problems (best first) in the
+    SimilarQuestion shape: {"id", "title", "slug", "difficulty", "score"}.
+    """
+    n = len(problems)
+    if n < 2 or k <= 0:
+        return [[] for _ in problems]
+    k = min(k, n - 1)
+
+    topics = _topic_matrix(problems)
+    topic_counts = topics.sum(axis=1)
+    text = TfidfIndex([_statement_text(p) for p in problems], max_features=max_features, max_df=0.5)
+
+    neighbours: List[List[Dict[str, Any]]] = []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+
+        intersection = topics[start:end] @ topics.T
+        union = topic_counts[start:end, None] + topic_counts[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        cosine = text.cosine_block(start, end)
+        scores = topic_weight * jaccard + (1.0 - topic_weight) * cosine
+
+        # Never recommend a problem to itself
+        scores[np.arange(end - start), np.arange(start, end)] = -1.0
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for row in range(end - start):
+            neighbours.append([
+                {
+                    "id": problems[j].get("id"),
+                    "title": problems[j].get("title") or "",
+                    "slug": problems[j].get("slug") or "",
+                    "difficulty": problems[j].get("difficulty") or "",
+                    "score": round(float(score), 4),
+                }
+                for j, score in zip(top[row], top_scores[row])
+                if score > 0
+            ])
+    return neighbours
+
+
+def add_similar_questions(problems: List[Dict[str, Any]], k: int = K, **kwargs) -> List[Dict[str, Any]]:
+    """Populate problem["similar_questions"] in place and return the problems."""
+    started = time.time()
+    for problem, similar in zip(problems, compute_similar_questions(problems, k=k, **kwargs)):
+        problem["similar_questions"] = similar
+    print(f"[SIMILARITY]: Built {k}-NN graph for {len(problems)} problems in {time.time() - started:.2f}s")
+    return problems
+
+
+def main():
+    # 🔧 configure your paths here (normalized problems, updated in place)
+    cleaned_file = "backend/scripts/cleaned.json"
+
+    with open(cleaned_file, "r", encoding="utf-8") as f:
+        problems = json.load(f)
+    add_similar_questions(problems)
+    with open(cleaned_file, "w", encoding="utf-8") as f:
+        json.dump(problems, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
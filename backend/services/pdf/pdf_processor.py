@@ -9,6 +9,7 @@ import fitz  # PyMuPDF
 from fastapi import UploadFile
 
 from backend.config import PDFConfig
+from backend.tools.log import get_logger
 from .file_validator import FileValidator
 from .text_cleaner import TextCleaner
 from .exceptions import (
@@ -18,6 +19,8 @@ from .exceptions import (
     FileTooLargeError
 )
 
+logger = get_logger(__name__)
+
 
 class PDFProcessor:
     """
@@ -116,7 +119,7 @@ class PDFProcessor:
                         extracted_text += page_text + "\n\n"
                         
                 except Exception as e:
-                    print(f"Warning: Failed to extract text from page {page_num + 1}: {e}")
+                    logger.warning("Failed to extract text from page %d: %s", page_num + 1, e)
                     continue
             
             if not extracted_text.strip():
@@ -205,9 +205,27 @@ def test_get_all_interviews_for_workflow_empty():
         assert res["success"] is False
         assert res["data"] == []
 
+def test_get_snapshot_diagnostics():
+    response = client.get("/diagnostics/snapshots", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    res = response.json()
+    assert res["success"] is True
+    assert "version" in res["data"]["bqs"]
+    assert "ageSeconds" in res["data"]["bqs"]
+
+# --- Test GET /metrics ---
+def test_metrics_are_exposed_for_scraping():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE interview_first_response_seconds histogram" in response.text
+    assert "interview_interruptions_total" in response.text
+
 # --- Test POST /interviews/start ---
 def test_post_interview_start():
-    with patch("backend.coordinator.preparation_workflow.generate_session_id", return_value="session_abc"):
+    with patch("backend.coordinator.preparation_workflow.generate_session_id", return_value="session_abc"), \
+         patch("backend.api.routes.prewarm_interview") as mock_prewarm:
         response = client.post(
             "/interviews/start",
             json={"workflow_id": "wf_001", "duration": 5, "is_audio": False},
@@ -218,6 +236,7 @@ def test_post_interview_start():
         assert res["success"] is True
         assert "session_id" in res["data"]
         assert "websocket_parameter" in res["data"]
+        mock_prewarm.assert_called_once_with(res["data"]["session_id"], "user123", "wf_001")
 
 # --- Test POST /interviews/{workflow_id}/{session_id}/feedback ---
 def test_get_feedback_for_session():
@@ -378,4 +397,36 @@ def test_start_workflow_missing_job_description():
         data=data
     )
     
-    assert response.status_code == 422  # Validation error
\ No newline at end of file
+    assert response.status_code == 422  # Validation error
+# --- Test GET /problems ---
+def test_list_problems_filters_and_pages():
+    mock_result = {"items": [{"id": "1", "title": "Two Sum"}], "total": 3, "offset": 2, "limit": 2}
+    with patch("backend.api.routes.problem_index.query", return_value=mock_result) as mock_query:
+        response = client.get("/problems?topic=Array&topic=Hash%20Table&difficulty=Easy&sort_by=likes&page=2&page_size=2")
+
+    assert response.status_code == 200
+    res = response.json()
+    assert res["success"] is True
+    assert res["data"]["problems"] == mock_result["items"]
+    assert res["data"]["total"] == 3
+    kwargs = mock_query.call_args.kwargs
+    assert kwargs["topics"] == ["Array", "Hash Table"]
+    assert kwargs["offset"] == 2 and kwargs["limit"] == 2
+    assert kwargs["descending"] is True
+
+
+def test_list_problems_rejects_unknown_sort_field():
+    response = client.get("/problems?sort_by=views")
+    assert response.status_code == 400
+
+
+def test_get_similar_problems():
+    similar = [{"id": "15", "title": "3Sum", "slug": "3sum", "difficulty": "Medium", "score": 0.61}]
+    with patch("backend.data.database.firestore_db.get_coding_problems", return_value={
+        "message": "Coding problem retrieved successfully",
+        "data": {"title": "Two Sum", "similar_questions": similar}
+    }):
+        response = client.get("/problems/1/similar")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == similar
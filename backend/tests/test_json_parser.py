@@ -0,0 +1,63 @@
+from backend.tools.json_parser import IncrementalJSONParser, parse_json_response
+
+
+def test_parse_fenced_array_with_trailing_prose():
+    text = '```json\n[{"question": "Why us?", "tags": ["Company"]}]\n```\nLet me know if you need more.'
+    assert parse_json_response(text) == [{"question": "Why us?", "tags": ["Company"]}]
+
+
+def test_parse_object_after_prose_with_braces():
+    text = 'Sure {here} is the feedback: {"positives": ["Clear"], "overallRating": 3} Good luck!'
+    assert parse_json_response(text) == {"positives": ["Clear"], "overallRating": 3}
+
+
+def test_parse_without_json_returns_error():
+    result = parse_json_response("I could not generate questions.")
+    assert "error" in result
+    assert result["raw_response"] == "I could not generate questions."
+
+
+def test_truncated_array_keeps_completed_items():
+    assert parse_json_response('[{"q": 1}, {"q": 2}, {"q": ') == [{"q": 1}, {"q": 2}]
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    emitted = []
+    parser = IncrementalJSONParser(on_item=emitted.append)
+    chunks = ['```js', 'on\n[{"question": "Tell me ', 'about a [hard] bug\\"s fix"}', ', {"question": "Wh', 'y?"}', "]\n```"]
+
+    parser.feed(chunks[0])
+    parser.feed(chunks[1])
+    assert emitted == []
+    parser.feed(chunks[2])
+    assert emitted == [{"question": 'Tell me about a [hard] bug"s fix'}]
+    parser.feed(chunks[3])
+    parser.feed(chunks[4])
+    assert len(emitted) == 2
+    parser.feed(chunks[5])
+
+    assert parser.done
+    assert parser.close() == emitted
+
+
+def test_prose_brackets_before_a_fence_are_not_the_answer():
+    text = 'Here are [3] questions:\n```json\n[{"q":1}]\n```'
+    assert parse_json_response(text) == [{"q": 1}]
+
+    cited = 'Based on the job post [1] and resume [2]:\n```\n[{"question": "Why us?"}, {"question": "Why now?"}]\n```'
+    assert parse_json_response(cited) == [{"question": "Why us?"}, {"question": "Why now?"}]
+
+
+def test_streamed_citation_is_held_back_until_the_fenced_answer():
+    emitted = []
+    parser = IncrementalJSONParser(on_item=emitted.append)
+    for chunk in ["As noted in [1], ", "here you go:\n```json\n[{\"q\"", ": 1}, {\"q\": 2}]\n```"]:
+        parser.feed(chunk)
+
+    assert emitted == [{"q": 1}, {"q": 2}]
+    assert parser.close() == emitted
+
+
+def test_scalar_list_after_prose_is_a_fallback():
+    assert parse_json_response("The answer is [1, 2, 3].") == [1, 2, 3]
+    assert parse_json_response('["Why us?", "Why now?"]') == ["Why us?", "Why now?"]
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+import httpx
+
+from backend.tools import ttl_cache
+from backend.tools.link_validator import LinkValidator
+
+PAGE = b"<html><body>" + b"Interview tips " * 100 + b"</body></html>"
+
+
+def make_validator(handler, **kwargs):
+    return LinkValidator(transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_validate_all_checks_links_and_caches_both_outcomes():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        if request.url.path == "/gone":
+            return httpx.Response(404, content=PAGE)
+        if request.url.path == "/soft-404":
+            return httpx.Response(200, content=b"<h1>Page not found</h1>" + PAGE)
+        if request.url.path == "/empty":
+            return httpx.Response(200, content=b"<html></html>")
+        return httpx.Response(200, content=PAGE)
+
+    validator = make_validator(handler)
+    urls = ["https://a.com/ok", "https://a.com/gone", "https://a.com/soft-404", "https://a.com/empty", "", "ftp://x"]
+
+    first = await validator.validate_all(urls + ["https://a.com/ok"])
+    second = await validator.validate_all(urls)
+
+    assert first == second == {
+        "https://a.com/ok": True,
+        "https://a.com/gone": False,
+        "https://a.com/soft-404": False,
+        "https://a.com/empty": False,
+        "": False,
+        "ftp://x": False,
+    }
+    # one request per distinct URL, negative results are cached too
+    assert len(calls) == 4
+    assert validator.diagnostics()["entries"] == 4
+
+
+@pytest.mark.asyncio
+async def test_only_a_prefix_is_read_and_checks_run_concurrently():
+    sent = []
+    in_flight = 0
+    peak = 0
+
+    async def body():
+        for _ in range(1000):
+            sent.append(1)
+            yield b"x" * 1024
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, content=body())
+
+    validator = make_validator(handler, max_bytes=8 * 1024, max_concurrency=4)
+    result = await validator.validate_all([f"https://b.com/{i}" for i in range(8)])
+
+    assert all(result.values())
+    assert peak == 4
+    # 8 pages of 1000 KB each, only ~8 KB read from each
+    assert len(sent) < 8 * 20
+
+
+@pytest.mark.asyncio
+async def test_errors_are_unreachable_and_expire_after_negative_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: clock[0])
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectTimeout("timed out")
+        return httpx.Response(200, content=PAGE)
+
+    validator = make_validator(handler, ttl_seconds=3600, negative_ttl_seconds=60)
+
+    assert await validator.is_reachable("https://c.com") is False
+    assert await validator.is_reachable("https://c.com") is False
+    clock[0] += 61
+    assert await validator.is_reachable("https://c.com") is True
+    assert len(attempts) == 2
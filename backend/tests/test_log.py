@@ -0,0 +1,62 @@
+import io
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from backend.tools import log
+from backend.tools.log import (
+    CategoryRateLimiter, DroppingQueueHandler, bind, get_logger, setup_logging, shutdown_logging
+)
+
+
+def make_record(category=None):
+    record = logging.LogRecord("backend.test", logging.INFO, __file__, 1, "chunk", None, None)
+    if category:
+        record.category = category
+    return record
+
+
+def test_rate_limiter_suppresses_per_category_and_reports_count():
+    limiter = CategoryRateLimiter({"audio": 2.0})
+    clock = [100.0]
+
+    with patch.object(log.time, "monotonic", side_effect=lambda: clock[0]):
+        passed = [limiter.filter(make_record("audio")) for _ in range(10)]
+        assert passed == [True, True] + [False] * 8
+        # other categories are never limited
+        assert all(limiter.filter(make_record("control")) for _ in range(10))
+
+        clock[0] += 1.0
+        record = make_record("audio")
+        assert limiter.filter(record)
+        assert record.suppressed == 8
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(make_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_structured_records_are_written_by_background_listener():
+    stream = io.StringIO()
+    setup_logging(level="DEBUG", json_format=True, rate_limits={"audio": 1.0}, stream=stream)
+    try:
+        session_log = bind(get_logger("agents.test"), session_id="s1", workflow_id="wf1")
+        session_log.info("Client connected", extra={"protocol": "binary"})
+        for _ in range(50):
+            session_log.debug("audio/pcm %d bytes", 3200, extra={"category": "audio", "bytes": 3200})
+    finally:
+        shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["severity"] == "INFO"
+    assert lines[0]["logger"] == "backend.agents.test"
+    assert (lines[0]["session_id"], lines[0]["workflow_id"], lines[0]["protocol"]) == ("s1", "wf1", "binary")
+    assert lines[1]["message"] == "audio/pcm 3200 bytes"
+    assert lines[1]["category"] == "audio"
@@ -0,0 +1,35 @@
+import pytest
+
+from backend.tools.metrics import MetricsRegistry
+
+
+def test_histograms_and_counters_render_in_prometheus_text_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram("turn_seconds", "Turn latency", [0.5, 1, 2.5])
+    interruptions = registry.counter("interruptions_total", "Interrupted turns")
+
+    for value in (0.2, 0.7, 0.9, 3):
+        latency.observe(value)
+    interruptions.inc()
+    interruptions.inc(2)
+
+    assert registry.render() == (
+        "# HELP turn_seconds Turn latency\n"
+        "# TYPE turn_seconds histogram\n"
+        'turn_seconds_bucket{le="0.5"} 1\n'
+        'turn_seconds_bucket{le="1"} 3\n'
+        'turn_seconds_bucket{le="2.5"} 3\n'
+        'turn_seconds_bucket{le="+Inf"} 4\n'
+        "turn_seconds_sum 4.8\n"
+        "turn_seconds_count 4\n"
+        "# HELP interruptions_total Interrupted turns\n"
+        "# TYPE interruptions_total counter\n"
+        "interruptions_total 3\n"
+    )
+
+
+def test_metric_names_are_unique():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests")
+    with pytest.raises(ValueError):
+        registry.histogram("requests_total", "Requests", [1])
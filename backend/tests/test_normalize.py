@@ -0,0 +1,59 @@
+import json
+
+from backend.scripts.normalize import (
+    clean_html_fragments,
+    clean_html_to_text,
+    html_texts,
+    html_to_text_with_sup_inline,
+    iter_normalized,
+    iter_records,
+    normalize_file,
+)
+
+DESCRIPTION = (
+    "<p>Return the sum of <code>nums</code>.</p>"
+    "<p><strong>Example 1:</strong></p><pre><strong>Input:</strong> nums = [1,2]\n<strong>Output:</strong> 3</pre>"
+    "<p><strong>Constraints:</strong></p><ul><li><code>1 &lt;= nums.length &lt;= 10<sup>4</sup></code></li></ul>"
+)
+
+
+def test_single_parse_matches_separate_parses():
+    assert html_texts(DESCRIPTION) == (clean_html_to_text(DESCRIPTION), html_to_text_with_sup_inline(DESCRIPTION))
+    assert html_texts("plain text ") == ("plain text", "plain text")
+
+    hints = ["Use a <code>hash map</code>.", "", "Plain hint", "O(n<sup>2</sup>) is <b>too slow", "<i>Sort</i> first"]
+    assert clean_html_fragments(hints) == [clean_html_to_text(h) for h in hints]
+
+
+def test_iter_records_streams_arrays_and_wrapped_objects(tmp_path):
+    records = [{"title": f"P{i}", "n": 10 ** i} for i in range(50)]
+    array_path = tmp_path / "array.json"
+    array_path.write_text(json.dumps(records))
+    wrapped_path = tmp_path / "wrapped.json"
+    wrapped_path.write_text(json.dumps({"meta": {"count": 50}, "problems": records}))
+
+    assert list(iter_records(str(array_path))) == records
+    # tiny chunks split records and numbers across reads
+    assert list(iter_records(str(array_path), chunk_size=7)) == records
+    assert list(iter_records(str(wrapped_path), chunk_size=5)) == records
+
+
+def test_normalize_file_writes_ndjson_in_input_order(tmp_path):
+    raw = [
+        {"title": "Two Sum", "titleSlug": "two-sum", "difficulty": "Easy", "topics": ["Array"], "description": DESCRIPTION},
+        {"title": "Hard One", "titleSlug": "hard-one", "difficulty": "Hard", "topics": ["Array"], "description": ""},
+        {"title": "Add Sums", "titleSlug": "add-sums", "difficulty": "Medium", "topics": ["Array"], "description": DESCRIPTION},
+    ]
+    input_path = tmp_path / "dump.json"
+    input_path.write_text(json.dumps(raw))
+    output_path = tmp_path / "cleaned.ndjson"
+
+    stats = normalize_file(str(input_path), str(output_path), None, 1, similar_k=1, workers=1)
+
+    cleaned = list(iter_normalized(str(output_path)))
+    assert stats["problems"] == 2
+    assert [p["id"] for p in cleaned] == ["1", "3"]
+    assert cleaned[0]["statement"]["constraints"] == ["1 <= nums.length <= 10^4"]
+    assert cleaned[0]["similar_questions"][0]["slug"] == "add-sums"
+    # the temporary first-pass file is removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cleaned.ndjson", "dump.json"]
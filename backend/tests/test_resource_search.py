@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.tools.resource_search import FALLBACK_RESOURCE, ResourceSearch, normalize_topic
+
+
+def resource(topic):
+    return {"title": f"Guide: {topic}", "link": f"https://example.com/{normalize_topic(topic).replace(' ', '-')}"}
+
+
+def test_normalize_topic():
+    assert normalize_topic("  STAR  Method!! ") == normalize_topic("star method") == "star method"
+
+
+@pytest.mark.asyncio
+async def test_lookups_run_concurrently_and_are_memoized_by_normalized_topic():
+    calls = []
+    lock = threading.Lock()
+
+    def search(topic):
+        with lock:
+            calls.append(topic)
+        time.sleep(0.2)
+        return resource(topic)
+
+    service = ResourceSearch(search=search, max_concurrency=4, deadline_seconds=5)
+    started = time.monotonic()
+    first = await service.find_all(["STAR method", "System design", "Conflict resolution", "star method!"])
+    elapsed = time.monotonic() - started
+
+    assert [r["link"] for r in first] == [
+        "https://example.com/star-method",
+        "https://example.com/system-design",
+        "https://example.com/conflict-resolution",
+        "https://example.com/star-method",
+    ]
+    assert elapsed < 0.5  # concurrent, not 3 x 0.2s
+    assert len(calls) == 3
+
+    again = await service.find("Star Method")
+    assert again["link"] == "https://example.com/star-method"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back_and_late_result_fills_cache():
+    release = threading.Event()
+
+    def search(topic):
+        if topic == "slow":
+            release.wait(2)
+        return resource(topic)
+
+    service = ResourceSearch(search=search, deadline_seconds=0.05)
+    started = time.monotonic()
+    results = await service.find_all(["fast", "slow"])
+
+    assert time.monotonic() - started < 0.5
+    assert results[0]["link"] == "https://example.com/fast"
+    assert results[1] == FALLBACK_RESOURCE
+
+    release.set()
+    for _ in range(50):
+        if not service.diagnostics()["inFlight"]:
+            break
+        await asyncio.sleep(0.01)
+    assert (await service.find("slow"))["link"] == "https://example.com/slow"
+
+
+@pytest.mark.asyncio
+async def test_failures_use_fallback_and_are_cached_briefly():
+    calls = []
+
+    def search(topic):
+        calls.append(topic)
+        raise RuntimeError("rate limited")
+
+    service = ResourceSearch(search=search, negative_ttl_seconds=60)
+
+    assert await service.find("graphs") == FALLBACK_RESOURCE
+    assert await service.find("graphs") == FALLBACK_RESOURCE
+    assert calls == ["graphs"]
@@ -0,0 +1,56 @@
+import numpy as np
+
+from backend.scripts.similarity import add_similar_questions, compute_similar_questions
+
+
+def make_problem(pid, title, topics, description):
+    return {
+        "id": pid,
+        "title": title,
+        "slug": title.lower().replace(" ", "-"),
+        "difficulty": "Easy",
+        "topics": topics,
+        "statement": {"description": description},
+    }
+
+
+PROBLEMS = [
+    make_problem("1", "Two Sum", ["Array", "Hash Table"], "Find two indices whose values add up to the target sum."),
+    make_problem("2", "Three Sum", ["Array", "Two Pointers"], "Find all triplets whose values add up to a zero sum."),
+    make_problem("3", "Valid Anagram", ["Hash Table", "String"], "Check whether two strings are anagrams of each other."),
+    make_problem("4", "Combine Two Tables", ["Database"], "Write a SQL query joining person and address tables."),
+]
+
+
+def test_neighbours_rank_by_topics_and_text():
+    neighbours = compute_similar_questions(PROBLEMS, k=2, block_size=3)
+
+    assert [s["id"] for s in neighbours[0]] == ["2", "3"]
+    assert neighbours[1][0]["id"] == "1"
+    # never the problem itself, best first
+    for pid, similar in zip("1234", neighbours):
+        assert pid not in [s["id"] for s in similar]
+        scores = [s["score"] for s in similar]
+        assert scores == sorted(scores, reverse=True)
+    # nothing in common with the database problem
+    assert neighbours[3] == []
+
+
+def test_scores_match_brute_force_jaccard_for_topic_only_weight():
+    neighbours = compute_similar_questions(PROBLEMS, k=3, topic_weight=1.0)
+
+    def jaccard(a, b):
+        a, b = set(a), set(b)
+        return len(a & b) / len(a | b)
+
+    for i, similar in enumerate(neighbours):
+        for s in similar:
+            j = int(s["id"]) - 1
+            assert np.isclose(s["score"], jaccard(PROBLEMS[i]["topics"], PROBLEMS[j]["topics"]), atol=1e-4)
+
+
+def test_add_similar_questions_sets_field():
+    problems = [dict(p) for p in PROBLEMS]
+    add_similar_questions(problems, k=1)
+    assert problems[0]["similar_questions"][0]["slug"] == "three-sum"
+    assert set(problems[0]["similar_questions"][0]) == {"id", "title", "slug", "difficulty", "score"}
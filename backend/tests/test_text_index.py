@@ -0,0 +1,48 @@
+import numpy as np
+
+from backend.tools.text_index import TfidfIndex, tokenize
+
+
+def dense(index):
+    """Reference dense matrix of the index's sparse rows"""
+    matrix = np.zeros((index.n_docs, len(index.vocabulary)), dtype=np.float32)
+    for row in range(index.n_docs):
+        start, end = index.indptr[row], index.indptr[row + 1]
+        matrix[row, index.indices[start:end]] = index.data[start:end]
+    return matrix
+
+
+def test_tokenize_drops_stop_words_and_keeps_symbols():
+    assert tokenize("Tell me about your C++ and C# experience") == ["c++", "c#", "experience"]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_by_cosine_similarity():
+    docs = [
+        "Conflict with a teammate on code review",
+        "Leadership of a team under a tight deadline",
+        "Handling a production outage deadline",
+        "",
+    ]
+    index = TfidfIndex(docs)
+
+    results = index.search("tight deadline", top_k=3)
+    assert [pos for pos, _ in results] == [1, 2]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search("astronomy", top_k=3) == []
+
+    # sparse scores match the dense matrix product
+    matrix = dense(index)
+    query_idx, query_val = index.vectorize("tight deadline")
+    query = np.zeros(len(index.vocabulary), dtype=np.float32)
+    query[query_idx] = query_val
+    np.testing.assert_allclose(index.scores("tight deadline"), matrix @ query, rtol=1e-5)
+
+
+def test_cosine_block_matches_the_dense_product():
+    docs = ["binary search on sorted arrays", "sorted arrays and two pointers", "graph search with BFS", "", "arrays arrays arrays"]
+    index = TfidfIndex(docs)
+    matrix = dense(index)
+
+    np.testing.assert_allclose(index.cosine_block(1, 4), matrix[1:4] @ matrix.T, rtol=1e-5, atol=1e-7)
+    assert index.cosine_block(0, len(docs)).shape == (len(docs), len(docs))
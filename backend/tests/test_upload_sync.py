@@ -0,0 +1,120 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from backend.data.database import FirestoreDB
+from backend.scripts import run_and_upload
+from backend.scripts.run_and_upload import sync_to_firestore
+
+
+class FakeBulkWriter:
+    """Applies operations to a dict and reports results like BulkWriter on close()"""
+
+    def __init__(self, store, fail_ids=()):
+        self.store = store
+        self.fail_ids = set(fail_ids)
+        self.ops = []
+
+    def on_write_result(self, callback):
+        self.on_result = callback
+
+    def on_write_error(self, callback):
+        self.on_error = callback
+
+    def set(self, ref, data, merge=False):
+        self.ops.append(("set", ref, data))
+
+    def delete(self, ref):
+        self.ops.append(("delete", ref, None))
+
+    def close(self):
+        for kind, ref, data in self.ops:
+            if ref.id in self.fail_ids:
+                failure = SimpleNamespace(operation=SimpleNamespace(reference=ref), message="unavailable", attempts=0)
+                while True:
+                    failure.attempts += 1
+                    if not self.on_error(failure, self):
+                        break
+                continue
+            if kind == "set":
+                self.store[ref.id] = data
+            else:
+                self.store.pop(ref.id, None)
+            self.on_result(ref, None, self)
+
+
+def make_fake_db(store, fail_ids=()):
+    fake_db = MagicMock()
+    fake_db.collection.return_value.document.side_effect = \
+        lambda doc_id: SimpleNamespace(id=doc_id, path=f"problems/{doc_id}", set=MagicMock())
+    fake_db.collection.return_value.select.return_value.stream.side_effect = \
+        lambda: [SimpleNamespace(id=doc_id) for doc_id in store]
+    writers = []
+
+    def bulk_writer(**options):
+        writers.append(FakeBulkWriter(store, fail_ids))
+        return writers[-1]
+
+    fake_db.bulk_writer.side_effect = bulk_writer
+    return fake_db, writers
+
+
+def make_problem(pid, title):
+    return {
+        "id": pid,
+        "title": title,
+        "slug": title.lower().replace(" ", "-"),
+        "difficulty": "Easy",
+        "links": {"problem": None, "description": None, "solutions": None},
+        "stats": {"acceptance_rate": 50.0, "submissions": 10, "accepted": 5, "likes": 1, "dislikes": 0},
+        "statement": {"description": title, "examples": [], "constraints": []},
+    }
+
+
+def write_ndjson(path, problems):
+    path.write_text("".join(json.dumps(p) + "\n" for p in problems))
+
+
+def test_sync_writes_only_changes_and_deletes_removed(tmp_path):
+    store = {"99": {"title": "Stale"}}
+    fake_db, writers = make_fake_db(store)
+    dump = tmp_path / "cleaned.ndjson"
+    manifest = tmp_path / "manifest.json"
+
+    with patch.object(run_and_upload, "firestore_db", FirestoreDB(fake_db)):
+        write_ndjson(dump, [make_problem("1", "Two Sum"), make_problem("2", "Three Sum")])
+        first = sync_to_firestore(str(dump), str(manifest))
+        assert (first["written"], first["deleted"]) == (2, 1)
+        assert sorted(store) == ["1", "2"]
+
+        # unchanged re-run: no writes at all
+        second = sync_to_firestore(str(dump), str(manifest))
+        assert (second["written"], second["deleted"], second["unchanged"]) == (0, 0, 2)
+        assert writers[-2].ops == [] and writers[-1].ops == []
+
+        write_ndjson(dump, [make_problem("1", "Two Sum II"), make_problem("3", "Four Sum")])
+        third = sync_to_firestore(str(dump), str(manifest))
+
+    assert (third["written"], third["deleted"]) == (2, 1)
+    assert store["1"]["title"] == "Two Sum II"
+    assert sorted(store) == ["1", "3"]
+    assert sorted(json.loads(manifest.read_text())["problems"]) == ["1", "3"]
+
+
+def test_failed_writes_are_retried_on_next_run(tmp_path):
+    store = {}
+    fake_db, writers = make_fake_db(store, fail_ids={"2"})
+    dump = tmp_path / "cleaned.ndjson"
+    manifest = tmp_path / "manifest.json"
+    write_ndjson(dump, [make_problem("1", "Two Sum"), make_problem("2", "Three Sum")])
+
+    with patch.object(run_and_upload, "firestore_db", FirestoreDB(fake_db)):
+        first = sync_to_firestore(str(dump), str(manifest), checkpoint_every=1)
+        assert first["failed"] == ["2"]
+        assert list(json.loads(manifest.read_text())["problems"]) == ["1"]
+
+        fake_db.bulk_writer.side_effect = lambda **options: writers.append(FakeBulkWriter(store)) or writers[-1]
+        second = sync_to_firestore(str(dump), str(manifest))
+
+    assert second["written"] == 1
+    assert [op[1].id for op in writers[-2].ops] == ["2"]
@@ -0,0 +1,245 @@
+"""
+Incremental JSON parser for LLM agent outputs
+
+LLM responses wrap JSON in markdown fences, add prose before or after it, and arrive
+as partial text events. IncrementalJSONParser consumes that text piece by piece and
+emits each top-level array element (or the top-level object) as soon as it closes, so
+downstream stages can act on a question or answer the moment it exists.
+
+A bracket in prose ("Here are [3] questions", a "[1]" citation) is not the answer:
+a candidate outside a markdown fence with prose before it is held back until it
+turns out to contain an object or array. A list of scalars there is only kept as a
+fallback, returned by close() when nothing better (e.g. a fenced block) follows.
+"""
+
+import json
+import re
+from typing import Any, Callable, List, Optional
+
+# Characters that change parser state outside / inside a JSON string
+_STRUCTURAL = re.compile(r'[\[\]{}",]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_ROOT_START = re.compile(r"[\[{]|```")
+_FENCED_BLOCK = re.compile(r"```[\w-]*\s*\n?(.*?)```", re.DOTALL)
+
+
+class IncrementalJSONParser:
+    """
+    Parse a JSON array or object out of streamed LLM text.
+
+    Usage:
+        parser = IncrementalJSONParser(on_item=handle_question)
+        for chunk in text_events:
+            parser.feed(chunk)
+        result = parser.close()
+    """
+
+    def __init__(self, on_item: Optional[Callable[[Any], None]] = None):
+        self.on_item = on_item
+        self.items: List[Any] = []
+        self._buffer = ""
+        self._pos = 0
+        self._done = False
+        self._value: Any = None
+        # Markdown fences passed so far (odd: inside a fenced block)
+        self._fences = 0
+        self._fallback: Any = None
+        self._reset_root()
+
+    def _reset_root(self):
+        self._root_start: Optional[int] = None
+        self._root_kind: Optional[str] = None
+        self._depth = 0
+        self._in_string = False
+        self._item_start = 0
+        self._item_done = False
+        # Prose-led candidate: items are held back until one is an object or array
+        self._tentative = False
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level JSON value has closed"""
+        return self._done
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume more text and return the items completed by it"""
+        if not text or self._done:
+            return []
+        self._buffer += text
+        return self._scan()
+
+    def close(self) -> Any:
+        """
+        Finish parsing and return the top-level value.
+
+        A truncated array returns the elements completed so far; otherwise None when
+        no JSON value could be recovered.
+        """
+        if self._done:
+            return self._value
+        if self._root_kind == "[" and self.items:
+            return list(self.items)
+        return self._fallback
+
+    def _emit(self, item: Any, out: List[Any]):
+        self.items.append(item)
+        if self._tentative:
+            if not isinstance(item, (dict, list)):
+                return
+            # Structured content: this is the answer, release what was held back
+            self._tentative = False
+            released = self.items
+        else:
+            released = [item]
+        for item in released:
+            out.append(item)
+            if self.on_item:
+                self.on_item(item)
+
+    def _emit_slice(self, start: int, end: int, out: List[Any]) -> bool:
+        raw = self._buffer[start:end].strip()
+        if not raw:
+            return True
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return False
+        self._emit(item, out)
+        return True
+
+    def _find_root_start(self) -> Optional[int]:
+        """Locate the opening bracket of the JSON value, skipping prose and markdown fences"""
+        while True:
+            m = _ROOT_START.search(self._buffer, self._pos)
+            if not m:
+                # Keep a possible partial fence at the end of the buffer for the next feed
+                self._pos = max(self._pos, len(self._buffer) - 2)
+                return None
+            if m.group() != "```":
+                return m.start()
+            # Skip the fence; a language tag such as "json" is just prose to the scanner
+            self._fences += 1
+            self._pos = m.end()
+
+    def _restart_after(self, position: int):
+        """The candidate starting at position was not JSON; look for the next one"""
+        self._reset_root()
+        self.items = []
+        self._pos = position + 1
+
+    def _scan(self) -> List[Any]:
+        out: List[Any] = []
+        buf = self._buffer
+        while not self._done and self._pos < len(buf):
+            if self._root_start is None:
+                start = self._find_root_start()
+                if start is None:
+                    break
+                self._root_start = start
+                self._root_kind = buf[start]
+                self._depth = 1
+                self._pos = start + 1
+                self._item_start = start + 1
+                self._item_done = False
+                self._tentative = self._fences % 2 == 0 and bool(buf[:start].strip())
+                continue
+
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, self._pos)
+                if not m:
+                    self._pos = len(buf)
+                    break
+                if m.group() == "\\":
+                    if m.end() >= len(buf):
+                        # The escaped character has not arrived yet
+                        self._pos = m.start()
+                        break
+                    self._pos = m.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = m.end()
+                continue
+
+            m = _STRUCTURAL.search(buf, self._pos)
+            if not m:
+                self._pos = len(buf)
+                break
+            ch, i = m.group(), m.start()
+            self._pos = m.end()
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_root(i + 1, out)
+                elif self._depth == 1 and self._root_kind == "[":
+                    # A nested object/array element just closed
+                    if not self._emit_slice(self._item_start, i + 1, out) and not self.items:
+                        self._restart_after(self._root_start)
+                        continue
+                    self._item_done = True
+            elif ch == "," and self._depth == 1 and self._root_kind == "[":
+                if not self._item_done and not self._emit_slice(self._item_start, i, out) and not self.items:
+                    self._restart_after(self._root_start)
+                    continue
+                self._item_start = i + 1
+                self._item_done = False
+        return out
+
+    def _finish_root(self, end: int, out: List[Any]):
+        start = self._root_start
+        if self._root_kind == "[" and not self._item_done:
+            if not self._emit_slice(self._item_start, end - 1, out) and not self.items:
+                self._restart_after(start)
+                return
+        try:
+            value = json.loads(self._buffer[start:end])
+        except json.JSONDecodeError:
+            if self._root_kind == "[" and self.items:
+                # Tolerate a malformed element (e.g. trailing comma) after good ones
+                value = list(self.items)
+            else:
+                self._restart_after(start)
+                return
+        if self._root_kind == "{":
+            self._emit(value, out)
+        elif self._tentative:
+            # Only scalars after prose, e.g. "[3]": keep looking, a fenced block may follow
+            if self._fallback is None:
+                self._fallback = value
+            self._reset_root()
+            self.items = []
+            self._pos = end
+            return
+        self._value = value
+        self._done = True
+
+
+def parse_json_response(response_text: Optional[str]) -> Any:
+    """
+    Parse the JSON value from a complete LLM response.
+
+    Returns:
+        The parsed array/object, or an error dict with the raw response if no JSON was found
+    """
+    text = response_text or ""
+    result = None
+    # A fenced block is what the model meant as its answer; prose around it may have brackets
+    fenced = _FENCED_BLOCK.search(text)
+    if fenced:
+        parser = IncrementalJSONParser()
+        parser.feed(fenced.group(1))
+        result = parser.close()
+    if result is None:
+        parser = IncrementalJSONParser()
+        parser.feed(text)
+        result = parser.close()
+    if result is None:
+        return {
+            "error": "Error parsing response: Could not find valid JSON in the response",
+            "raw_response": response_text
+        }
+    return result
@@ -0,0 +1,133 @@
+"""
+Async, cached reachability checks for links shown to users (e.g. feedback resources).
+
+A link is reachable when a GET returns < 400 and the first bytes of the body do not
+look like an error page. Only a bounded prefix of the body is downloaded. Results,
+including failures, are cached per URL with a TTL and shared by every caller in the
+process; concurrent checks of the same URL share one request.
+"""
+
+import asyncio
+from typing import Dict, Iterable, Optional
+
+import httpx
+
+from backend.config import FeedbackConfig
+from backend.tools.ttl_cache import TTLCache
+
+# Error-page markers searched for in the (lowercased) body prefix
+ERROR_MARKERS = ("404", "page not found", "not available")
+# Shorter bodies are treated as empty landing pages
+MIN_BODY_BYTES = 500
+
+
+def looks_reachable(status_code: int, body_prefix: bytes) -> bool:
+    if status_code >= 400:
+        return False
+    if len(body_prefix) < MIN_BODY_BYTES:
+        return False
+    text = body_prefix.decode("utf-8", errors="ignore").lower()
+    return not any(marker in text for marker in ERROR_MARKERS)
+
+
+class LinkValidator:
+    """
+    TTL cache of URL -> reachable in front of concurrent, prefix-only HTTP checks.
+
+    Args:
+        ttl_seconds: How long a reachable result is reused
+        negative_ttl_seconds: How long an unreachable result (error, timeout, error page) is reused
+        timeout: Per-request timeout in seconds
+        max_bytes: Body bytes read per check
+        max_concurrency: Checks in flight at once per validate_all() call
+        max_entries: Cache size; least recently used entries are evicted first
+        transport: Optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = FeedbackConfig.LINK_TTL_SECONDS,
+        negative_ttl_seconds: float = FeedbackConfig.LINK_NEGATIVE_TTL_SECONDS,
+        timeout: float = FeedbackConfig.LINK_TIMEOUT_SECONDS,
+        max_bytes: int = FeedbackConfig.LINK_MAX_BYTES,
+        max_concurrency: int = FeedbackConfig.LINK_MAX_CONCURRENCY,
+        max_entries: int = 10000,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_concurrency = max_concurrency
+        self.max_entries = max_entries
+        self.transport = transport
+        self._cache = TTLCache(max_entries)  # url -> reachable
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _store(self, url: str, reachable: bool) -> None:
+        self._cache.set(url, reachable, self.ttl_seconds if reachable else self.negative_ttl_seconds)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    # --- Checks ---
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> bool:
+        try:
+            async with client.stream("GET", url) as response:
+                prefix = b""
+                async for chunk in response.aiter_bytes():
+                    prefix += chunk
+                    if len(prefix) >= self.max_bytes:
+                        break
+                return looks_reachable(response.status_code, prefix[:self.max_bytes])
+        except Exception:
+            return False
+
+    async def _check(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str) -> bool:
+        if not url or not url.startswith(("http://", "https://")):
+            return False
+        reachable = self._cache.get(url)
+        if reachable is not None:
+            return reachable
+
+        # Another session is already checking this URL
+        pending = self._in_flight.get(url)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[url] = future
+        try:
+            async with semaphore:
+                reachable = await self._fetch(client, url)
+            self._store(url, reachable)
+            future.set_result(reachable)
+            return reachable
+        except BaseException:
+            # _fetch never raises, so this is cancellation of the checking caller
+            future.cancel()
+            raise
+        finally:
+            self._in_flight.pop(url, None)
+
+    async def validate_all(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """Check every distinct URL concurrently; returns {url: reachable}"""
+        unique = list(dict.fromkeys(url or "" for url in urls))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": FeedbackConfig.LINK_USER_AGENT},
+            transport=self.transport,
+        ) as client:
+            results = await asyncio.gather(*(self._check(client, semaphore, url) for url in unique))
+        return dict(zip(unique, results))
+
+    async def is_reachable(self, url: str) -> bool:
+        return (await self.validate_all([url]))[url or ""]
+
+    def diagnostics(self) -> Dict[str, int]:
+        return self._cache.diagnostics()
+
+
+link_validator = LinkValidator()
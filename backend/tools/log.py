@@ -0,0 +1,187 @@
+"""
+Structured, non-blocking logging.
+
+- Records are put on a bounded queue by a QueueHandler and written to stdout by a
+  QueueListener thread, so the event loop never waits on stdout. When the queue is
+  full, records are dropped and counted instead of blocking.
+- Every record becomes one JSON line (Cloud Logging reads "severity" and "message";
+  everything else is kept as structured fields) or a plain text line when
+  LoggingConfig.JSON is off.
+- Chunk-level messages carry a category (e.g. "audio") and are rate limited per
+  category before they reach the queue; the next record that passes reports how many
+  were suppressed.
+- Session / workflow ids are attached as fields with bind().
+
+Usage:
+    logger = get_logger(__name__)
+    log = bind(logger, session_id=session.id)
+    log.info("audio/pcm %d bytes", n, extra={"category": "audio", "bytes": n})
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.config import LoggingConfig
+
+ROOT_LOGGER = "backend"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the "backend" hierarchy, so setup_logging() covers it"""
+    if name != ROOT_LOGGER and not name.startswith(ROOT_LOGGER + "."):
+        name = f"{ROOT_LOGGER}.{name}"
+    return logging.getLogger(name)
+
+
+class ContextLogger(logging.LoggerAdapter):
+    """LoggerAdapter that merges its fields with the call's own `extra`"""
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **(kwargs.get("extra") or {})}
+        return msg, kwargs
+
+    def bind(self, **fields) -> "ContextLogger":
+        return ContextLogger(self.logger, {**self.extra, **fields})
+
+
+def bind(logger, **fields) -> ContextLogger:
+    """Logger that adds `fields` (e.g. session_id, workflow_id) to every record"""
+    if isinstance(logger, ContextLogger):
+        return logger.bind(**fields)
+    return ContextLogger(logger, fields)
+
+
+def record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """The structured fields passed through `extra`"""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class CategoryRateLimiter(logging.Filter):
+    """
+    Token bucket per record category: at most `rate` records per second (bursts up to
+    `rate`) for categories in `limits`; records without a limited category always pass.
+    """
+
+    def __init__(self, limits: Dict[str, float]):
+        super().__init__()
+        self.limits = dict(limits)
+        self._buckets: Dict[str, list] = {}  # category -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        rate = self.limits.get(category)
+        if not rate:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(category, [rate, now, 0])
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "severity": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "time": self.formatTime(record),
+        }
+        entry.update(record_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain line with the structured fields appended as key=value"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = " ".join(f"{key}={value}" for key, value in record_fields(record).items())
+        return f"{line} {fields}" if fields else line
+
+
+def setup_logging(
+    level: str = LoggingConfig.LEVEL,
+    json_format: bool = LoggingConfig.JSON,
+    rate_limits: Optional[Dict[str, float]] = None,
+    queue_size: int = LoggingConfig.QUEUE_SIZE,
+    stream=None,
+) -> logging.Handler:
+    """
+    Route the "backend" loggers through a queue to a background writer (idempotent).
+
+    Returns:
+        logging.Handler: The queue handler installed on the "backend" logger
+    """
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in root.handlers:
+            if isinstance(handler, DroppingQueueHandler):
+                return handler
+
+        writer = logging.StreamHandler(stream or sys.stdout)
+        writer.setFormatter(JsonFormatter() if json_format else TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+        handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        handler.addFilter(CategoryRateLimiter(LoggingConfig.RATE_LIMITS if rate_limits is None else rate_limits))
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(handler.queue, writer, respect_handler_level=True)
+        _listener.start()
+        return handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            if isinstance(handler, DroppingQueueHandler):
+                root.removeHandler(handler)
+        root.propagate = True
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,145 @@
+"""
+Async, cached web search for learning resources (replacement feedback links).
+
+DuckDuckGo's client is synchronous, so each lookup runs in a worker thread (at most
+SEARCH_MAX_CONCURRENCY at once). Results are memoized by normalized topic with a TTL;
+failed lookups are cached briefly so a rate-limited search is not hammered. A batch
+of lookups shares one overall deadline; topics still pending then get the curated
+fallback, while their lookups finish in the background and fill the cache for the
+next caller. Nothing here ever sleeps on the event loop.
+"""
+
+import asyncio
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from duckduckgo_search import DDGS
+
+from backend.config import FeedbackConfig
+from backend.tools.log import get_logger
+from backend.tools.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+FALLBACK_RESOURCE = {
+    "title": "5 Tips To Ace a Behavioral-Based Interview",
+    "link": "https://jobs.gartner.com/life-at-gartner/your-career/5-tips-to-ace-a-behavioral-based-interview/"
+}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_topic(topic: str) -> str:
+    """Cache key: lowercase words without punctuation"""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", (topic or "").lower())).strip()
+
+
+def search_ddgs(topic: str, max_results: int = 1) -> Optional[Dict[str, str]]:
+    """First http(s) DuckDuckGo result for a topic (blocking), or None"""
+    with DDGS() as ddgs:
+        for result in ddgs.text(topic, max_results=max_results):
+            if result and result.get("href", "").startswith("http"):
+                return {
+                    "title": result.get("title", "Related resource"),
+                    "link": result["href"]
+                }
+    return None
+
+
+class ResourceSearch:
+    """
+    Args:
+        search: Blocking topic -> resource (or None) lookup, run in a worker thread
+        ttl_seconds: How long a found resource is reused per topic
+        negative_ttl_seconds: How long a failed lookup is remembered
+        deadline_seconds: Overall time budget of one find_all() call
+        max_concurrency: Lookups running at once (worker threads)
+        fallback: Resource used when nothing was found in time
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str], Optional[Dict[str, str]]] = search_ddgs,
+        ttl_seconds: float = FeedbackConfig.SEARCH_TTL_SECONDS,
+        negative_ttl_seconds: float = FeedbackConfig.SEARCH_NEGATIVE_TTL_SECONDS,
+        deadline_seconds: float = FeedbackConfig.SEARCH_DEADLINE_SECONDS,
+        max_concurrency: int = FeedbackConfig.SEARCH_MAX_CONCURRENCY,
+        fallback: Dict[str, str] = FALLBACK_RESOURCE,
+    ):
+        self.search = search
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_concurrency = max_concurrency
+        self.fallback = fallback
+        self._cache = TTLCache()  # normalized topic -> resource or None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _lookup(self, key: str, topic: str) -> Optional[Dict[str, str]]:
+        try:
+            async with self._limiter():
+                resource = await asyncio.to_thread(self.search, topic)
+        except Exception as e:
+            logger.warning("Resource lookup failed for '%s': %s", topic, e)
+            resource = None
+        self._cache.set(key, resource, self.ttl_seconds if resource else self.negative_ttl_seconds)
+        return resource
+
+    def _task_for(self, topic: str) -> Optional[asyncio.Task]:
+        """Running (or new) lookup task for a topic; None when the cache answers"""
+        key = normalize_topic(topic)
+        if key in self._cache:
+            return None
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._lookup(key, topic))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _, key=key: self._in_flight.pop(key, None))
+        return task
+
+    async def find_all(self, topics: Iterable[str], deadline_seconds: Optional[float] = None) -> List[Dict[str, str]]:
+        """
+        One resource per topic (in order), looked up concurrently.
+
+        Topics not answered within the deadline get the fallback resource.
+        """
+        topics = [topic or "interview tips" for topic in topics]
+        tasks = {topic: self._task_for(topic) for topic in topics}
+        pending = {task for task in tasks.values() if task is not None}
+        if pending:
+            deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+            # wait() never cancels: a lookup outliving the deadline keeps running and fills the cache
+            await asyncio.wait(pending, timeout=deadline)
+
+        results = []
+        for topic in topics:
+            task = tasks[topic]
+            if task is None:
+                resource = self._cache.get(normalize_topic(topic))
+            elif task.done() and not task.cancelled():
+                resource = task.result()
+            else:
+                logger.info("Resource search deadline reached for '%s', using fallback", topic)
+                resource = None
+            results.append(dict(resource or self.fallback))
+        return results
+
+    async def find(self, topic: str) -> Dict[str, str]:
+        return (await self.find_all([topic]))[0]
+
+    def diagnostics(self) -> Dict[str, int]:
+        return {**self._cache.diagnostics(), "inFlight": len(self._in_flight)}
+
+
+resource_search = ResourceSearch()
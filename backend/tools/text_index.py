@@ -0,0 +1,150 @@
+"""
+Lightweight TF-IDF text index
+
+Documents are stored as L2-normalized sparse TF-IDF rows (CSR arrays in NumPy) plus an
+inverted index (term -> postings), so scoring a query only touches the postings of the
+query's terms instead of every document.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves tell describe time
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stop words (keeps tokens like 'c++' and 'c#')"""
+    if not text:
+        return []
+    return [t for t in _TOKEN_PATTERN.findall(str(text).lower()) if t not in STOP_WORDS and len(t) > 1]
+
+
+class TfidfIndex:
+    """
+    Sparse TF-IDF index over a list of documents.
+
+    Args:
+        documents: Document texts; results refer to documents by their position
+        max_features: Keep only the most frequent terms (by document frequency)
+        min_df: Drop terms that appear in fewer documents
+        max_df: Drop terms that appear in more than this fraction of documents
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[str],
+        max_features: Optional[int] = None,
+        min_df: int = 1,
+        max_df: float = 1.0,
+    ):
+        tokenized = [tokenize(doc) for doc in documents]
+        n_docs = len(tokenized)
+        self.n_docs = n_docs
+
+        df = Counter()
+        for tokens in tokenized:
+            df.update(set(tokens))
+        max_count = max_df * n_docs
+        terms = [t for t, c in df.items() if c >= min_df and c <= max_count]
+        if max_features is not None and len(terms) > max_features:
+            terms = sorted(terms, key=lambda t: (-df[t], t))[:max_features]
+        terms.sort()
+
+        self.vocabulary: Dict[str, int] = {t: i for i, t in enumerate(terms)}
+        doc_freq = np.array([df[t] for t in terms], dtype=np.float32)
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0).astype(np.float32)
+
+        # CSR rows
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in tokenized:
+            row_idx, row_val = self._weigh(Counter(t for t in tokens if t in self.vocabulary))
+            indices.extend(row_idx.tolist())
+            data.extend(row_val.tolist())
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float32)
+
+        # Inverted index: postings sorted by term id
+        rows = np.repeat(np.arange(n_docs, dtype=np.int64), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        self._post_docs = rows[order]
+        self._post_weights = self.data[order]
+        counts = np.bincount(self.indices, minlength=len(terms))
+        self._post_ptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def _weigh(self, term_counts: Counter) -> Tuple[np.ndarray, np.ndarray]:
+        """Sublinear TF * IDF, L2-normalized, for one bag of terms"""
+        if not term_counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        idx = np.fromiter((self.vocabulary[t] for t in term_counts), dtype=np.int64, count=len(term_counts))
+        tf = np.fromiter(term_counts.values(), dtype=np.float32, count=len(term_counts))
+        val = (1.0 + np.log(tf)) * self.idf[idx]
+        norm = float(np.linalg.norm(val))
+        if norm > 0:
+            val /= norm
+        return idx, val
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse (term ids, weights) vector for a query text"""
+        return self._weigh(Counter(t for t in tokenize(text) if t in self.vocabulary))
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity between the query text and every document"""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term, weight in zip(*self.vectorize(text)):
+            start, end = self._post_ptr[term], self._post_ptr[term + 1]
+            scores[self._post_docs[start:end]] += weight * self._post_weights[start:end]
+        return scores
+
+    def search(self, text: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (document position, score) pairs with a positive score, best first"""
+        scores = self.scores(text)
+        if top_k <= 0 or not len(scores):
+            return []
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+    def cosine_block(self, start: int, end: int) -> np.ndarray:
+        """
+        Dense (end - start) x n_docs block of cosine similarities between documents
+        start..end-1 and every document, computed from the sparse rows and postings
+        (the full document-term matrix is never materialized).
+        """
+        block = np.zeros((end - start, self.n_docs), dtype=np.float32)
+        for out, row in enumerate(range(start, end)):
+            lo, hi = self.indptr[row], self.indptr[row + 1]
+            terms, weights = self.indices[lo:hi], self.data[lo:hi]
+            if not len(terms):
+                continue
+            post_start = self._post_ptr[terms]
+            post_len = self._post_ptr[terms + 1] - post_start
+            # Positions of every posting of the row's terms, concatenated
+            segment_start = np.cumsum(post_len) - post_len
+            positions = np.repeat(post_start - segment_start, post_len) + np.arange(int(post_len.sum()))
+            block[out] = np.bincount(
+                self._post_docs[positions],
+                weights=np.repeat(weights, post_len) * self._post_weights[positions],
+                minlength=self.n_docs,
+            )
+        return block
@@ -0,0 +1,21 @@
+"""
+Cheap prompt-size estimates.
+
+No tokenizer ships with the Gemini client, so sizes are estimated from characters
+(~4 characters per token for English text). Good enough for budgets and thresholds;
+not for billing.
+"""
+
+import json
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(value: Any) -> int:
+    """Approximate token count of a string, or of any JSON-serializable value"""
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return (len(value) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
@@ -5,7 +5,6 @@ import '../services/workflow_service.dart';
 import '../services/interview_service.dart';
 import '../widgets/navbar.dart';
 import '../theme/app_theme.dart';
-import 'dart:convert';
 import 'dart:async';
 import 'package:url_launcher/url_launcher.dart';
 
@@ -206,11 +205,7 @@ class _MockInterviewPageState extends State<MockInterviewPage> {
     try {
       // 1. send end signal through WebSocket 
       if (_wsConnected) {
-        _interviewService.sendMessage(json.encode({
-          'type': 'control',
-          'action': 'end_interview',
-          'reason': 'user_stopped'
-        }));
+        _interviewService.sendControl('end_interview', extra: {'reason': 'user_stopped'});
       }
 
       // 2. disconnect WebSocket
@@ -1683,6 +1678,13 @@ class _MockInterviewPageState extends State<MockInterviewPage> {
               _currentState = InterviewState.showingFeedback;
               _loadingFeedback = false;
             });
+          } else if (feedbackResponse['status'] == 'failed') {
+            // background feedback job gave up after its retries, no point in polling on
+            timer.cancel();
+            setState(() {
+              _feedbackError = 'Feedback generation failed, please try again later';
+              _loadingFeedback = false;
+            });
           } else if (_pollingAttempts >= _maxPollingAttempts) {
             // reach max attempts, stop polling and show error
             timer.cancel();
@@ -299,6 +299,7 @@ class InterviewService {
     if (_wsConnected && _channel != null) {
       // Send message in the correct format expected by backend
       final messageData = {
+        'type': 'text',
         'mime_type': 'text/plain',
         'data': message,
       };
@@ -309,6 +310,21 @@ class InterviewService {
     }
   }
 
+  // send a control message (top-level 'type', never mixed with text/audio payloads)
+  void sendControl(String action, {Map<String, dynamic>? extra}) {
+    if (_wsConnected && _channel != null) {
+      final controlData = {
+        'type': 'control',
+        'action': action,
+        ...?extra,
+      };
+      _channel!.sink.add(json.encode(controlData));
+      debugPrint('📤 Control sent via WebSocket: $action');
+    } else {
+      throw Exception('WebSocket not connected');
+    }
+  }
+
   // disconnect WebSocket connection
   void disconnectWebSocket() {
     if (_channel != null) {